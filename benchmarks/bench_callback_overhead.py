@@ -0,0 +1,253 @@
+"""Benchmark Callback Overhead.
+
+Trains synthetic Keras models of several sizes on CPU, with Simvue runs replaced by a local stand-in,
+and measures the time spent in each TensorVue method and the slowdown compared with a bare model.fit.
+
+Run with: python benchmarks/bench_callback_overhead.py [--models small medium] [--scenarios many_steps] [--output results.json]
+Results from two runs can be compared with benchmarks/compare.py.
+"""
+
+import argparse
+import json
+import pathlib
+import platform
+import sys
+import tempfile
+import time
+import typing
+from unittest.mock import patch
+
+import numpy
+import tensorflow as tf
+
+sys.path.insert(0, str(pathlib.Path(__file__).parent))
+
+from stand_in import StandInRun  # noqa: E402
+
+from simvue_tensorflow.plugin import TensorVue  # noqa: E402
+
+HOOKS: tuple[str, ...] = (
+    "set_model",
+    "on_train_begin",
+    "on_train_end",
+    "on_epoch_begin",
+    "on_epoch_end",
+    "on_train_batch_begin",
+    "on_train_batch_end",
+    "on_test_begin",
+    "on_test_end",
+    "on_test_batch_begin",
+    "on_test_batch_end",
+)
+
+# Units in each hidden layer of the synthetic models
+MODELS: dict[str, tuple[int, ...]] = {
+    "small": (32,),
+    "medium": (256, 256),
+    "large": (1024, 1024, 1024),
+}
+
+SCENARIOS: dict[str, dict[str, typing.Any]] = {
+    "epoch_runs": {"epochs": 5, "steps": 100, "create_epoch_runs": True},
+    "no_epoch_runs": {"epochs": 5, "steps": 100, "create_epoch_runs": False},
+    "many_epochs": {"epochs": 50, "steps": 5, "create_epoch_runs": True},
+    "many_steps": {"epochs": 2, "steps": 1000, "create_epoch_runs": True},
+}
+
+BATCH_SIZE: int = 32
+FEATURES: int = 64
+CLASSES: int = 10
+
+
+def make_model(hidden_layers: tuple[int, ...]) -> tf.keras.Model:
+    """Create a compiled dense classifier.
+
+    Parameters
+    ----------
+    hidden_layers : tuple[int, ...]
+        Number of units in each hidden layer
+
+    Returns
+    -------
+    tf.keras.Model
+        The compiled model
+
+    """
+    model = tf.keras.Sequential(
+        [tf.keras.Input((FEATURES,))]
+        + [tf.keras.layers.Dense(units, activation="relu") for units in hidden_layers]
+        + [tf.keras.layers.Dense(CLASSES)]
+    )
+    model.compile(
+        optimizer="adam",
+        loss=tf.keras.losses.SparseCategoricalCrossentropy(from_logits=True),
+        metrics=["accuracy"],
+    )
+    return model
+
+
+def make_data(steps: int) -> tuple[numpy.ndarray, numpy.ndarray]:
+    """Create random inputs and labels for the given number of training steps.
+
+    Parameters
+    ----------
+    steps : int
+        Number of batches of data to create
+
+    Returns
+    -------
+    tuple[numpy.ndarray, numpy.ndarray]
+        Inputs and labels
+
+    """
+    _rng = numpy.random.default_rng(0)
+    return (
+        _rng.random((steps * BATCH_SIZE, FEATURES), dtype=numpy.float32),
+        _rng.integers(0, CLASSES, steps * BATCH_SIZE),
+    )
+
+
+def instrument(callback: TensorVue) -> dict[str, list[float]]:
+    """Wrap each hook of a callback so that the duration of every call is recorded.
+
+    Parameters
+    ----------
+    callback : TensorVue
+        The callback to instrument
+
+    Returns
+    -------
+    dict[str, list[float]]
+        Duration in seconds of each call, keyed by hook name, filled in as the hooks are called
+
+    """
+    timings: dict[str, list[float]] = {hook: [] for hook in HOOKS}
+    for hook in HOOKS:
+        method = getattr(callback, hook)
+
+        def _timed(*args, _method=method, _timings=timings[hook], **kwargs):
+            _start = time.perf_counter()
+            _method(*args, **kwargs)
+            _timings.append(time.perf_counter() - _start)
+
+        setattr(callback, hook, _timed)
+    return timings
+
+
+def run_scenario(
+    model_name: str, scenario_name: str, repeats: int
+) -> list[dict[str, typing.Any]]:
+    """Measure the overhead of TensorVue when training a model in a scenario.
+
+    Parameters
+    ----------
+    model_name : str
+        Name of the model size, a key of MODELS
+    scenario_name : str
+        Name of the scenario, a key of SCENARIOS
+    repeats : int
+        Number of times to train with and without TensorVue, the fastest time of each is reported
+
+    Returns
+    -------
+    list[dict[str, typing.Any]]
+        A fit_slowdown record for the scenario, and a hook_cost record for each hook which was called
+
+    """
+    scenario = SCENARIOS[scenario_name]
+    model = make_model(MODELS[model_name])
+    inputs, labels = make_data(scenario["steps"])
+    validation = make_data(max(scenario["steps"] // 10, 1))
+    _fit_options = {
+        "x": inputs,
+        "y": labels,
+        "batch_size": BATCH_SIZE,
+        "epochs": scenario["epochs"],
+        "validation_data": validation,
+        "verbose": 0,
+    }
+    # Trace the training and validation functions before timing anything
+    model.fit(**{**_fit_options, "epochs": 1})
+
+    _bare_times, _tensorvue_times = [], []
+    timings: dict[str, list[float]] = {hook: [] for hook in HOOKS}
+    with tempfile.TemporaryDirectory() as temp_dir, patch("simvue.Run", StandInRun):
+        for _ in range(repeats):
+            _start = time.perf_counter()
+            model.fit(**_fit_options)
+            _bare_times.append(time.perf_counter() - _start)
+
+            callback = TensorVue(
+                run_name=f"bench_{model_name}_{scenario_name}",
+                script_filepath=None,
+                model_final_filepath=str(pathlib.Path(temp_dir, "final_model.keras")),
+                create_epoch_runs=scenario["create_epoch_runs"],
+            )
+            _timings = instrument(callback)
+            _start = time.perf_counter()
+            model.fit(**_fit_options, callbacks=[callback])
+            _tensorvue_times.append(time.perf_counter() - _start)
+            for hook, durations in _timings.items():
+                timings[hook].extend(durations)
+
+    _record = {"model": model_name, "scenario": scenario_name, **scenario}
+    results = [
+        {
+            "benchmark": "fit_slowdown",
+            **_record,
+            "bare_seconds": min(_bare_times),
+            "tensorvue_seconds": min(_tensorvue_times),
+            "slowdown": min(_tensorvue_times) / min(_bare_times),
+        }
+    ]
+    for hook, durations in timings.items():
+        if not durations:
+            continue
+        _durations = numpy.array(durations) * 1e6
+        results.append(
+            {
+                "benchmark": "hook_cost",
+                **_record,
+                "hook": hook,
+                "calls": len(durations) // repeats,
+                "mean_us": float(_durations.mean()),
+                "p50_us": float(numpy.percentile(_durations, 50)),
+                "p99_us": float(numpy.percentile(_durations, 99)),
+                "total_ms": float(_durations.sum()) / 1e3 / repeats,
+            }
+        )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--models", nargs="+", choices=list(MODELS), default=list(MODELS)
+    )
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS)
+    )
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", type=pathlib.Path, default=None)
+    args = parser.parse_args()
+
+    results = {
+        "environment": {
+            "python": platform.python_version(),
+            "tensorflow": tf.__version__,
+            "keras": tf.keras.__version__,
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+        },
+        "results": [
+            record
+            for model_name in args.models
+            for scenario_name in args.scenarios
+            for record in run_scenario(model_name, scenario_name, args.repeats)
+        ],
+    }
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(output)
+    print(output)
@@ -0,0 +1,170 @@
+"""Benchmark Startup.
+
+Measures the time taken to import TensorVue in a fresh interpreter, compared with importing TensorFlow alone,
+and the time taken to construct a TensorVue callback with and without alert definitions.
+
+Run with: python benchmarks/bench_startup.py [--repeats 5] [--output results.json]
+Results from two runs can be compared with benchmarks/compare.py.
+"""
+
+import argparse
+import json
+import pathlib
+import platform
+import subprocess
+import sys
+import time
+import typing
+
+import numpy
+
+# Modules to import in a fresh interpreter, where TensorFlow is the cost which TensorVue cannot avoid
+IMPORTS: dict[str, str] = {
+    "tensorflow": "import tensorflow; tensorflow.keras.callbacks.Callback",
+    "simvue_tensorflow.plugin": "import simvue_tensorflow.plugin",
+}
+
+ALERT_DEFINITIONS: dict[str, dict[str, typing.Any]] = {
+    "accuracy_below_80_percent": {
+        "source": "metrics",
+        "rule": "is below",
+        "metric": "accuracy",
+        "frequency": 1,
+        "window": 1,
+        "threshold": 0.8,
+    },
+    "loss_outside_range": {
+        "source": "metrics",
+        "rule": "is outside range",
+        "metric": "loss",
+        "range_low": 0.0,
+        "range_high": 10.0,
+    },
+    "model_diverged": {
+        "source": "events",
+        "frequency": 1,
+        "pattern": "Model diverged with loss = NaN",
+    },
+}
+
+
+def time_import(statement: str, repeats: int) -> dict[str, typing.Any]:
+    """Measure the time taken to run an import statement in a fresh interpreter.
+
+    Parameters
+    ----------
+    statement : str
+        The Python statement to run
+    repeats : int
+        Number of interpreters to start, the fastest time is reported
+
+    Returns
+    -------
+    dict[str, typing.Any]
+        The fastest time in seconds, and whether Simvue was imported as a side effect
+
+    """
+    _code = (
+        "import sys, time\n"
+        "_start = time.perf_counter()\n"
+        f"{statement}\n"
+        "print(time.perf_counter() - _start, 'simvue' in sys.modules)"
+    )
+    _times = []
+    for _ in range(repeats):
+        _output = subprocess.run(
+            [sys.executable, "-c", _code],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.split()
+        _times.append(float(_output[-2]))
+    return {"seconds": min(_times), "imports_simvue": _output[-1] == "True"}
+
+
+def time_construction(repeats: int, alerts: bool) -> dict[str, typing.Any]:
+    """Measure the time taken to construct a TensorVue callback.
+
+    Parameters
+    ----------
+    repeats : int
+        Number of callbacks to construct
+    alerts : bool
+        Whether to define alerts and add them to each type of run
+
+    Returns
+    -------
+    dict[str, typing.Any]
+        Mean, median and 99th percentile of the construction time in microseconds
+
+    """
+    from simvue_tensorflow.plugin import TensorVue
+
+    _options = (
+        {
+            "alert_definitions": ALERT_DEFINITIONS,
+            "simulation_alerts": list(ALERT_DEFINITIONS),
+            "epoch_alerts": ["accuracy_below_80_percent"],
+            "evaluation_alerts": ["loss_outside_range"],
+        }
+        if alerts
+        else {}
+    )
+    _durations = []
+    for _ in range(repeats):
+        _start = time.perf_counter()
+        TensorVue(run_name="bench_startup", **_options)
+        _durations.append(time.perf_counter() - _start)
+    _durations = numpy.array(_durations) * 1e6
+    return {
+        "mean_us": float(_durations.mean()),
+        "p50_us": float(numpy.percentile(_durations, 50)),
+        "p99_us": float(numpy.percentile(_durations, 99)),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--constructions", type=int, default=1000)
+    parser.add_argument("--output", type=pathlib.Path, default=None)
+    args = parser.parse_args()
+
+    _imports = {
+        module: time_import(statement, args.repeats)
+        for module, statement in IMPORTS.items()
+    }
+    import tensorflow as tf
+
+    results = {
+        "environment": {
+            "python": platform.python_version(),
+            "tensorflow": tf.__version__,
+            "keras": tf.keras.__version__,
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+        },
+        "results": [
+            {
+                "benchmark": "import_time",
+                "module": module,
+                **timing,
+                "overhead_seconds": timing["seconds"]
+                - _imports["tensorflow"]["seconds"],
+            }
+            for module, timing in _imports.items()
+        ]
+        + [
+            {
+                "benchmark": "construction",
+                "alerts": alerts,
+                **time_construction(args.constructions, alerts),
+            }
+            for alerts in (False, True)
+        ],
+    }
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(output)
+    print(output)
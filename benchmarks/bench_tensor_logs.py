@@ -0,0 +1,135 @@
+"""Benchmark Tensor Logs.
+
+Compares the step time of a training loop when batch metrics are converted to floats every step,
+as Keras does for callbacks which do not support tensor logs, against keeping them on-device in a DeviceMetricBuffer.
+
+Run with: python benchmarks/bench_tensor_logs.py [--steps N] [--output results.json]
+"""
+
+import argparse
+import json
+import pathlib
+import sys
+import time
+
+import tensorflow as tf
+
+sys.path.insert(0, str(pathlib.Path(__file__).parent))
+
+from stand_in import StandInRun  # noqa: E402
+
+from simvue_tensorflow.extras.device_buffer import DeviceMetricBuffer  # noqa: E402
+from simvue_tensorflow.extras.metric_buffer import MetricBuffer  # noqa: E402
+
+
+def make_train_step(width: int) -> tuple[tf.types.experimental.GenericFunction, tuple]:
+    """Create a compiled training step for a small synthetic dense model.
+
+    Parameters
+    ----------
+    width : int
+        Number of units in the hidden layer
+
+    Returns
+    -------
+    tuple[tf.types.experimental.GenericFunction, tuple]
+        The training step, and a batch of inputs and labels to pass to it
+
+    """
+    model = tf.keras.Sequential(
+        [
+            tf.keras.Input((64,)),
+            tf.keras.layers.Dense(width, activation="relu"),
+            tf.keras.layers.Dense(10),
+        ]
+    )
+    optimizer = tf.keras.optimizers.SGD(0.01)
+    loss_fn = tf.keras.losses.SparseCategoricalCrossentropy(from_logits=True)
+    inputs = tf.random.normal((32, 64))
+    labels = tf.random.uniform((32,), maxval=10, dtype=tf.int32)
+
+    @tf.function
+    def train_step(inputs, labels):
+        with tf.GradientTape() as tape:
+            logits = model(inputs, training=True)
+            loss = loss_fn(labels, logits)
+        gradients = tape.gradient(loss, model.trainable_variables)
+        optimizer.apply_gradients(zip(gradients, model.trainable_variables))
+        accuracy = tf.reduce_mean(
+            tf.cast(
+                tf.equal(tf.argmax(logits, -1, output_type=tf.int32), labels),
+                tf.float32,
+            )
+        )
+        return {"accuracy": accuracy, "loss": loss}
+
+    return train_step, (inputs, labels)
+
+
+def time_loop(mode: str, steps: int, width: int) -> float:
+    """Time a training loop, logging batch metrics in the given mode.
+
+    Parameters
+    ----------
+    mode : str
+        One of 'none' (no logging), 'float' (convert logs to floats each step) or 'tensor' (keep logs on-device)
+    steps : int
+        Number of training steps to run
+    width : int
+        Number of units in the hidden layer of the model
+
+    Returns
+    -------
+    float
+        Mean time per step in seconds, including the final flush
+
+    """
+    train_step, batch = make_train_step(width)
+    run = StandInRun()
+    buffer = (
+        DeviceMetricBuffer(["accuracy", "loss"], capacity=steps)
+        if mode == "tensor"
+        else MetricBuffer(["accuracy", "loss"], capacity=steps)
+    )
+    # Warm up to exclude tracing from the timings
+    train_step(*batch)
+
+    _start = time.perf_counter()
+    for step in range(steps):
+        logs = train_step(*batch)
+        if mode == "float":
+            buffer.append(step, [float(logs["accuracy"]), float(logs["loss"])])
+        elif mode == "tensor":
+            buffer.append(step, [logs["accuracy"], logs["loss"]])
+    buffer.flush(run)
+    return (time.perf_counter() - _start) / steps
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=500)
+    parser.add_argument("--output", type=pathlib.Path, default=None)
+    args = parser.parse_args()
+
+    results = []
+    for width in (32, 512):
+        _baseline = time_loop("none", args.steps, width)
+        for mode in ("none", "float", "tensor"):
+            _step_time = (
+                _baseline if mode == "none" else time_loop(mode, args.steps, width)
+            )
+            results.append(
+                {
+                    "benchmark": "tensor_logs",
+                    "width": width,
+                    "mode": mode,
+                    "steps": args.steps,
+                    "step_time_ms": _step_time * 1e3,
+                    "overhead_ms": (_step_time - _baseline) * 1e3,
+                }
+            )
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(output)
+    print(output)
@@ -0,0 +1,119 @@
+"""Compare Benchmarks.
+
+Compares two sets of benchmark results written with --output, reporting any measurements which have regressed.
+
+Run with: python benchmarks/compare.py baseline.json latest.json [--threshold 0.1]
+Exits with status 1 if any measurement regressed by more than the threshold.
+"""
+
+import argparse
+import json
+import pathlib
+import sys
+import typing
+
+# Measurements where a larger value is worse, for each type of benchmark record
+MEASUREMENTS: dict[str, tuple[str, ...]] = {
+    "fit_slowdown": ("slowdown",),
+    "hook_cost": ("mean_us", "p99_us"),
+    "tensor_logs": ("step_time_ms",),
+    "import_time": ("seconds",),
+    "construction": ("mean_us", "p99_us"),
+}
+
+# Fields which are measured, rather than identifying which benchmark a record belongs to
+MEASURED_FIELDS: set[str] = {
+    "bare_seconds",
+    "tensorvue_seconds",
+    "slowdown",
+    "calls",
+    "mean_us",
+    "p50_us",
+    "p99_us",
+    "total_ms",
+    "step_time_ms",
+    "overhead_ms",
+    "seconds",
+    "overhead_seconds",
+    "imports_simvue",
+}
+
+
+def load_records(
+    file_path: pathlib.Path,
+) -> dict[tuple[tuple[str, typing.Any], ...], dict[str, typing.Any]]:
+    """Load benchmark records from a results file, keyed by the fields which identify them.
+
+    Parameters
+    ----------
+    file_path : pathlib.Path
+        Results file, either a list of records or a dictionary with a list of records under 'results'
+
+    Returns
+    -------
+    dict[tuple[tuple[str, typing.Any], ...], dict[str, typing.Any]]
+        Each record, keyed by its identifying fields and their values
+
+    """
+    _results = json.loads(file_path.read_text())
+    if isinstance(_results, dict):
+        _results = _results["results"]
+    return {
+        tuple(
+            sorted(
+                (field, value)
+                for field, value in record.items()
+                if field not in MEASURED_FIELDS
+            )
+        ): record
+        for record in _results
+    }
+
+
+def compare(
+    baseline: pathlib.Path, latest: pathlib.Path, threshold: float
+) -> list[str]:
+    """Find measurements which are worse in the latest results than the baseline by more than a threshold.
+
+    Parameters
+    ----------
+    baseline : pathlib.Path
+        Results file to compare against
+    latest : pathlib.Path
+        Results file to check
+    threshold : float
+        Fractional increase above which a measurement counts as a regression
+
+    Returns
+    -------
+    list[str]
+        Description of each regression
+
+    """
+    _baseline = load_records(baseline)
+    regressions = []
+    for key, record in load_records(latest).items():
+        if key not in _baseline:
+            continue
+        for measurement in MEASUREMENTS.get(record["benchmark"], ()):
+            _before, _after = _baseline[key][measurement], record[measurement]
+            if _before > 0 and (_after - _before) / _before > threshold:
+                _label = ", ".join(
+                    f"{field}={value}" for field, value in key if field != "benchmark"
+                )
+                regressions.append(
+                    f"{record['benchmark']} ({_label}): {measurement} {_before:.4g} -> {_after:.4g}"
+                )
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline", type=pathlib.Path)
+    parser.add_argument("latest", type=pathlib.Path)
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args()
+
+    regressions = compare(args.baseline, args.latest, args.threshold)
+    print("\n".join(regressions) or "No regressions found.")
+    sys.exit(1 if regressions else 0)
@@ -0,0 +1,73 @@
+"""Stand In Run.
+
+Local replacement for simvue.Run used by the benchmarks, so that no Simvue server is required.
+"""
+
+import collections
+import typing
+
+
+class StandInRun:
+    """Minimal in-process replacement for simvue.Run which counts calls instead of contacting a server."""
+
+    calls: typing.ClassVar[collections.Counter] = collections.Counter()
+
+    def __init__(self, mode: str = "disabled", *args, **kwargs):
+        """Minimal in-process replacement for simvue.Run which counts calls instead of contacting a server.
+
+        Parameters
+        ----------
+        mode : str, optional
+            Mode of the run, by default "disabled"
+        *args
+            Ignored positional arguments accepted by simvue.Run
+        **kwargs
+            Ignored keyword arguments accepted by simvue.Run
+
+        """
+        self.mode = "disabled"
+        self._name = None
+        self._data = {"folder": "/benchmarks", "tags": []}
+        self.duration = 0.0
+        self.id = "stand_in"
+
+    def __enter__(self) -> "StandInRun":
+        """Enter the run context.
+
+        Returns
+        -------
+        StandInRun
+            This run
+
+        """
+        return self
+
+    def __exit__(self, *args: typing.Any) -> None:
+        """Exit the run context.
+
+        Parameters
+        ----------
+        *args : typing.Any
+            Exception information, ignored
+
+        """
+
+    def __getattr__(self, name: str) -> typing.Callable[..., None]:
+        """Return a method which records that it was called, for any Run method not defined here.
+
+        Parameters
+        ----------
+        name : str
+            Name of the Run method
+
+        Returns
+        -------
+        typing.Callable[..., None]
+            Function which counts calls to this method
+
+        """
+
+        def _record(*args, **kwargs) -> None:
+            StandInRun.calls[name] += 1
+
+        return _record
@@ -0,0 +1,223 @@
+"""Alert Evaluation.
+
+In-process evaluation of metric alerts against the values logged by the callback, so that they fire within the step
+which triggered them rather than once the values have been uploaded and checked by the server.
+"""
+
+import time
+import typing
+
+import numpy
+
+from simvue_tensorflow.extras.create_alerts import _alert_method
+
+# Comparison of an array of values against the thresholds of each rule
+RULES: dict[str, typing.Callable[[numpy.ndarray, dict[str, float]], numpy.ndarray]] = {
+    "is above": lambda values, limits: values > limits["threshold"],
+    "is below": lambda values, limits: values < limits["threshold"],
+    "is inside range": lambda values, limits: (values > limits["range_low"])
+    & (values < limits["range_high"]),
+    "is outside range": lambda values, limits: (values < limits["range_low"])
+    | (values > limits["range_high"]),
+}
+
+# Whether a window of values satisfies a rule, for each way of aggregating the window
+AGGREGATIONS: dict[
+    str,
+    typing.Callable[
+        [numpy.ndarray, typing.Callable[[numpy.ndarray], numpy.ndarray]], bool
+    ],
+] = {
+    "average": lambda values, rule: bool(rule(numpy.mean(values))),
+    "sum": lambda values, rule: bool(rule(numpy.sum(values))),
+    "at least one": lambda values, rule: bool(numpy.any(rule(values))),
+    "all": lambda values, rule: bool(numpy.all(rule(values))),
+}
+
+
+class MetricWindow:
+    """Most recent values of a metric and when they were logged, in a fixed-size ring buffer."""
+
+    def __init__(self, capacity: int):
+        """Create an empty ring buffer of metric values.
+
+        Parameters
+        ----------
+        capacity : int
+            Maximum number of values held, after which the oldest are overwritten
+
+        """
+        self._times = numpy.full(capacity, -numpy.inf)
+        self._values = numpy.zeros(capacity)
+        self._count: int = 0
+
+    def append(self, now: float, value: float) -> None:
+        """Add the latest value of the metric.
+
+        Parameters
+        ----------
+        now : float
+            Time the value was logged, from time.monotonic
+        value : float
+            The value of the metric
+
+        """
+        _index = self._count % len(self._values)
+        self._times[_index] = now
+        self._values[_index] = value
+        self._count += 1
+
+    def since(self, start: float) -> numpy.ndarray:
+        """Get the values logged since a given time.
+
+        Parameters
+        ----------
+        start : float
+            Earliest time to include, from time.monotonic
+
+        Returns
+        -------
+        numpy.ndarray
+            Values logged at or after the start time, in no particular order
+
+        """
+        return self._values[self._times >= start]
+
+
+class MetricAlertCheck(typing.NamedTuple):
+    """A metric alert compiled into a check of the values in its window."""
+
+    name: str
+    metric: str
+    window: float
+    rule: typing.Callable[[numpy.ndarray], numpy.ndarray]
+    aggregation: typing.Callable[
+        [numpy.ndarray, typing.Callable[[numpy.ndarray], numpy.ndarray]], bool
+    ]
+    description: str
+    trigger_abort: bool
+
+    @classmethod
+    def compile(
+        cls, alert_name: str, alert_definition: dict[str, typing.Any]
+    ) -> "MetricAlertCheck":
+        """Compile the definition of a metric alert into a check.
+
+        Parameters
+        ----------
+        alert_name : str
+            Name of the alert
+        alert_definition : dict[str, typing.Any]
+            Definition of the alert, as passed in to TensorVue
+
+        Returns
+        -------
+        MetricAlertCheck
+            Check which evaluates the alert against a window of values
+
+        """
+        _rule = RULES[alert_definition["rule"]]
+        _limits = {
+            limit: alert_definition[limit]
+            for limit in ("threshold", "range_low", "range_high")
+            if limit in alert_definition
+        }
+        _aggregation = alert_definition.get("aggregation", "average")
+        # As on the server, the window defaults to the frequency, both in seconds
+        _window = alert_definition.get("window") or alert_definition.get("frequency", 1)
+        _limits_description = (
+            _limits["threshold"]
+            if "threshold" in _limits
+            else f"{_limits['range_low']} to {_limits['range_high']}"
+        )
+        return cls(
+            name=alert_name,
+            metric=alert_definition["metric"],
+            window=_window,
+            rule=lambda values: _rule(values, _limits),
+            aggregation=AGGREGATIONS[_aggregation],
+            description=f"{alert_definition['metric']} ({_aggregation} over {_window}s) {alert_definition['rule']} {_limits_description}",
+            trigger_abort=alert_definition.get("trigger_abort", False),
+        )
+
+
+class LocalAlertEvaluator:
+    """Evaluates metric alerts against the values logged to a run as soon as each value is logged."""
+
+    def __init__(
+        self,
+        alert_definitions: dict[str, dict[str, typing.Any]],
+        alert_names: list[str],
+        capacity: int = 1024,
+    ):
+        """Compile the metric alerts attached to a run into checks.
+
+        Parameters
+        ----------
+        alert_definitions : dict[str, dict[str, typing.Any]]
+            Definitions of each alert, keyed by alert name
+        alert_names : list[str]
+            Names of the alerts attached to the run, of which only metric alerts are evaluated
+        capacity : int, optional
+            Maximum number of recent values of each metric held, by default 1024
+            If more values than this are logged within the window of an alert, only the most recent are used.
+
+        """
+        self._checks: dict[str, list[MetricAlertCheck]] = {}
+        for alert_name in alert_names:
+            _definition = alert_definitions[alert_name]
+            if _alert_method(alert_name, _definition).startswith("create_metric"):
+                _check = MetricAlertCheck.compile(alert_name, _definition)
+                self._checks.setdefault(_check.metric, []).append(_check)
+        self._capacity = capacity
+        self.reset()
+
+    def __bool__(self) -> bool:
+        """Whether any metric alerts are being evaluated.
+
+        Returns
+        -------
+        bool
+            True if there are metric alerts to evaluate
+
+        """
+        return bool(self._checks)
+
+    def reset(self) -> None:
+        """Discard all logged values, and mark every alert as not firing, for a new run."""
+        self._windows = {
+            metric: MetricWindow(self._capacity) for metric in self._checks
+        }
+        self._firing: set[str] = set()
+
+    def observe(self, metrics: dict[str, typing.Any]) -> list[MetricAlertCheck]:
+        """Add newly logged metric values, and evaluate the alerts on those metrics.
+
+        Parameters
+        ----------
+        metrics : dict[str, typing.Any]
+            Values of the metrics just logged, any which are missing or not monitored are ignored
+
+        Returns
+        -------
+        list[MetricAlertCheck]
+            Alerts which have started firing, each is only returned again once it has stopped firing
+
+        """
+        _now = time.monotonic()
+        _fired = []
+        for metric, checks in self._checks.items():
+            if (_value := metrics.get(metric)) is None:
+                continue
+            _window = self._windows[metric]
+            _window.append(_now, _value)
+            for check in checks:
+                _firing = check.aggregation(
+                    _window.since(_now - check.window), check.rule
+                )
+                if _firing and check.name not in self._firing:
+                    self._firing.add(check.name)
+                    _fired.append(check)
+                elif not _firing:
+                    self._firing.discard(check.name)
+        return _fired
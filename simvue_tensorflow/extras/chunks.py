@@ -0,0 +1,247 @@
+"""Chunks.
+
+Content-addressed uploading of large files such as model checkpoints, which are split into fixed size chunks so that
+only the chunks which have changed since a previous upload are sent to the server.
+
+Each chunk is stored as a compressed artifact named after the SHA-256 hash of its contents, and each upload of a file
+is stored as a small manifest listing the chunks which make it up, from which the file can be reassembled.
+"""
+
+import hashlib
+import json
+import mmap
+import pathlib
+import tempfile
+import threading
+import typing
+import zlib
+
+if typing.TYPE_CHECKING:
+    import simvue
+
+MANIFEST_SUFFIX: str = ".manifest"
+
+# Size of the pieces each chunk is compressed in, so that a whole compressed chunk is never held in memory
+COMPRESSION_BLOCK_SIZE: int = 1024**2
+
+
+def chunk_artifact_name(digest: str) -> str:
+    """Get the name of the artifact which a chunk is stored as.
+
+    Parameters
+    ----------
+    digest : str
+        SHA-256 hash of the chunk contents
+
+    Returns
+    -------
+    str
+        The artifact name
+
+    """
+    return f"chunk_{digest}.zz"
+
+
+class ChunkStore:
+    """Uploads files as content-addressed chunks, skipping any chunks which have already been uploaded."""
+
+    def __init__(self, chunk_size: int = 4 * 1024**2, compression_level: int = 1):
+        """Create a store which uploads files as content-addressed chunks.
+
+        Parameters
+        ----------
+        chunk_size : int, optional
+            Size of each chunk in bytes, by default 4 MiB
+            Smaller chunks find more unchanged data, at the cost of more artifacts and larger manifests.
+        compression_level : int, optional
+            zlib compression level of the uploaded chunks, by default 1
+
+        """
+        self.chunk_size = chunk_size
+        self.compression_level = compression_level
+        # ID of the run which each chunk uploaded so far is stored in, keyed by the hash of its contents
+        self._locations: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def upload(
+        self,
+        run: "simvue.Run",
+        file_path: typing.Union[str, pathlib.Path],
+        category: typing.Literal["input", "output", "code"],
+        name: str,
+        chunk_run: typing.Optional["simvue.Run"] = None,
+    ) -> int:
+        """Upload any new chunks of a file, and save a manifest of all of its chunks to a run.
+
+        Parameters
+        ----------
+        run : simvue.Run
+            The run to save the manifest to
+        file_path : typing.Union[str, pathlib.Path]
+            Path to the file to upload
+        category : typing.Literal["input", "output", "code"]
+            Category of the manifest artifact
+        name : str
+            Name of the file, the manifest is stored as this name followed by '.manifest'
+        chunk_run : typing.Optional[simvue.Run], optional
+            The run to save new chunks to, by default the same run as the manifest
+            Using a long-lived run allows chunks to be shared by manifests in many short-lived runs.
+
+        Returns
+        -------
+        int
+            Number of compressed bytes uploaded
+
+        """
+        chunk_run = chunk_run or run
+        _chunks: list[dict[str, str]] = []
+        _uploaded = 0
+        _size = pathlib.Path(file_path).stat().st_size
+
+        # Memory mapping allows each chunk to be hashed and compressed without copying it
+        if _size:
+            with open(file_path, "rb") as file, mmap.mmap(
+                file.fileno(), 0, access=mmap.ACCESS_READ
+            ) as mapped, memoryview(mapped) as view:
+                for offset in range(0, _size, self.chunk_size):
+                    with view[offset : offset + self.chunk_size] as chunk:
+                        _chunk, _chunk_uploaded = self._store_chunk(chunk_run, chunk)
+                    _chunks.append(_chunk)
+                    _uploaded += _chunk_uploaded
+
+        run.save_object(
+            obj={
+                "name": name,
+                "size": _size,
+                "chunk_size": self.chunk_size,
+                "compression": "zlib",
+                "chunks": _chunks,
+            },
+            category=category,
+            name=f"{name}{MANIFEST_SUFFIX}",
+        )
+        return _uploaded
+
+    def _store_chunk(
+        self, run: "simvue.Run", chunk: memoryview
+    ) -> tuple[dict[str, str], int]:
+        """Hash a chunk, and upload it to a run unless a chunk with the same contents has already been uploaded.
+
+        Parameters
+        ----------
+        run : simvue.Run
+            The run to save the chunk to if it is new
+        chunk : memoryview
+            Contents of the chunk
+
+        Returns
+        -------
+        tuple[dict[str, str], int]
+            The hash of the chunk and the ID of the run it is stored in, and the number of bytes uploaded
+
+        """
+        _digest = hashlib.sha256(chunk).hexdigest()
+        with self._lock:
+            _location = self._locations.get(_digest)
+            # Claim the chunk, so that a concurrent upload of the same contents does not upload it twice
+            if _location is None:
+                self._locations[_digest] = run.id
+        if _location is not None:
+            return {"sha256": _digest, "run": _location}, 0
+
+        _uploaded: typing.Optional[int] = None
+        try:
+            _uploaded = self._upload_chunk(run, _digest, chunk)
+        finally:
+            # Release the claim if the upload failed, so that a later upload can retry it
+            if _uploaded is None:
+                with self._lock:
+                    self._locations.pop(_digest, None)
+        return {"sha256": _digest, "run": run.id}, _uploaded
+
+    def _upload_chunk(self, run: "simvue.Run", digest: str, chunk: memoryview) -> int:
+        """Compress a chunk into a temporary file and upload it to a run.
+
+        Parameters
+        ----------
+        run : simvue.Run
+            The run to save the chunk to
+        digest : str
+            SHA-256 hash of the chunk contents
+        chunk : memoryview
+            Contents of the chunk
+
+        Returns
+        -------
+        int
+            Size of the compressed chunk in bytes
+
+        """
+        _compressor = zlib.compressobj(self.compression_level)
+        with tempfile.TemporaryDirectory(prefix="tensorvue_chunk_") as temp_dir:
+            _path = pathlib.Path(temp_dir, chunk_artifact_name(digest))
+            with _path.open("wb") as compressed:
+                for offset in range(0, len(chunk), COMPRESSION_BLOCK_SIZE):
+                    compressed.write(
+                        _compressor.compress(
+                            chunk[offset : offset + COMPRESSION_BLOCK_SIZE]
+                        )
+                    )
+                compressed.write(_compressor.flush())
+            run.save_file(file_path=_path, category="output", name=_path.name)
+            return _path.stat().st_size
+
+
+def assemble_file(
+    manifest: typing.Union[str, dict[str, typing.Any]],
+    destination: typing.Union[str, pathlib.Path],
+    client: typing.Optional["simvue.Client"] = None,
+) -> pathlib.Path:
+    """Download the chunks listed in a manifest, and reassemble them into the original file.
+
+    Parameters
+    ----------
+    manifest : typing.Union[str, dict[str, typing.Any]]
+        The manifest, or its JSON representation
+    destination : typing.Union[str, pathlib.Path]
+        Path to write the reassembled file to
+    client : typing.Optional[simvue.Client], optional
+        Client used to download the chunks, by default a new client
+
+    Returns
+    -------
+    pathlib.Path
+        Path to the reassembled file
+
+    Raises
+    ------
+    RuntimeError
+        Raised if a chunk does not match its hash, or the reassembled file is not the expected size
+
+    """
+    if isinstance(manifest, str):
+        manifest = json.loads(manifest)
+    if client is None:
+        import simvue
+
+        client = simvue.Client()
+
+    destination = pathlib.Path(destination)
+    with tempfile.TemporaryDirectory(
+        prefix="tensorvue_chunks_"
+    ) as temp_dir, destination.open("wb") as output:
+        for chunk in manifest["chunks"]:
+            _name = chunk_artifact_name(chunk["sha256"])
+            client.get_artifact_as_file(chunk["run"], _name, output_dir=temp_dir)
+            _contents = zlib.decompress(pathlib.Path(temp_dir, _name).read_bytes())
+            if hashlib.sha256(_contents).hexdigest() != chunk["sha256"]:
+                raise RuntimeError(
+                    f"Chunk {chunk['sha256']} of {manifest['name']} is corrupt."
+                )
+            output.write(_contents)
+
+    if destination.stat().st_size != manifest["size"]:
+        raise RuntimeError(
+            f"Reassembled {manifest['name']} is {destination.stat().st_size} bytes, expected {manifest['size']}."
+        )
+    return destination
@@ -1,17 +1,121 @@
 """Create Alerts.
 
-Function for creating alerts based on definitions provided by user
+Functions for creating alerts based on definitions provided by user, and attaching them to runs
 
 """
 
+import functools
+import inspect
+import threading
 import typing
 
-import simvue
+if typing.TYPE_CHECKING:
+    import simvue
+
+
+def _alert_method(alert_name: str, alert_definition: dict[str, typing.Any]) -> str:
+    """Find the name of the Run method which creates an alert, from the source in its definition.
+
+    Parameters
+    ----------
+    alert_name : str
+        Name of the alert
+    alert_definition : dict[str, typing.Any]
+        Definition of the alert, including its source
+
+    Returns
+    -------
+    str
+        Name of the Run method which creates this type of alert
+
+    Raises
+    ------
+    RuntimeError
+        Raised if a valid source could not be deduced from alert definition
+
+    """
+    _source = alert_definition.get("source")
+    if _source == "events":
+        return "create_event_alert"
+    if _source == "metrics" and alert_definition.get("threshold"):
+        return "create_metric_threshold_alert"
+    if _source == "metrics":
+        return "create_metric_range_alert"
+    if _source == "user":
+        return "create_user_alert"
+    raise RuntimeError(f"{alert_name} has unknown source type '{_source}'")
+
+
+@functools.lru_cache
+def _argument_model(method: str) -> type:
+    """Build a model of the arguments accepted by the Run method which creates a type of alert, from its signature.
+
+    Parameters
+    ----------
+    method : str
+        Name of the Run method which creates the alert
+
+    Returns
+    -------
+    type
+        Pydantic model validating the types and values of the arguments, and rejecting any others
+
+    """
+    # Imported here, as Simvue is slow to import and alerts are not validated until the first run is created
+    import pydantic
+    import simvue
+
+    _function = inspect.unwrap(getattr(simvue.Run, method))
+    _types = typing.get_type_hints(_function, include_extras=True)
+    return pydantic.create_model(
+        method,
+        __config__=pydantic.ConfigDict(extra="forbid"),
+        **{
+            name: (
+                _types[name],
+                ...
+                if parameter.default is inspect.Parameter.empty
+                else parameter.default,
+            )
+            for name, parameter in inspect.signature(_function).parameters.items()
+            # Alerts are always attached to the run they are created for
+            if name not in ("self", "attach_to_run")
+        },
+    )
+
+
+def validate_alert(alert_name: str, alert_definition: dict[str, typing.Any]) -> None:
+    """Check that an alert has been defined accurately, against the Run method which creates it, without creating it.
+
+    Parameters
+    ----------
+    alert_name : str
+        Name of the alert
+    alert_definition : dict[str, typing.Any]
+        Definition of the alert, as passed in to TensorVue
+
+    Raises
+    ------
+    ValueError
+        Raised if the name, arguments or their values are not valid for this type of alert
+
+    """
+    import pydantic
+
+    _arguments = {
+        key: value for key, value in alert_definition.items() if key != "source"
+    }
+    try:
+        _argument_model(_alert_method(alert_name, alert_definition)).model_validate(
+            {"name": alert_name, **_arguments}
+        )
+    except pydantic.ValidationError as e:
+        raise ValueError(f"Alert {alert_name} is not valid: {e}") from None
 
 
 def create_alerts(
-    alert_name: str, alert_definition: dict[str, typing.Any], run: simvue.Run
-) -> None:
+    alert_name: str, alert_definition: dict[str, typing.Any], run: "simvue.Run"
+) -> typing.Optional[str]:
     """Create alerts from their definitions provided in to TensorVue.
 
     Parameters
@@ -23,33 +127,73 @@ def create_alerts(
     run : simvue.Run
         The run to add the alerts to
 
-    Raises
-    ------
-    RuntimeError
-        Raised if a valid source could not be deduced from alert definition
+    Returns
+    -------
+    typing.Optional[str]
+        The ID of the created alert, if it was created successfully
 
     """
+    _method = _alert_method(alert_name, alert_definition)
     alert_definition = alert_definition.copy()
-    _source = alert_definition.pop("source")
-    if _source == "events":
-        _alert_id = run.create_event_alert(
-            name=alert_name,
-            **alert_definition,
-        )
-    elif _source == "metrics" and alert_definition.get("threshold"):
-        _alert_id = run.create_metric_threshold_alert(
-            name=alert_name,
-            **alert_definition,
-        )
-    elif _source == "metrics":
-        _alert_id = run.create_metric_range_alert(
-            name=alert_name,
-            **alert_definition,
-        )
-    elif _source == "user":
-        _alert_id = run.create_user_alert(
-            name=alert_name,
-            **alert_definition,
-        )
-    else:
-        raise RuntimeError(f"{alert_name} has unknown source type '{_source}'")
+    alert_definition.pop("source")
+    return getattr(run, _method)(name=alert_name, **alert_definition)
+
+
+class AlertRegistry:
+    """Creates each alert once, then attaches it to any further runs using its ID."""
+
+    def __init__(self, alert_definitions: dict[str, dict[str, typing.Any]]):
+        """Create a registry of alerts, which creates each alert once and reuses its ID for further runs.
+
+        Parameters
+        ----------
+        alert_definitions : dict[str, dict[str, typing.Any]]
+            Definitions of each alert, keyed by alert name
+
+        """
+        self.alert_definitions = alert_definitions
+        self._alert_ids: dict[str, str] = {}
+        self._validated: bool = False
+        # Runs may be created in a background thread, so guard against creating an alert twice
+        self._lock = threading.Lock()
+
+    def validate(self) -> None:
+        """Check that every alert has been defined accurately the first time this is called, raising ValueError if not."""
+        if self._validated:
+            return
+        for alert_name, alert_definition in self.alert_definitions.items():
+            validate_alert(alert_name, alert_definition)
+        self._validated = True
+
+    def attach(self, alert_names: list[str], run: "simvue.Run") -> None:
+        """Add alerts to a run, only creating those which have not previously been created.
+
+        Parameters
+        ----------
+        alert_names : list[str]
+            Names of the alerts to add to the run
+        run : simvue.Run
+            The run to add the alerts to
+
+        """
+        if not alert_names:
+            return
+        with self._lock:
+            self.validate()
+            _created = []
+            for alert_name in alert_names:
+                if alert_name in self._alert_ids:
+                    continue
+                # Creating the alert also attaches it to this run
+                _created.append(alert_name)
+                if _alert_id := create_alerts(
+                    alert_name, self.alert_definitions[alert_name], run
+                ):
+                    self._alert_ids[alert_name] = _alert_id
+            _existing_ids = [
+                self._alert_ids[alert_name]
+                for alert_name in alert_names
+                if alert_name not in _created
+            ]
+        if _existing_ids:
+            run.add_alerts(ids=_existing_ids)
@@ -0,0 +1,93 @@
+"""Device Buffer.
+
+Buffer for batch metrics which are passed in as tensors, storing them on-device until they are flushed to a Simvue run.
+"""
+
+import typing
+
+import numpy
+import tensorflow as tf
+
+from simvue_tensorflow.extras.metric_buffer import MetricBuffer
+
+
+def materialise_logs(logs: typing.Optional[dict]) -> dict:
+    """Convert any tensors in a dictionary of logs to Python floats.
+
+    Parameters
+    ----------
+    logs : typing.Optional[dict]
+        Logs passed into a callback method, possibly containing tensors
+
+    Returns
+    -------
+    dict
+        The logs, with any scalar tensors converted to floats
+
+    """
+    return {
+        key: float(value) if tf.is_tensor(value) else value
+        for key, value in (logs or {}).items()
+    }
+
+
+class DeviceMetricBuffer(MetricBuffer):
+    """Fixed capacity buffer of tensor or float metric values, with tensors only copied to the host when flushed to a run."""
+
+    def _allocate_values(self) -> list[list[typing.Union[tf.Tensor, float]]]:
+        """Allocate slots for references to the metric tensors.
+
+        Returns
+        -------
+        list[list[typing.Union[tf.Tensor, float]]]
+            A column of slots for each metric, with a slot for each step
+
+        """
+        return [[numpy.nan] * self.capacity for _ in self.metric_names]
+
+    def _store_values(
+        self, row: int, values: typing.Sequence[typing.Union[tf.Tensor, float, None]]
+    ) -> None:
+        """Keep references to the metric tensors for a step, without running any device operations.
+
+        Parameters
+        ----------
+        row : int
+            Index of the row to write to
+        values : typing.Sequence[typing.Union[tf.Tensor, float, None]]
+            Value of each metric, None if missing
+
+        """
+        for column, value in zip(self._values, values):
+            column[row] = numpy.nan if value is None else value
+
+    def _read_values(self) -> list[list[float]]:
+        """Stack all buffered tensors on-device and copy them to the host in a single transfer.
+
+        Values which were passed in as floats are read directly, so that they keep their precision.
+
+        Returns
+        -------
+        list[list[float]]
+            Value of each metric for each buffered step
+
+        """
+        _values = numpy.full((self._size, len(self.metric_names)), numpy.nan)
+        _positions: list[tuple[int, int]] = []
+        _tensors: list[tf.Tensor] = []
+        for column, values in enumerate(self._values):
+            _rows = []
+            for row, value in enumerate(values[: self._size]):
+                if tf.is_tensor(value):
+                    _rows.append(row)
+                else:
+                    _values[row, column] = value
+            if _rows:
+                _positions += [(row, column) for row in _rows]
+                _tensors.append(
+                    tf.cast(tf.stack([values[row] for row in _rows]), tf.float64)
+                )
+        if _tensors:
+            _rows, _columns = zip(*_positions)
+            _values[list(_rows), list(_columns)] = tf.concat(_tensors, axis=0).numpy()
+        return _values.tolist()
@@ -0,0 +1,109 @@
+"""Distribution.
+
+Helpers for tracking training which is distributed across several devices or workers with a tf.distribute strategy.
+"""
+
+import typing
+
+import tensorflow as tf
+
+
+def get_strategy(model: typing.Optional[typing.Any] = None) -> tf.distribute.Strategy:
+    """Find the distribution strategy which a model is being trained with.
+
+    Parameters
+    ----------
+    model : typing.Optional[typing.Any], optional
+        The Keras model being trained, by default None
+        If not provided, or the model does not record its strategy, the strategy of the current scope is used.
+
+    Returns
+    -------
+    tf.distribute.Strategy
+        The active strategy, the default (single replica) strategy if none is in use
+
+    """
+    _strategy = getattr(model, "distribute_strategy", None)
+    return _strategy or tf.distribute.get_strategy()
+
+
+def is_chief(strategy: tf.distribute.Strategy) -> bool:
+    """Determine whether this process is the chief worker of a distributed training cluster.
+
+    Parameters
+    ----------
+    strategy : tf.distribute.Strategy
+        The strategy which the model is being trained with
+
+    Returns
+    -------
+    bool
+        Whether this is the chief worker, always True for strategies which run within a single process.
+        If the cluster has no chief, the first worker is treated as the chief.
+
+    """
+    _resolver = strategy.cluster_resolver
+    if not _resolver or not _resolver.task_type or _resolver.task_type == "chief":
+        return True
+    return (
+        _resolver.task_type == "worker"
+        and _resolver.task_id == 0
+        and "chief" not in _resolver.cluster_spec().as_dict()
+    )
+
+
+def reduce_logs(
+    logs: typing.Optional[dict],
+    strategy: tf.distribute.Strategy,
+    keep_on_device: bool = False,
+) -> dict:
+    """Average any per-replica values in a dictionary of logs over the replicas held by this worker.
+
+    All per-replica values are stacked and reduced together, so that the logs are reduced once rather than once per replica.
+
+    Parameters
+    ----------
+    logs : typing.Optional[dict]
+        Logs passed into a callback method, possibly containing scalar per-replica values
+    strategy : tf.distribute.Strategy
+        The strategy which produced the per-replica values
+    keep_on_device : bool, optional
+        Whether to return the reduced values as tensors rather than copying them to the host, by default False
+
+    Returns
+    -------
+    dict
+        The logs, with each per-replica value replaced by its mean across replicas
+
+    """
+    logs = logs or {}
+    _distributed = [
+        key
+        for key, value in logs.items()
+        if isinstance(value, tf.distribute.DistributedValues)
+    ]
+    if not _distributed:
+        return logs
+
+    # Rows are metrics and columns are replicas
+    _means = tf.reduce_mean(
+        tf.stack(
+            [
+                tf.cast(
+                    tf.stack(strategy.experimental_local_results(logs[key])),
+                    tf.float64,
+                )
+                for key in _distributed
+            ]
+        ),
+        axis=1,
+    )
+    return {
+        **logs,
+        **dict(
+            zip(
+                _distributed,
+                tf.unstack(_means) if keep_on_device else _means.numpy().tolist(),
+            )
+        ),
+    }
@@ -0,0 +1,526 @@
+"""Early Stopping.
+
+Criteria for stopping training early, which can be combined with & (all must be satisfied) and | (any must be
+satisfied). Each criterion is updated incrementally with the metrics at the end of each Epoch, keeping only a constant
+amount of state such as a smoothed value and a count of Epochs, rather than the full history of each metric.
+"""
+
+import typing
+
+import simvue_tensorflow.extras.operators as operators
+
+
+class Progress(typing.NamedTuple):
+    """How far training has progressed."""
+
+    epochs: int
+    steps: int
+    seconds: float
+
+
+class Criterion:
+    """Condition for stopping training early."""
+
+    # Whether the criterion can become satisfied between Epochs, so must be checked after every step
+    checks_progress: bool = False
+
+    def reset(self, direction: typing.Callable[[str], str]) -> None:
+        """Forget any previous training, before training begins.
+
+        Parameters
+        ----------
+        direction : typing.Callable[[str], str]
+            Function returning whether a metric is to be maximised or minimised, given its name
+
+        """
+
+    def update(self, metrics: dict[str, float]) -> None:
+        """Update the criterion with the metrics at the end of an Epoch.
+
+        Parameters
+        ----------
+        metrics : dict[str, float]
+            Value of each metric reported in this Epoch
+
+        """
+
+    def satisfied(self, progress: Progress) -> bool:
+        """Determine whether training should stop.
+
+        Parameters
+        ----------
+        progress : Progress
+            How far training has progressed
+
+        Returns
+        -------
+        bool
+            Whether the criterion is satisfied
+
+        """
+        return False
+
+    def describe(self, progress: Progress) -> str:
+        """Describe why the criterion is satisfied.
+
+        Parameters
+        ----------
+        progress : Progress
+            How far training has progressed
+
+        Returns
+        -------
+        str
+            Reason for stopping training
+
+        """
+        return type(self).__name__
+
+    def __and__(self, other: "Criterion") -> "AllOf":
+        """Combine with another criterion, both of which must be satisfied.
+
+        Parameters
+        ----------
+        other : Criterion
+            The other criterion
+
+        Returns
+        -------
+        AllOf
+            Criterion satisfied when both are satisfied
+
+        """
+        return AllOf(self, other)
+
+    def __or__(self, other: "Criterion") -> "AnyOf":
+        """Combine with another criterion, either of which must be satisfied.
+
+        Parameters
+        ----------
+        other : Criterion
+            The other criterion
+
+        Returns
+        -------
+        AnyOf
+            Criterion satisfied when either is satisfied
+
+        """
+        return AnyOf(self, other)
+
+
+class SmoothedMetric:
+    """Exponential moving average of a metric, updated at the end of each Epoch."""
+
+    def __init__(self, metric: str, smoothing: float = 0.0):
+        """Track the exponential moving average of a metric.
+
+        Parameters
+        ----------
+        metric : str
+            Name of the metric, as reported in the Epoch logs
+        smoothing : float, optional
+            Weight of the previous average against each new value, between 0 and 1, by default 0.0 for no smoothing
+
+        """
+        self.metric = metric
+        self.smoothing = smoothing
+        self.value: typing.Optional[float] = None
+
+    def update(self, metrics: dict[str, float]) -> bool:
+        """Add the latest value of the metric to the average.
+
+        Parameters
+        ----------
+        metrics : dict[str, float]
+            Value of each metric reported in this Epoch
+
+        Returns
+        -------
+        bool
+            Whether the metric was reported this Epoch
+
+        """
+        if (_value := metrics.get(self.metric)) is None:
+            return False
+        self.value = (
+            _value
+            if self.value is None
+            else self.smoothing * self.value + (1 - self.smoothing) * _value
+        )
+        return True
+
+
+class Threshold(Criterion):
+    """Satisfied once a metric has compared to a target in the given way for a number of consecutive Epochs."""
+
+    def __init__(
+        self,
+        metric: str,
+        condition: operators.Operator,
+        target: float,
+        patience: int = 1,
+        smoothing: float = 0.0,
+    ):
+        """Stop training once a metric reaches a target.
+
+        Parameters
+        ----------
+        metric : str
+            Name of the metric, as reported in the Epoch logs
+        condition : operators.Operator
+            How to compare the value of the metric to the target
+        target : float
+            The target value of the metric
+        patience : int, optional
+            Number of consecutive Epochs the condition must hold for, by default 1
+        smoothing : float, optional
+            Weight of the exponential moving average of the metric, by default 0.0 for no smoothing
+
+        """
+        self._metric = SmoothedMetric(metric, smoothing)
+        self.condition = condition
+        self.target = target
+        self.patience = patience
+        self._epochs_held: int = 0
+
+    def reset(self, direction: typing.Callable[[str], str]) -> None:
+        """Forget any previous training, before training begins.
+
+        Parameters
+        ----------
+        direction : typing.Callable[[str], str]
+            Function returning whether a metric is to be maximised or minimised, unused
+
+        """
+        self._metric.value = None
+        self._epochs_held = 0
+
+    def update(self, metrics: dict[str, float]) -> None:
+        """Compare the metric to the target at the end of an Epoch.
+
+        Parameters
+        ----------
+        metrics : dict[str, float]
+            Value of each metric reported in this Epoch
+
+        """
+        if not self._metric.update(metrics):
+            return
+        if operators.OPERATORS[self.condition](self._metric.value, self.target):
+            self._epochs_held += 1
+        else:
+            self._epochs_held = 0
+
+    def satisfied(self, progress: Progress) -> bool:
+        """Determine whether the condition has held for enough Epochs.
+
+        Parameters
+        ----------
+        progress : Progress
+            How far training has progressed
+
+        Returns
+        -------
+        bool
+            Whether the criterion is satisfied
+
+        """
+        return self._epochs_held >= self.patience
+
+    def describe(self, progress: Progress) -> str:
+        """Describe the value of the metric compared to the target.
+
+        Parameters
+        ----------
+        progress : Progress
+            How far training has progressed
+
+        Returns
+        -------
+        str
+            Reason for stopping training
+
+        """
+        _condition = getattr(self.condition, "value", self.condition)
+        return f"{self._metric.metric} = {self._metric.value} which is {_condition} the target of {self.target} for {self._epochs_held} Epoch(s)"
+
+
+class Plateau(Criterion):
+    """Satisfied once a metric has not improved by more than a minimum amount for a number of Epochs."""
+
+    def __init__(
+        self,
+        metric: str,
+        patience: int,
+        min_delta: float = 0.0,
+        direction: typing.Optional[typing.Literal["maximise", "minimise"]] = None,
+        smoothing: float = 0.0,
+    ):
+        """Stop training once a metric has stopped improving.
+
+        Parameters
+        ----------
+        metric : str
+            Name of the metric, as reported in the Epoch logs
+        patience : int
+            Number of Epochs without improvement after which the criterion is satisfied
+        min_delta : float, optional
+            Smallest change from the best value so far which counts as an improvement, by default 0.0
+        direction : typing.Optional[typing.Literal["maximise", "minimise"]], optional
+            Whether an increase or decrease is an improvement, by default the direction TensorVue uses for the metric
+        smoothing : float, optional
+            Weight of the exponential moving average of the metric, by default 0.0 for no smoothing
+
+        """
+        self._metric = SmoothedMetric(metric, smoothing)
+        self.patience = patience
+        self.min_delta = min_delta
+        self.direction = direction
+        self._sign: float = 1.0
+        self._best: typing.Optional[float] = None
+        self._epochs_since_improvement: int = 0
+
+    def reset(self, direction: typing.Callable[[str], str]) -> None:
+        """Forget any previous training, before training begins.
+
+        Parameters
+        ----------
+        direction : typing.Callable[[str], str]
+            Function returning whether a metric is to be maximised or minimised, used if no direction was given
+
+        """
+        self._sign = (
+            1.0
+            if (self.direction or direction(self._metric.metric)) == "maximise"
+            else -1.0
+        )
+        self._metric.value = None
+        self._best = None
+        self._epochs_since_improvement = 0
+
+    def update(self, metrics: dict[str, float]) -> None:
+        """Compare the metric to the best value so far at the end of an Epoch.
+
+        Parameters
+        ----------
+        metrics : dict[str, float]
+            Value of each metric reported in this Epoch
+
+        """
+        if not self._metric.update(metrics):
+            return
+        if (
+            self._best is None
+            or self._sign * (self._metric.value - self._best) > self.min_delta
+        ):
+            self._best = self._metric.value
+            self._epochs_since_improvement = 0
+        else:
+            self._epochs_since_improvement += 1
+
+    def satisfied(self, progress: Progress) -> bool:
+        """Determine whether the metric has gone without improving for long enough.
+
+        Parameters
+        ----------
+        progress : Progress
+            How far training has progressed
+
+        Returns
+        -------
+        bool
+            Whether the criterion is satisfied
+
+        """
+        return self._epochs_since_improvement >= self.patience
+
+    def describe(self, progress: Progress) -> str:
+        """Describe how long the metric has gone without improving.
+
+        Parameters
+        ----------
+        progress : Progress
+            How far training has progressed
+
+        Returns
+        -------
+        str
+            Reason for stopping training
+
+        """
+        return f"{self._metric.metric} has not improved by more than {self.min_delta} on its best value of {self._best} for {self._epochs_since_improvement} Epoch(s)"
+
+
+class Budget(Criterion):
+    """Satisfied once training has run for a given time or number of steps."""
+
+    checks_progress = True
+
+    def __init__(
+        self, seconds: typing.Optional[float] = None, steps: typing.Optional[int] = None
+    ):
+        """Stop training once it has used up its budget, which is checked after every step.
+
+        Parameters
+        ----------
+        seconds : typing.Optional[float], optional
+            Wall-clock time since training began after which to stop, by default None
+        steps : typing.Optional[int], optional
+            Number of training steps after which to stop, by default None
+
+        """
+        self.seconds = seconds
+        self.steps = steps
+
+    def satisfied(self, progress: Progress) -> bool:
+        """Determine whether the time or step budget has been used up.
+
+        Parameters
+        ----------
+        progress : Progress
+            How far training has progressed
+
+        Returns
+        -------
+        bool
+            Whether the criterion is satisfied
+
+        """
+        return (self.seconds is not None and progress.seconds >= self.seconds) or (
+            self.steps is not None and progress.steps >= self.steps
+        )
+
+    def describe(self, progress: Progress) -> str:
+        """Describe the budget which has been used up.
+
+        Parameters
+        ----------
+        progress : Progress
+            How far training has progressed
+
+        Returns
+        -------
+        str
+            Reason for stopping training
+
+        """
+        if self.steps is not None and progress.steps >= self.steps:
+            return f"{progress.steps} steps have been trained, reaching the budget of {self.steps}"
+        return f"{progress.seconds:.0f} seconds have elapsed, reaching the budget of {self.seconds}"
+
+
+class Combination(Criterion):
+    """Several criteria which are updated together."""
+
+    def __init__(self, *criteria: Criterion):
+        """Combine criteria, which are all updated at the end of each Epoch.
+
+        Parameters
+        ----------
+        *criteria : Criterion
+            The criteria to combine
+
+        """
+        self.criteria = criteria
+        self.checks_progress = any(criterion.checks_progress for criterion in criteria)
+
+    def reset(self, direction: typing.Callable[[str], str]) -> None:
+        """Forget any previous training in all criteria, before training begins.
+
+        Parameters
+        ----------
+        direction : typing.Callable[[str], str]
+            Function returning whether a metric is to be maximised or minimised, given its name
+
+        """
+        for criterion in self.criteria:
+            criterion.reset(direction)
+
+    def update(self, metrics: dict[str, float]) -> None:
+        """Update all criteria with the metrics at the end of an Epoch.
+
+        Parameters
+        ----------
+        metrics : dict[str, float]
+            Value of each metric reported in this Epoch
+
+        """
+        for criterion in self.criteria:
+            criterion.update(metrics)
+
+
+class AllOf(Combination):
+    """Satisfied once all of the given criteria are satisfied."""
+
+    def satisfied(self, progress: Progress) -> bool:
+        """Determine whether all criteria are satisfied.
+
+        Parameters
+        ----------
+        progress : Progress
+            How far training has progressed
+
+        Returns
+        -------
+        bool
+            Whether every criterion is satisfied
+
+        """
+        return all(criterion.satisfied(progress) for criterion in self.criteria)
+
+    def describe(self, progress: Progress) -> str:
+        """Describe why each criterion is satisfied.
+
+        Parameters
+        ----------
+        progress : Progress
+            How far training has progressed
+
+        Returns
+        -------
+        str
+            Reasons for stopping training
+
+        """
+        return " and ".join(criterion.describe(progress) for criterion in self.criteria)
+
+
+class AnyOf(Combination):
+    """Satisfied once any of the given criteria are satisfied."""
+
+    def satisfied(self, progress: Progress) -> bool:
+        """Determine whether any criterion is satisfied.
+
+        Parameters
+        ----------
+        progress : Progress
+            How far training has progressed
+
+        Returns
+        -------
+        bool
+            Whether at least one criterion is satisfied
+
+        """
+        return any(criterion.satisfied(progress) for criterion in self.criteria)
+
+    def describe(self, progress: Progress) -> str:
+        """Describe why the satisfied criteria are satisfied.
+
+        Parameters
+        ----------
+        progress : Progress
+            How far training has progressed
+
+        Returns
+        -------
+        str
+            Reasons for stopping training
+
+        """
+        return " or ".join(
+            criterion.describe(progress)
+            for criterion in self.criteria
+            if criterion.satisfied(progress)
+        )
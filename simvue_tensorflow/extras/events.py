@@ -0,0 +1,163 @@
+"""Events.
+
+Structured event records which are only formatted once they are sent, filtered by level, and optionally batched
+so that all of the events logged to a run by a callback method are submitted together, each keeping its own message,
+level and timestamp.
+"""
+
+import datetime
+import typing
+
+if typing.TYPE_CHECKING:
+    import simvue
+
+# Severity of each event level, in the order used by Simvue
+EVENT_LEVELS: dict[str, int] = {"debug": 10, "info": 20, "warning": 30}
+
+
+class EventRecord(typing.NamedTuple):
+    """An event which has not yet been formatted into a message."""
+
+    level: str
+    template: str
+    args: tuple[typing.Any, ...]
+    timestamp: typing.Optional[datetime.datetime] = None
+
+    def format(self) -> str:
+        """Format the event into its message.
+
+        Returns
+        -------
+        str
+            The template, with each {} replaced by the corresponding argument
+
+        """
+        return self.template.format(*self.args) if self.args else self.template
+
+
+class EventStream:
+    """Filters events by level, and sends them to their runs either immediately or in batches once flushed."""
+
+    def __init__(
+        self,
+        level: typing.Literal["debug", "info", "warning"] = "debug",
+        batch: bool = False,
+    ):
+        """Create a stream of events.
+
+        Parameters
+        ----------
+        level : typing.Literal["debug", "info", "warning"], optional
+            Lowest level of event which is sent, by default "debug" to send all events
+        batch : bool, optional
+            Whether to hold events until flushed, submitting those for each run together, by default False
+
+        """
+        self._threshold = EVENT_LEVELS[level]
+        self.batch = batch
+        # Events waiting to be sent, keyed by the ID of the Python object of their run
+        self._pending: dict[int, tuple["simvue.Run", list[EventRecord]]] = {}
+
+    def enabled(self, level: str) -> bool:
+        """Determine whether events of a given level are sent, so that work preparing them can be skipped.
+
+        Parameters
+        ----------
+        level : str
+            The event level
+
+        Returns
+        -------
+        bool
+            Whether events of this level are sent
+
+        """
+        return EVENT_LEVELS[level] >= self._threshold
+
+    def emit(
+        self, run: "simvue.Run", template: str, *args: typing.Any, level: str = "info"
+    ) -> None:
+        """Log an event to a run, unless its level is filtered out.
+
+        Parameters
+        ----------
+        run : simvue.Run
+            The run to log the event to
+        template : str
+            The event message, with a {} in place of each argument
+        *args : typing.Any
+            Values substituted into the message when it is sent
+        level : str, optional
+            Level of the event, by default "info"
+
+        """
+        if EVENT_LEVELS[level] < self._threshold:
+            return
+        if not self.batch:
+            _record = EventRecord(level, template, args)
+            run.log_event(_record.format(), log_level=_record.level)
+            return
+        _record = EventRecord(
+            level, template, args, datetime.datetime.now(datetime.timezone.utc)
+        )
+        self._pending.setdefault(id(run), (run, []))[1].append(_record)
+
+    def flush(self) -> None:
+        """Send the pending events of each run, as separate events with the time each was emitted.
+
+        For an initialised Simvue run, the first event is logged through the run, and the rest are queued with its
+        dispatcher, so that they are uploaded together as a single submission from its background thread.
+        """
+        _pending, self._pending = self._pending, {}
+        for run, records in _pending.values():
+            _logged = False
+            for record in records:
+                if _logged and _dispatch_event(run, record):
+                    continue
+                # Logging through the run checks its state, and suppresses errors if requested
+                _logged = run.log_event(
+                    record.format(), timestamp=record.timestamp, log_level=record.level
+                )
+
+
+def _dispatch_event(run: "simvue.Run", record: EventRecord) -> bool:
+    """Queue an event with the dispatcher of a run, to be uploaded with others from its background thread.
+
+    Parameters
+    ----------
+    run : simvue.Run
+        The run to submit the event to, which has already logged an event successfully
+    record : EventRecord
+        The event to submit
+
+    Returns
+    -------
+    bool
+        Whether the event was queued, False if it must be logged through the run instead
+
+    """
+    # Imported here, as Simvue is slow to import and events can be recorded without it
+    import simvue
+    from simvue.utilities import simvue_timestamp
+
+    if (
+        not isinstance(run, simvue.Run)
+        or run.mode == "disabled"
+        or run.dispatcher is None
+    ):
+        return False
+
+    try:
+        run.dispatcher.add_item(
+            {
+                "message": record.format(),
+                "timestamp": simvue_timestamp(record.timestamp),
+                "log_level": record.level,
+            },
+            object_type="events",
+            blocking=False,
+        )
+    except Exception:
+        # The queue is full or shutting down, which the run reports or suppresses itself
+        return False
+    return True
@@ -0,0 +1,198 @@
+"""Input Pipeline.
+
+Measurement of how long training waits for its input, both between training steps and, for datasets which have been
+instrumented, within each step while it waits for its batch to come out of the pipeline.
+"""
+
+import threading
+import time
+import typing
+
+import tensorflow as tf
+
+
+class StageTiming:
+    """Running total of the time spent waiting for elements at an instrumented point of an input pipeline."""
+
+    def __init__(self):
+        """Create an empty record of the elements pulled through a stage."""
+        self.count: int = 0
+        self.wait_seconds: float = 0.0
+        self._requested: float = 0.0
+
+    def request(self) -> None:
+        """Record that the next element has been requested from the stage."""
+        self._requested = time.perf_counter()
+
+    def deliver(self) -> float:
+        """Record that the requested element has been produced by the stage.
+
+        Returns
+        -------
+        float
+            Time in seconds spent waiting for the element
+
+        """
+        _wait = time.perf_counter() - self._requested
+        self.count += 1
+        self.wait_seconds += _wait
+        return _wait
+
+    def latency_ms(self) -> typing.Optional[float]:
+        """Calculate the mean time spent waiting for each element of the stage.
+
+        Returns
+        -------
+        typing.Optional[float]
+            Mean wait in milliseconds, or None if no elements have been recorded
+
+        """
+        if not self.count:
+            return None
+        return self.wait_seconds / self.count * 1e3
+
+
+class InputPipelineTimer:
+    """Measures the fraction of training time spent waiting for input, and the latency of instrumented pipeline stages.
+
+    Keras fetches batches from a tf.data pipeline inside each compiled training step, so only input provided outside
+    of the step (and time spent in other callbacks) appears between steps. Datasets instrumented with this timer record
+    how long each element took to be produced once it was requested, so waits within the step are found exactly.
+    """
+
+    def __init__(self):
+        """Create a timer with no steps or stages recorded."""
+        self._lock = threading.Lock()
+        self._stages: dict[typing.Optional[str], StageTiming] = {}
+        self._epoch_start: float = time.perf_counter()
+        self._gap_start: typing.Optional[float] = None
+        self._in_step: bool = False
+        self._gap_seconds: float = 0.0
+        self._wait_seconds: float = 0.0
+
+    def reset(self) -> None:
+        """Discard all measurements, starting a new Epoch."""
+        with self._lock:
+            for stage in self._stages.values():
+                stage.count, stage.wait_seconds = 0, 0.0
+            self._wait_seconds = 0.0
+        self._epoch_start = time.perf_counter()
+        self._gap_start = None
+        self._gap_seconds = 0.0
+
+    def step_begin(self) -> None:
+        """Mark the start of a training step, recording the gap since the end of the previous step."""
+        _now = time.perf_counter()
+        if self._gap_start is not None:
+            self._gap_seconds += _now - self._gap_start
+        self._in_step = True
+
+    def step_end(self) -> None:
+        """Mark the end of a training step, after which waits for instrumented input are no longer counted."""
+        self._in_step = False
+
+    def step_gap_begin(self) -> None:
+        """Mark the point after a training step from which time until the next step is counted as waiting for input."""
+        self._gap_start = time.perf_counter()
+
+    def _request(self, stage: typing.Optional[str]) -> float:
+        """Record that an element has been requested from an instrumented point of a pipeline.
+
+        Parameters
+        ----------
+        stage : typing.Optional[str]
+            Name of the stage, or None for the batches requested by the training step
+
+        Returns
+        -------
+        float
+            The current time, which the pipeline depends on so that this is not pruned from the graph
+
+        """
+        with self._lock:
+            self._stages[stage].request()
+        return time.perf_counter()
+
+    def _deliver(self, stage: typing.Optional[str]) -> float:
+        """Record that a requested element has been produced by an instrumented point of a pipeline.
+
+        Parameters
+        ----------
+        stage : typing.Optional[str]
+            Name of the stage, or None for the batches requested by the training step
+
+        Returns
+        -------
+        float
+            The time spent waiting for the element, which the pipeline depends on so that this is not pruned
+
+        """
+        with self._lock:
+            _wait = self._stages[stage].deliver()
+            # Batches fetched for validation or evaluation are not part of the training time
+            if stage is None and self._in_step:
+                self._wait_seconds += _wait
+        return _wait
+
+    def instrument(
+        self, dataset: tf.data.Dataset, stage: typing.Optional[str] = None
+    ) -> tf.data.Dataset:
+        """Record how long each element of a dataset takes to be produced once it has been requested.
+
+        Each element is requested from a stream of timestamps before the dataset, which are zipped together so that
+        the time between the two is spent waiting on the dataset. The dataset given to Keras should be instrumented
+        after any prefetching, so that only waits which hold up the training step are recorded.
+
+        Parameters
+        ----------
+        dataset : tf.data.Dataset
+            The dataset to instrument
+        stage : typing.Optional[str], optional
+            Name of an intermediate stage of the pipeline, whose mean latency is recorded, by default None
+            If not provided, the dataset is the one given to Keras, and the time training steps wait for it is recorded.
+
+        Returns
+        -------
+        tf.data.Dataset
+            The dataset, with the same elements
+
+        """
+        with self._lock:
+            self._stages.setdefault(stage, StageTiming())
+
+        _requests = (
+            tf.data.Dataset.from_tensors(tf.constant(0.0, tf.float64))
+            .repeat()
+            .map(lambda _: tf.py_function(lambda: self._request(stage), [], tf.float64))
+        )
+
+        def _delivered(requested: tf.Tensor, element: typing.Any) -> typing.Any:
+            _wait = tf.py_function(
+                lambda _: self._deliver(stage), [requested], tf.float64
+            )
+            with tf.control_dependencies([_wait]):
+                return tf.nest.map_structure(tf.identity, element)
+
+        # Zip pulls from its inputs in order, so each request is timestamped just before the element is pulled
+        return tf.data.Dataset.zip((_requests, dataset)).map(_delivered)
+
+    def summary(self) -> dict[str, float]:
+        """Summarise the time spent waiting for input since the last reset.
+
+        Returns
+        -------
+        dict[str, float]
+            Fraction of the time from the start of the Epoch to the end of its latest step which was spent between
+            steps, and spent waiting for input in total, and the mean latency of each instrumented stage
+
+        """
+        _elapsed = max((self._gap_start or self._epoch_start) - self._epoch_start, 1e-9)
+        with self._lock:
+            _summary = {
+                "step_gap_fraction": self._gap_seconds / _elapsed,
+                "wait_fraction": (self._gap_seconds + self._wait_seconds) / _elapsed,
+            }
+            for name, stage in self._stages.items():
+                if name is not None and (_latency := stage.latency_ms()) is not None:
+                    _summary[f"stages/{name}/latency_ms"] = _latency
+        return _summary
@@ -0,0 +1,219 @@
+"""Metric Buffer.
+
+Preallocated, array-backed storage for batch metrics which are flushed to a Simvue run in bulk, as a single submission.
+"""
+
+import datetime
+import time
+import typing
+
+import numpy
+
+if typing.TYPE_CHECKING:
+    import simvue
+
+
+class MetricBuffer:
+    """Fixed capacity buffer of metric values, keyed by step, awaiting upload to a run."""
+
+    def __init__(
+        self,
+        metric_names: list[str],
+        capacity: int = 1024,
+        flush_seconds: typing.Optional[float] = None,
+    ):
+        """Create a fixed capacity buffer of metric values, keyed by step, awaiting upload to a run.
+
+        Parameters
+        ----------
+        metric_names : list[str]
+            Names of the metrics stored in each row of the buffer
+        capacity : int, optional
+            Number of rows to preallocate, the buffer is due to be flushed once full, by default 1024
+        flush_seconds : typing.Optional[float], optional
+            Time after which the buffer is due to be flushed even if not full, by default None
+
+        """
+        self.metric_names = list(metric_names)
+        self.capacity = capacity
+        self.flush_seconds = flush_seconds
+        self._steps = numpy.empty(capacity, dtype=numpy.int64)
+        self._timestamps = numpy.empty(capacity, dtype=numpy.float64)
+        self._values = self._allocate_values()
+        self._size: int = 0
+        self._last_flush: float = time.monotonic()
+
+    def _allocate_values(self) -> typing.Any:
+        """Allocate storage for the metric values.
+
+        Returns
+        -------
+        typing.Any
+            Array with a row for each step and a column for each metric
+
+        """
+        return numpy.empty((self.capacity, len(self.metric_names)), dtype=numpy.float64)
+
+    def _store_values(self, row: int, values: typing.Sequence[typing.Any]) -> None:
+        """Write the values of each metric into a row of the buffer.
+
+        Parameters
+        ----------
+        row : int
+            Index of the row to write to
+        values : typing.Sequence[typing.Any]
+            Value of each metric, None if missing
+
+        """
+        self._values[row] = [numpy.nan if value is None else value for value in values]
+
+    def _read_values(self) -> list[list[float]]:
+        """Read all rows currently held in the buffer.
+
+        Returns
+        -------
+        list[list[float]]
+            Value of each metric for each buffered step
+
+        """
+        return self._values[: self._size].tolist()
+
+    def __len__(self) -> int:
+        """Get the number of rows currently held in the buffer.
+
+        Returns
+        -------
+        int
+            Number of buffered steps awaiting upload
+
+        """
+        return self._size
+
+    def append(
+        self, step: int, values: typing.Sequence[typing.Optional[float]]
+    ) -> bool:
+        """Store the values of each metric for a single step.
+
+        Parameters
+        ----------
+        step : int
+            The step index which the values will be logged against
+        values : typing.Sequence[typing.Optional[float]]
+            Value of each metric, in the same order as metric_names. Missing values should be None.
+
+        Returns
+        -------
+        bool
+            Whether the buffer is now due to be flushed
+
+        """
+        _row = self._size
+        self._steps[_row] = step
+        self._timestamps[_row] = time.time()
+        self._store_values(_row, values)
+        self._size += 1
+
+        if self._size == self.capacity:
+            return True
+        return (
+            self.flush_seconds is not None
+            and time.monotonic() - self._last_flush >= self.flush_seconds
+        )
+
+    def flush(self, run: "simvue.Run") -> None:
+        """Upload all buffered rows to a run, preserving their step indices and timestamps.
+
+        For an initialised online or offline Simvue run, the first row is logged through the run, and the rest are
+        queued with its dispatcher without blocking, so they are uploaded in bulk from its background thread. Any other
+        run, such as a disabled or spooled run, is given one row at a time.
+
+        Parameters
+        ----------
+        run : simvue.Run
+            The run to log the buffered metrics to
+
+        """
+        self._last_flush = time.monotonic()
+        if not self._size:
+            return
+
+        # Recover each row's time relative to the start of the run from its wall clock capture
+        _run_start = time.time() - run.duration if run.mode != "disabled" else 0.0
+
+        _metric_sets = [
+            {
+                "values": {
+                    name: value
+                    for name, value in zip(self.metric_names, row)
+                    if value == value  # Skip metrics which were missing (NaN)
+                },
+                "step": step,
+                "time": timestamp - _run_start,
+                "timestamp": datetime.datetime.fromtimestamp(
+                    timestamp, tz=datetime.timezone.utc
+                ),
+            }
+            for step, timestamp, row in zip(
+                self._steps[: self._size].tolist(),
+                self._timestamps[: self._size].tolist(),
+                self._read_values(),
+            )
+        ]
+        self._size = 0
+
+        _logged = False
+        for metric_set in _metric_sets:
+            if _logged and _dispatch_metric_set(run, metric_set):
+                continue
+            # Logging through the run checks its state, uploads any metric units, and suppresses errors if requested
+            _logged = run.log_metrics(
+                metric_set["values"],
+                step=metric_set["step"],
+                time=metric_set["time"],
+                timestamp=metric_set["timestamp"],
+            )
+
+
+def _dispatch_metric_set(run: "simvue.Run", metric_set: dict[str, typing.Any]) -> bool:
+    """Queue a set of metrics with the dispatcher of a run, to be uploaded in bulk from its background thread.
+
+    Parameters
+    ----------
+    run : simvue.Run
+        The run to submit the metrics to, which has already logged metrics successfully
+    metric_set : dict[str, typing.Any]
+        Values, step, time and timestamp of the metrics
+
+    Returns
+    -------
+    bool
+        Whether the metrics were queued, False if they must be logged through the run instead
+
+    """
+    # Imported here, as Simvue is slow to import and the buffers can be used without it
+    import simvue
+    from simvue.utilities import simvue_timestamp
+
+    if (
+        not isinstance(run, simvue.Run)
+        or run.mode == "disabled"
+        or run.dispatcher is None
+    ):
+        return False
+    if not metric_set["values"]:
+        return True
+
+    try:
+        run.dispatcher.add_item(
+            {
+                **metric_set,
+                "timestamp": simvue_timestamp(metric_set["timestamp"]),
+            },
+            object_type="metrics_regular",
+            blocking=False,
+            metadata={"object_size": len(metric_set["values"])},
+        )
+    except Exception:
+        # The queue is full or shutting down, which the run reports or suppresses itself
+        return False
+    return True
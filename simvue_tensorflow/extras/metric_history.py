@@ -0,0 +1,161 @@
+"""Metric History.
+
+Tracks the value of every metric reported at the end of each epoch, computing changes and improvements in a single pass.
+"""
+
+import numbers
+import typing
+
+import numpy
+
+# Metrics containing any of these in their name are assumed to be better when lower
+MINIMISED_METRIC_PATTERNS: tuple[str, ...] = (
+    "loss",
+    "error",
+    "mse",
+    "mae",
+    "mape",
+    "msle",
+    "crossentropy",
+    "hinge",
+    "divergence",
+)
+
+
+class EpochMetrics(typing.NamedTuple):
+    """Values of each metric at the end of an epoch, and how they changed since the previous epoch."""
+
+    names: list[str]
+    values: numpy.ndarray
+    changes: numpy.ndarray
+    improved: numpy.ndarray
+
+    def present(self) -> dict[str, float]:
+        """Return the values of metrics which were reported this epoch.
+
+        Returns
+        -------
+        dict[str, float]
+            Value of each metric reported this epoch, keyed by name
+
+        """
+        return {
+            name: value
+            for name, value in zip(self.names, self.values.tolist())
+            if value == value
+        }
+
+
+class MetricHistory:
+    """Tracks the value of every metric reported at the end of each epoch."""
+
+    def __init__(
+        self,
+        metric_directions: typing.Optional[
+            dict[str, typing.Literal["maximise", "minimise"]]
+        ] = None,
+    ):
+        """Track the value of every metric reported at the end of each epoch.
+
+        Parameters
+        ----------
+        metric_directions : typing.Optional[dict[str, typing.Literal["maximise", "minimise"]]], optional
+            Whether an increase or decrease in each metric is an improvement, by default None
+            Metrics not specified are minimised if their name contains a pattern in MINIMISED_METRIC_PATTERNS,
+            otherwise maximised. Directions for a metric also apply to its validation counterpart (val_ prefix).
+
+        """
+        self.metric_directions = metric_directions or {}
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all previously reported metrics."""
+        self.names: list[str] = []
+        self._indices: dict[str, int] = {}
+        self._previous = numpy.empty(0, dtype=numpy.float64)
+        self._signs = numpy.empty(0, dtype=numpy.float64)
+
+    def direction(self, metric_name: str) -> typing.Literal["maximise", "minimise"]:
+        """Determine whether a metric should be maximised or minimised.
+
+        Parameters
+        ----------
+        metric_name : str
+            Name of the metric
+
+        Returns
+        -------
+        typing.Literal["maximise", "minimise"]
+            The direction in which the metric improves
+
+        """
+        _base_name = metric_name.removeprefix("val_")
+        for name in (metric_name, _base_name):
+            if name in self.metric_directions:
+                return self.metric_directions[name]
+        if any(pattern in _base_name.lower() for pattern in MINIMISED_METRIC_PATTERNS):
+            return "minimise"
+        return "maximise"
+
+    def latest(self) -> dict[str, float]:
+        """Return the most recently reported value of each metric.
+
+        Returns
+        -------
+        dict[str, float]
+            Latest value of each metric, keyed by name
+
+        """
+        return {
+            name: value
+            for name, value in zip(self.names, self._previous.tolist())
+            if value == value
+        }
+
+    def update(self, logs: dict[str, typing.Any]) -> EpochMetrics:
+        """Record the metrics reported at the end of an epoch, comparing them to the previous epoch.
+
+        Parameters
+        ----------
+        logs : dict[str, typing.Any]
+            Metrics for this epoch, any non-numeric values are ignored
+
+        Returns
+        -------
+        EpochMetrics
+            Value of each metric this epoch, its change since the previous epoch and whether it improved.
+            Metrics not reported this epoch have a value of NaN, and those not reported in both epochs have a change of NaN.
+
+        """
+        _metrics = {
+            name: value
+            for name, value in logs.items()
+            if isinstance(value, numbers.Real)
+        }
+        _new_names = [name for name in _metrics if name not in self._indices]
+        if _new_names:
+            for name in _new_names:
+                self._indices[name] = len(self.names)
+                self.names.append(name)
+            self._previous = numpy.concatenate(
+                (self._previous, numpy.full(len(_new_names), numpy.nan))
+            )
+            self._signs = numpy.concatenate(
+                (
+                    self._signs,
+                    [
+                        1.0 if self.direction(name) == "maximise" else -1.0
+                        for name in _new_names
+                    ],
+                )
+            )
+
+        _values = numpy.full(len(self.names), numpy.nan)
+        for name, value in _metrics.items():
+            _values[self._indices[name]] = value
+
+        _changes = _values - self._previous
+        _improved = self._signs * _changes > 0
+        self._previous = numpy.where(numpy.isnan(_values), self._previous, _values)
+
+        return EpochMetrics(list(self.names), _values, _changes, _improved)
@@ -0,0 +1,115 @@
+"""Model Config.
+
+Caching of model configs, so that each model is only serialised once and each unique architecture is only uploaded
+once per process, with later runs referring to the run which holds the uploaded config.
+"""
+
+import hashlib
+import json
+import threading
+import typing
+import weakref
+
+if typing.TYPE_CHECKING:
+    import simvue
+    import tensorflow as tf
+
+
+def canonical_json(config: dict[str, typing.Any]) -> str:
+    """Serialise a model config to JSON, with the names of the model and its layers replaced by their position.
+
+    Keras generates unique names for each new model and layer, so models built with identical architectures,
+    such as in repeated trials, would otherwise have different configs.
+
+    Parameters
+    ----------
+    config : dict[str, typing.Any]
+        The model config
+
+    Returns
+    -------
+    str
+        JSON representation of the config, with sorted keys and positional names
+
+    """
+    _names = [config.get("name")]
+    for layer in config.get("layers", []):
+        _names += [layer.get("name"), layer.get("config", {}).get("name")]
+
+    serialised = json.dumps(config, sort_keys=True, default=str)
+    # Names are replaced as whole JSON strings, so that a name which is a prefix of another is left alone
+    for index, name in enumerate(dict.fromkeys(name for name in _names if name)):
+        serialised = serialised.replace(json.dumps(name), f'"#{index}"')
+    return serialised
+
+
+class ModelConfigCache:
+    """Serialises the config of each model once, and uploads each unique config to a single run."""
+
+    def __init__(self):
+        """Create an empty cache of model configs."""
+        # Config and its hash for each model, which are dropped once the model is no longer in use
+        self._configs: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        # ID of the run which each config has been uploaded to, keyed by run mode and hash of the config
+        self._locations: dict[tuple[str, str], str] = {}
+        self._lock = threading.Lock()
+
+    def get(self, model: "tf.keras.Model") -> tuple[dict[str, typing.Any], str]:
+        """Get the config of a model and its hash, serialising it only the first time.
+
+        Parameters
+        ----------
+        model : tf.keras.Model
+            The model to get the config of
+
+        Returns
+        -------
+        tuple[dict[str, typing.Any], str]
+            The model config, and the SHA-256 hash of its canonical JSON representation
+
+        """
+        if (_cached := self._configs.get(model)) is None:
+            _config = model.get_config()
+            _digest = hashlib.sha256(canonical_json(_config).encode()).hexdigest()
+            _cached = self._configs[model] = (_config, _digest)
+        return _cached
+
+    def save(self, model: "tf.keras.Model", run: "simvue.Run", mode: str) -> None:
+        """Upload the config of a model to a run, or refer to a previous upload of an identical config.
+
+        The hash of the config and the ID of the run which holds it are added to the metadata of the run. Offline runs
+        are given new IDs when they are sent to the server, so in offline mode only the hash is added, by which the run
+        holding the config can be found.
+
+        Parameters
+        ----------
+        model : tf.keras.Model
+            The model whose config to save
+        run : simvue.Run
+            The run to save the config to
+        mode : str
+            Mode of the run, as configs are only shared between runs of the same mode
+
+        """
+        _config, _digest = self.get(model)
+        with self._lock:
+            _location = self._locations.get((mode, _digest))
+            # Claim the upload, so that runs created concurrently do not both upload the same config
+            if _location is None:
+                self._locations[(mode, _digest)] = run.id
+
+        if _location is None:
+            if run.save_object(obj=_config, category="input", name="model_config"):
+                _location = run.id
+            else:
+                with self._lock:
+                    self._locations.pop((mode, _digest), None)
+
+        _metadata = {"model_config_sha256": _digest}
+        if mode != "offline":
+            _metadata["model_config_run"] = _location
+        run.update_metadata(_metadata)
+
+
+# Shared by all TensorVue instances, so that repeated trials of the same architecture only upload it once
+MODEL_CONFIGS: ModelConfigCache = ModelConfigCache()
@@ -5,9 +5,7 @@ Operators used in the definition of a TensorVue instance
 # ruff: noqa: DOC201
 
 import enum
-from typing import Callable, Literal, Optional, Union
-
-from pydantic import BaseModel, Field, PositiveInt, ValidationInfo, field_validator
+from typing import Callable, Union
 
 NAME_REGEX: str = r"^[a-zA-Z0-9\-\_\s\/\.:]+$"
 
@@ -0,0 +1,236 @@
+"""Overhead.
+
+Low-overhead timing of the callback's own methods, and of any custom timers around user code,
+summarised as metrics so that the cost of tracking can be told apart from the cost of training.
+"""
+
+import contextlib
+import itertools
+import math
+import threading
+import time
+import typing
+
+
+class TimingHistogram:
+    """Histogram of durations with log-linear bins, four per doubling, which is cheap to update."""
+
+    BINS_PER_OCTAVE: int = 4
+    # Covers durations up to 2^48 nanoseconds (over three days)
+    NUMBER_OF_BINS: int = 48 * BINS_PER_OCTAVE
+
+    def __init__(self):
+        """Create an empty histogram of durations."""
+        self.counts: list[int] = [0] * self.NUMBER_OF_BINS
+        self.count: int = 0
+        self.total: float = 0.0
+        self.max: float = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Add a duration to the histogram.
+
+        Parameters
+        ----------
+        seconds : float
+            The duration in seconds
+
+        """
+        # Exponent selects the doubling, and the mantissa (between 0.5 and 1) selects the bin within it
+        _mantissa, _exponent = math.frexp(seconds * 1e9)
+        _index = self.BINS_PER_OCTAVE * _exponent + int(
+            (_mantissa - 0.5) * 2 * self.BINS_PER_OCTAVE
+        )
+        self.counts[min(max(_index, 0), self.NUMBER_OF_BINS - 1)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction: float) -> float:
+        """Estimate a percentile of the recorded durations, from the upper edge of the bin which contains it.
+
+        Parameters
+        ----------
+        fraction : float
+            The percentile as a fraction between 0 and 1
+
+        Returns
+        -------
+        float
+            The estimated duration in seconds, at most the longest recorded duration
+
+        """
+        _target = fraction * self.count
+        for index, cumulative in enumerate(itertools.accumulate(self.counts)):
+            if cumulative >= _target:
+                _octave, _bin = divmod(index, self.BINS_PER_OCTAVE)
+                _upper_edge = (
+                    (0.5 + (_bin + 1) / (2 * self.BINS_PER_OCTAVE)) * 2**_octave / 1e9
+                )
+                return min(_upper_edge, self.max)
+        return self.max
+
+    def summary(self) -> dict[str, float]:
+        """Summarise the recorded durations.
+
+        Returns
+        -------
+        dict[str, float]
+            Number of calls, total time in milliseconds, and mean, median, 99th percentile and maximum in microseconds
+
+        """
+        return {
+            "calls": self.count,
+            "total_ms": self.total * 1e3,
+            "mean_us": self.total / self.count * 1e6,
+            "p50_us": self.percentile(0.5) * 1e6,
+            "p99_us": self.percentile(0.99) * 1e6,
+            "max_us": self.max * 1e6,
+        }
+
+
+class OverheadTracker:
+    """Records the duration of callback methods and custom timers, summarising them as metrics."""
+
+    def __init__(
+        self,
+        overhead_prefix: str = "tensorvue/overhead",
+        timer_prefix: str = "tensorvue/timers",
+    ):
+        """Create a tracker for the duration of callback methods and custom timers.
+
+        Parameters
+        ----------
+        overhead_prefix : str, optional
+            Prefix of the metrics summarising callback methods, by default "tensorvue/overhead"
+        timer_prefix : str, optional
+            Prefix of the metrics summarising custom timers, by default "tensorvue/timers"
+
+        """
+        self.overhead_prefix = overhead_prefix
+        self.timer_prefix = timer_prefix
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard all recorded durations, and start measuring elapsed time from now."""
+        with self._lock:
+            self._hooks: dict[str, TimingHistogram] = {}
+            self._timers: dict[str, TimingHistogram] = {}
+            self._since: float = time.perf_counter()
+
+    def record(self, name: str, seconds: float, custom: bool = False) -> None:
+        """Record the duration of a callback method or custom timer.
+
+        Parameters
+        ----------
+        name : str
+            Name of the method or timer
+        seconds : float
+            The duration in seconds
+        custom : bool, optional
+            Whether this is a custom timer around user code, rather than part of the callback, by default False
+
+        """
+        _histograms = self._timers if custom else self._hooks
+        with self._lock:
+            _histogram = _histograms.get(name)
+            if _histogram is None:
+                _histogram = _histograms[name] = TimingHistogram()
+            _histogram.record(seconds)
+
+    def timer(self, name: str) -> "Timer":
+        """Create a timer for a block of user code, which can also be used as a function decorator.
+
+        Parameters
+        ----------
+        name : str
+            Name of the timer, used in the metric names
+
+        Returns
+        -------
+        Timer
+            Context manager which records the time spent inside it
+
+        """
+        return Timer(self, name)
+
+    def publish(self) -> dict[str, float]:
+        """Summarise the durations recorded since the last reset as metrics, then reset.
+
+        Returns
+        -------
+        dict[str, float]
+            Summary of each callback method and custom timer, along with the total time spent in callback
+            methods and the fraction of the elapsed time which this represents
+
+        """
+        with self._lock:
+            _hooks, _timers, _since = self._hooks, self._timers, self._since
+        self.reset()
+
+        _total = sum(histogram.total for histogram in _hooks.values())
+        metrics = {
+            f"{self.overhead_prefix}/total_ms": _total * 1e3,
+            f"{self.overhead_prefix}/fraction": _total
+            / max(time.perf_counter() - _since, 1e-9),
+        }
+        for prefix, histograms in (
+            (self.overhead_prefix, _hooks),
+            (self.timer_prefix, _timers),
+        ):
+            for name, histogram in histograms.items():
+                metrics.update(
+                    {
+                        f"{prefix}/{name}/{statistic}": value
+                        for statistic, value in histogram.summary().items()
+                    }
+                )
+        return metrics
+
+
+class Timer(contextlib.ContextDecorator):
+    """Context manager which records the time spent inside it as a custom timer."""
+
+    def __init__(self, tracker: typing.Optional[OverheadTracker], name: str):
+        """Create a context manager which records the time spent inside it as a custom timer.
+
+        Parameters
+        ----------
+        tracker : typing.Optional[OverheadTracker]
+            The tracker to record durations in, if None nothing is recorded
+        name : str
+            Name of the timer
+
+        """
+        self.tracker = tracker
+        self.name = name
+        self._local = threading.local()
+
+    def __enter__(self) -> "Timer":
+        """Start timing.
+
+        Returns
+        -------
+        Timer
+            This timer
+
+        """
+        # Keep a stack of start times for each thread, so the same timer can be nested or used concurrently
+        if not hasattr(self._local, "starts"):
+            self._local.starts = []
+        self._local.starts.append(time.perf_counter())
+        return self
+
+    def __exit__(self, *args: typing.Any) -> None:
+        """Stop timing, and record the duration.
+
+        Parameters
+        ----------
+        *args : typing.Any
+            Exception information, ignored
+
+        """
+        _seconds = time.perf_counter() - self._local.starts.pop()
+        if self.tracker:
+            self.tracker.record(self.name, _seconds, custom=True)
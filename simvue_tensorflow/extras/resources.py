@@ -0,0 +1,128 @@
+"""Resources.
+
+Sampling of the resource usage of the training process and the memory of each TensorFlow device from a background
+thread, logged as metrics so that slowdowns can be correlated with memory pressure without a separate monitoring stack.
+"""
+
+import threading
+import typing
+
+import tensorflow as tf
+
+if typing.TYPE_CHECKING:
+    import simvue
+
+
+class ResourceSampler:
+    """Logs the memory, CPU utilisation and open file handles of this process, and device memory, at a fixed interval."""
+
+    def __init__(
+        self, run: "simvue.Run", interval: float = 10.0, prefix: str = "resources"
+    ):
+        """Create a sampler which logs resource usage to a run once started.
+
+        Parameters
+        ----------
+        run : simvue.Run
+            The run to log resource metrics to
+        interval : float, optional
+            Time between samples in seconds, by default 10.0
+        prefix : str, optional
+            Prefix of the metric names, by default "resources"
+
+        """
+        self.run = run
+        self.interval = interval
+        self.prefix = prefix
+        self._stopped = threading.Event()
+        self._thread: typing.Optional[threading.Thread] = None
+        self._process = None
+        self._devices: list[str] = []
+        self._samples: int = 0
+        self._failed: bool = False
+
+    def _find_devices(self) -> list[str]:
+        """Find the TensorFlow devices which report their memory usage.
+
+        Returns
+        -------
+        list[str]
+            Names of the logical devices whose memory info is available
+
+        """
+        _devices = []
+        for device in tf.config.list_logical_devices():
+            try:
+                tf.config.experimental.get_memory_info(device.name)
+            except ValueError:
+                continue
+            _devices.append(device.name)
+        return _devices
+
+    def sample(self) -> dict[str, float]:
+        """Measure the current resource usage.
+
+        Returns
+        -------
+        dict[str, float]
+            Resident memory in MiB, CPU utilisation as a percentage of one core since the previous sample,
+            number of open file handles, and the current and peak memory in MiB of each device
+
+        """
+        _metrics = {
+            f"{self.prefix}/rss_mib": self._process.memory_info().rss / 1024**2,
+            f"{self.prefix}/cpu_percent": self._process.cpu_percent(None),
+            f"{self.prefix}/open_files": (
+                self._process.num_fds()
+                if hasattr(self._process, "num_fds")
+                else self._process.num_handles()
+            ),
+        }
+        for device in self._devices:
+            _memory = tf.config.experimental.get_memory_info(device)
+            _name = device.removeprefix("/device:")
+            _metrics[f"{self.prefix}/{_name}/memory_mib"] = _memory["current"] / 1024**2
+            _metrics[f"{self.prefix}/{_name}/peak_memory_mib"] = (
+                _memory["peak"] / 1024**2
+            )
+        return _metrics
+
+    def start(self) -> None:
+        """Start sampling in a background thread, taking the first sample immediately."""
+        # Imported here, as psutil is only needed once sampling starts
+        import psutil
+
+        self._process = psutil.Process()
+        # Utilisation is measured between calls, so the first call only starts the measurement
+        self._process.cpu_percent(None)
+        self._devices = self._find_devices()
+        self._samples = 0
+        self._failed = False
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="tensorvue_resources", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        """Log a sample of resource usage every interval until stopped, reporting the first failure as an event."""
+        while True:
+            try:
+                self.run.log_metrics(self.sample(), step=self._samples)
+            except Exception as e:
+                if not self._failed:
+                    self._failed = True
+                    self.run.log_event(
+                        f"Sampling of resource usage failed: {e!r}",
+                        log_level="warning",
+                    )
+            self._samples += 1
+            if self._stopped.wait(self.interval):
+                return
+
+    def stop(self) -> None:
+        """Stop sampling, waiting for any sample in progress to be logged."""
+        self._stopped.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
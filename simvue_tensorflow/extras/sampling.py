@@ -0,0 +1,266 @@
+"""Sampling.
+
+Policies which decide which training batches have their metrics logged.
+"""
+
+import abc
+import math
+import time
+import typing
+
+
+class SamplingPolicy(abc.ABC):
+    """Base class for policies which decide which training batches have their metrics logged."""
+
+    @abc.abstractmethod
+    def should_log(self, step: int, steps: int = 1) -> bool:
+        """Decide whether metrics should be logged for this step.
+
+        Parameters
+        ----------
+        step : int
+            Number of training steps completed so far, starting from 1
+        steps : int, optional
+            Number of steps completed since the previous call, by default 1
+            This is more than one if the model runs several steps in each execution.
+
+        Returns
+        -------
+        bool
+            Whether to log the metrics for this step
+
+        """
+
+    def reset(self) -> None:
+        """Forget the steps logged previously, ready for a new training session which counts steps from the start."""
+
+    def update(
+        self,
+        step_seconds: typing.Optional[float],
+        logging_seconds: typing.Optional[float],
+    ) -> None:
+        """Record the duration of the latest step, and of logging it if it was logged.
+
+        Parameters
+        ----------
+        step_seconds : typing.Optional[float]
+            Time since the end of the previous training step, None for the first step in an epoch
+        logging_seconds : typing.Optional[float]
+            Time taken to log this step's metrics, None if it was not logged
+
+        """
+
+
+class EveryNSteps(SamplingPolicy):
+    """Log metrics every N training steps."""
+
+    def __init__(self, n: int):
+        """Log metrics every N training steps.
+
+        Parameters
+        ----------
+        n : int
+            Number of steps between each logged step
+
+        """
+        self.n = n
+
+    def should_log(self, step: int, steps: int = 1) -> bool:
+        """Decide whether metrics should be logged for this step.
+
+        Parameters
+        ----------
+        step : int
+            Number of training steps completed so far, starting from 1
+        steps : int, optional
+            Number of steps completed since the previous call, by default 1
+            This is more than one if the model runs several steps in each execution.
+
+        Returns
+        -------
+        bool
+            Whether a multiple of N steps was reached since the previous call
+
+        """
+        return step // self.n != (step - steps) // self.n
+
+
+class TimeInterval(SamplingPolicy):
+    """Log metrics at most once every given number of seconds."""
+
+    def __init__(self, seconds: float):
+        """Log metrics at most once every given number of seconds.
+
+        Parameters
+        ----------
+        seconds : float
+            Minimum time between logged steps
+
+        """
+        self.seconds = seconds
+        self._last_logged: typing.Optional[float] = None
+
+    def reset(self) -> None:
+        """Forget when a step was last logged, so that the first step of a new training session is logged."""
+        self._last_logged = None
+
+    def should_log(self, step: int, steps: int = 1) -> bool:
+        """Decide whether metrics should be logged for this step.
+
+        Parameters
+        ----------
+        step : int
+            Number of training steps completed so far, starting from 1
+        steps : int, optional
+            Number of steps completed since the previous call, by default 1
+            This is more than one if the model runs several steps in each execution.
+
+        Returns
+        -------
+        bool
+            Whether enough time has passed since the last logged step
+
+        """
+        _now = time.monotonic()
+        if self._last_logged is not None and _now - self._last_logged < self.seconds:
+            return False
+        self._last_logged = _now
+        return True
+
+
+class LogSpaced(SamplingPolicy):
+    """Log metrics at logarithmically spaced steps, densely at the start of training and sparsely later on."""
+
+    def __init__(self, steps_per_decade: int = 10):
+        """Log metrics at logarithmically spaced steps, densely at the start of training and sparsely later on.
+
+        Parameters
+        ----------
+        steps_per_decade : int, optional
+            Number of steps to log for every tenfold increase in step count, by default 10
+
+        """
+        self._ratio = 10 ** (1 / steps_per_decade)
+        self._next_step: float = 1
+
+    def reset(self) -> None:
+        """Return to logging densely, from the first step of a new training session."""
+        self._next_step = 1
+
+    def should_log(self, step: int, steps: int = 1) -> bool:
+        """Decide whether metrics should be logged for this step.
+
+        Parameters
+        ----------
+        step : int
+            Number of training steps completed so far, starting from 1
+        steps : int, optional
+            Number of steps completed since the previous call, by default 1
+            This is more than one if the model runs several steps in each execution.
+
+        Returns
+        -------
+        bool
+            Whether the step has reached the next logarithmically spaced step
+
+        """
+        if step < self._next_step:
+            return False
+        self._next_step = max(step + 1, math.ceil(self._next_step * self._ratio))
+        return True
+
+
+class Adaptive(SamplingPolicy):
+    """Log metrics as often as possible while keeping the cost of logging under a fraction of the step time."""
+
+    def __init__(self, target_fraction: float = 0.01, smoothing: float = 0.1):
+        """Log metrics as often as possible while keeping the cost of logging under a fraction of the step time.
+
+        Parameters
+        ----------
+        target_fraction : float, optional
+            Maximum fraction of training time which may be spent logging batch metrics, by default 0.01
+        smoothing : float, optional
+            Weight given to the latest measurement in the moving averages of step and logging time, by default 0.1
+
+        """
+        self.target_fraction = target_fraction
+        self.smoothing = smoothing
+        self._step_seconds: typing.Optional[float] = None
+        self._logging_seconds: typing.Optional[float] = None
+        self._last_logged_step: int = 0
+        self.interval: int = 1
+
+    def reset(self) -> None:
+        """Forget the steps logged previously, keeping the measured step and logging times and the interval."""
+        self._last_logged_step = 0
+
+    def should_log(self, step: int, steps: int = 1) -> bool:
+        """Decide whether metrics should be logged for this step.
+
+        Parameters
+        ----------
+        step : int
+            Number of training steps completed so far, starting from 1
+        steps : int, optional
+            Number of steps completed since the previous call, by default 1
+            This is more than one if the model runs several steps in each execution.
+
+        Returns
+        -------
+        bool
+            Whether the current logging interval has elapsed since the last logged step
+
+        """
+        if step - self._last_logged_step < self.interval:
+            return False
+        self._last_logged_step = step
+        return True
+
+    def _smooth(self, average: typing.Optional[float], value: float) -> float:
+        """Update an exponential moving average with a new value.
+
+        Parameters
+        ----------
+        average : typing.Optional[float]
+            The current average, None if there have been no values yet
+        value : float
+            The new value
+
+        Returns
+        -------
+        float
+            The updated average
+
+        """
+        if average is None:
+            return value
+        return average + self.smoothing * (value - average)
+
+    def update(
+        self,
+        step_seconds: typing.Optional[float],
+        logging_seconds: typing.Optional[float],
+    ) -> None:
+        """Record the duration of the latest step, and of logging it, then recalculate the logging interval.
+
+        Parameters
+        ----------
+        step_seconds : typing.Optional[float]
+            Time since the end of the previous training step, None for the first step in an epoch
+        logging_seconds : typing.Optional[float]
+            Time taken to log this step's metrics, None if it was not logged
+
+        """
+        if step_seconds is not None:
+            self._step_seconds = self._smooth(self._step_seconds, step_seconds)
+        if logging_seconds is not None:
+            self._logging_seconds = self._smooth(self._logging_seconds, logging_seconds)
+        if self._step_seconds and self._logging_seconds is not None:
+            # Logging every k steps costs logging_seconds / (k * step_seconds) of the training time
+            self.interval = max(
+                1,
+                math.ceil(
+                    self._logging_seconds / (self.target_fraction * self._step_seconds)
+                ),
+            )
@@ -0,0 +1,185 @@
+"""Snapshot.
+
+Saving of models in a background thread, from in-memory snapshots of their weights and optimizer state,
+so that training can continue while the model is serialised and uploaded.
+"""
+
+import concurrent.futures
+import pathlib
+import typing
+
+import numpy
+import tensorflow as tf
+
+
+class ModelSnapshot(typing.NamedTuple):
+    """Copy of the weights and optimizer state of a model at a point in training."""
+
+    weights: list[numpy.ndarray]
+    optimizer_variables: dict[str, numpy.ndarray]
+
+    @classmethod
+    def take(cls, model: tf.keras.Model) -> "ModelSnapshot":
+        """Copy the weights and optimizer state of a model into host memory.
+
+        Parameters
+        ----------
+        model : tf.keras.Model
+            The model to copy
+
+        Returns
+        -------
+        ModelSnapshot
+            The copied weights, and the optimizer variables keyed by path if the optimizer has been built
+
+        """
+        _optimizer = getattr(model, "optimizer", None)
+        return cls(
+            model.get_weights(),
+            {variable.path: variable.numpy() for variable in _optimizer.variables}
+            if _optimizer and _optimizer.built
+            else {},
+        )
+
+
+class AsyncModelSaver:
+    """Saves snapshots of a model from a background thread, with at most one save in flight at a time.
+
+    Snapshots are loaded into a clone of the model to be saved. Subclassed models which cannot be cloned, because they
+    take arguments without implementing get_config, are instead saved before training continues, and only the function
+    given to save is run in the background.
+    """
+
+    def __init__(self):
+        """Create a saver which serialises model snapshots in a background thread."""
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="tensorvue_save"
+        )
+        self._pending: typing.Optional[concurrent.futures.Future] = None
+        self._model: typing.Optional[tf.keras.Model] = None
+        self._shadow: typing.Optional[tf.keras.Model] = None
+
+    def save(
+        self,
+        model: tf.keras.Model,
+        file_path: typing.Union[str, pathlib.Path],
+        then: typing.Optional[typing.Callable[[pathlib.Path], typing.Any]] = None,
+    ) -> concurrent.futures.Future:
+        """Take a snapshot of a model, and save it to a file in the background.
+
+        If a previous save is still in progress, this waits for it to finish first.
+
+        Parameters
+        ----------
+        model : tf.keras.Model
+            The model to save
+        file_path : typing.Union[str, pathlib.Path]
+            Path to save the model to, in the Keras format
+        then : typing.Optional[typing.Callable[[pathlib.Path], typing.Any]], optional
+            Function called in the background with the path once the model has been saved, such as to upload it.
+            The file is not overwritten by a later save until this returns. By default None
+
+        Returns
+        -------
+        concurrent.futures.Future
+            Future which completes once the model has been saved and the function has returned
+
+        Raises
+        ------
+        ValueError
+            Raised if the optimizer variables of the model do not match those of its copy
+
+        """
+        self.join()
+        # A copy of the model is built once, and is loaded with each snapshot so that it can be saved
+        # without pausing training of the original model
+        if self._model is not model:
+            self._shadow = self._clone(model)
+            self._model = model
+
+        if self._shadow is None:
+            _file_path = pathlib.Path(file_path)
+            _file_path.parent.mkdir(parents=True, exist_ok=True)
+            model.save(_file_path)
+            self._pending = self._executor.submit(
+                lambda: then(_file_path) if then else _file_path
+            )
+        else:
+            _snapshot = ModelSnapshot.take(model)
+            if _snapshot.optimizer_variables:
+                _expected = {
+                    variable.path for variable in self._shadow.optimizer.variables
+                }
+                if _snapshot.optimizer_variables.keys() != _expected:
+                    raise ValueError(
+                        "Cannot save a snapshot of the model, as the variables of its optimizer do not match those of "
+                        f"its copy: {sorted(_snapshot.optimizer_variables.keys() ^ _expected)}"
+                    )
+            self._pending = self._executor.submit(
+                self._save, _snapshot, pathlib.Path(file_path), then
+            )
+        return self._pending
+
+    @staticmethod
+    def _clone(model: tf.keras.Model) -> typing.Optional[tf.keras.Model]:
+        """Build a copy of a model which snapshots can be loaded into.
+
+        Parameters
+        ----------
+        model : tf.keras.Model
+            The model to copy
+
+        Returns
+        -------
+        typing.Optional[tf.keras.Model]
+            The copy of the model, compiled in the same way with its optimizer built, or None if the model cannot be
+            cloned
+
+        """
+        try:
+            _shadow = tf.keras.models.clone_model(model)
+        except (NotImplementedError, TypeError, ValueError):
+            return None
+        if getattr(model, "optimizer", None):
+            _shadow.compile_from_config(model.get_compile_config())
+            if not _shadow.optimizer.built:
+                _shadow.optimizer.build(_shadow.trainable_variables)
+        return _shadow
+
+    def _save(
+        self,
+        snapshot: ModelSnapshot,
+        file_path: pathlib.Path,
+        then: typing.Optional[typing.Callable[[pathlib.Path], typing.Any]],
+    ) -> typing.Any:
+        """Load a snapshot into the copy of the model and save it.
+
+        Parameters
+        ----------
+        snapshot : ModelSnapshot
+            The weights and optimizer state to save
+        file_path : pathlib.Path
+            Path to save the model to
+        then : typing.Optional[typing.Callable[[pathlib.Path], typing.Any]]
+            Function called with the path once the model has been saved
+
+        Returns
+        -------
+        typing.Any
+            Result of the function, or the path if no function was given
+
+        """
+        self._shadow.set_weights(snapshot.weights)
+        if snapshot.optimizer_variables:
+            for variable in self._shadow.optimizer.variables:
+                variable.assign(snapshot.optimizer_variables[variable.path])
+
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        self._shadow.save(file_path)
+        return then(file_path) if then else file_path
+
+    def join(self) -> None:
+        """Wait for any save in progress to complete, raising any error which occurred while saving."""
+        _pending, self._pending = self._pending, None
+        if _pending:
+            _pending.result()
@@ -0,0 +1,561 @@
+"""Spool.
+
+Compact, append-only local storage for the metrics and events of offline runs, written through memory-mapped files
+so that they can be replayed to a Simvue server in large batches once training is complete.
+
+The spool directory contains:
+
+* metric_sets.bin - fixed width records of the run, step, time, timestamp and number of values of each log_metrics call
+* metric_values.bin - fixed width records of the name and value of each metric, in the order they were logged
+* events.bin - fixed width records of the run, message, timestamp and log level of each event
+* strings.bin - table of the metric names and event messages referenced by the records above
+* runs.json - the runs which the records belong to
+"""
+
+import datetime
+import json
+import mmap
+import pathlib
+import struct
+import threading
+import time
+import typing
+import uuid
+
+import numpy
+
+if typing.TYPE_CHECKING:
+    import simvue
+
+SPOOL_METADATA_KEY: str = "tensorvue_spool_id"
+
+LOG_LEVELS: tuple[str, ...] = ("info", "warning", "debug", "error", "critical")
+
+# Records are written with struct for speed, and read back in bulk as numpy arrays with an identical layout
+METRIC_SET_RECORD = struct.Struct("<IqddI")
+METRIC_SET_DTYPE = numpy.dtype(
+    [
+        ("run", "<u4"),
+        ("step", "<i8"),
+        ("time", "<f8"),
+        ("timestamp", "<f8"),
+        ("count", "<u4"),
+    ]
+)
+METRIC_VALUE_RECORD = struct.Struct("<Id")
+METRIC_VALUE_DTYPE = numpy.dtype([("name", "<u4"), ("value", "<f8")])
+EVENT_RECORD = struct.Struct("<IIdB")
+EVENT_DTYPE = numpy.dtype(
+    [("run", "<u4"), ("message", "<u4"), ("timestamp", "<f8"), ("level", "u1")]
+)
+STRING_LENGTH = struct.Struct("<I")
+
+SPOOL_FILES: dict[str, bytes] = {
+    "metric_sets": b"TVMSET01",
+    "metric_values": b"TVMVAL01",
+    "events": b"TVEVNT01",
+    "strings": b"TVSTRS01",
+}
+
+
+class MappedFile:
+    """Append-only file written through a memory map, which grows in fixed size chunks."""
+
+    # Identifies the file type, and records how many bytes have been written after the header
+    HEADER = struct.Struct("<8sQ")
+
+    def __init__(
+        self, file_path: pathlib.Path, magic: bytes, chunk_size: int = 1024**2
+    ):
+        """Open an append-only memory mapped file, creating it if it does not exist.
+
+        Parameters
+        ----------
+        file_path : pathlib.Path
+            Path to the file
+        magic : bytes
+            Eight bytes identifying the type of file
+        chunk_size : int, optional
+            Number of bytes to extend the file by whenever it is full, by default 1 MiB
+
+        Raises
+        ------
+        ValueError
+            Raised if the file exists but is not of the expected type
+
+        """
+        self.file_path = file_path
+        self.magic = magic
+        self.chunk_size = chunk_size
+        _exists = file_path.exists() and file_path.stat().st_size >= self.HEADER.size
+        self._file = open(file_path, "r+b" if _exists else "w+b")
+        if not _exists:
+            self._file.truncate(chunk_size)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+
+        if _exists:
+            _magic, self.size = self.HEADER.unpack_from(self._map)
+            if _magic != magic:
+                self.close()
+                raise ValueError(f"{file_path} is not a valid spool file.")
+        else:
+            self.size = 0
+            self.HEADER.pack_into(self._map, 0, magic, 0)
+
+    def append(self, data: bytes) -> None:
+        """Write data to the end of the file, extending it if required.
+
+        Parameters
+        ----------
+        data : bytes
+            The data to write
+
+        """
+        _start = self.HEADER.size + self.size
+        _end = _start + len(data)
+        if _end > len(self._map):
+            self._map.close()
+            self._file.truncate(
+                (_end // self.chunk_size + 1) * self.chunk_size,
+            )
+            self._map = mmap.mmap(self._file.fileno(), 0)
+        self._map[_start:_end] = data
+        self.size += len(data)
+        # Only count the data once it has been written, so that the file is never left partially written
+        self.HEADER.pack_into(self._map, 0, self.magic, self.size)
+
+    def flush(self) -> None:
+        """Write any changes held in memory to disk."""
+        self._map.flush()
+
+    def close(self) -> None:
+        """Write all changes to disk and close the file, discarding any unused space at the end of it."""
+        if self._map.closed:
+            return
+        self._map.flush()
+        self._map.close()
+        self._file.truncate(self.HEADER.size + self.size)
+        self._file.close()
+
+
+def _timestamp_seconds(
+    timestamp: typing.Optional[typing.Union[datetime.datetime, float]],
+) -> float:
+    """Convert a timestamp to seconds since the epoch.
+
+    Parameters
+    ----------
+    timestamp : typing.Optional[typing.Union[datetime.datetime, float]]
+        A datetime or number of seconds since the epoch, if None the current time is used
+
+    Returns
+    -------
+    float
+        Seconds since the epoch
+
+    """
+    if timestamp is None:
+        return time.time()
+    if isinstance(timestamp, datetime.datetime):
+        return timestamp.timestamp()
+    return float(timestamp)
+
+
+class Spool:
+    """Writer for a directory of append-only files holding the metrics and events of offline runs."""
+
+    def __init__(self, directory: typing.Union[str, pathlib.Path]):
+        """Open a spool directory for writing, continuing from any data already in it.
+
+        Parameters
+        ----------
+        directory : typing.Union[str, pathlib.Path]
+            Directory to store the spool files in, created if it does not exist
+
+        """
+        self.directory = pathlib.Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._files = {
+            name: MappedFile(self.directory.joinpath(f"{name}.bin"), magic)
+            for name, magic in SPOOL_FILES.items()
+        }
+        self._strings = {
+            string: index for index, string in enumerate(read_strings(self.directory))
+        }
+        self._runs = read_runs(self.directory)
+        self.closed: bool = False
+
+    def register_run(self, offline_id: str, name: str, spool_id: str) -> int:
+        """Add a run to the spool.
+
+        Parameters
+        ----------
+        offline_id : str
+            Identifier of the run in the local Simvue cache
+        name : str
+            Name of the run
+        spool_id : str
+            Unique identifier stored in the metadata of the run, used to find the run on the server
+
+        Returns
+        -------
+        int
+            Index which identifies the run in the spool records
+
+        """
+        with self._lock:
+            self._runs.append(
+                {"offline_id": offline_id, "name": name, "spool_id": spool_id}
+            )
+            self.directory.joinpath("runs.json").write_text(json.dumps(self._runs))
+            return len(self._runs) - 1
+
+    def _string(self, value: str) -> int:
+        """Find the index of a string in the string table, adding it if not present.
+
+        Parameters
+        ----------
+        value : str
+            The string to look up
+
+        Returns
+        -------
+        int
+            Index of the string in the table
+
+        """
+        _index = self._strings.get(value)
+        if _index is None:
+            _encoded = value.encode()
+            self._files["strings"].append(STRING_LENGTH.pack(len(_encoded)) + _encoded)
+            _index = self._strings[value] = len(self._strings)
+        return _index
+
+    def log_metrics(
+        self,
+        run_index: int,
+        metrics: dict[str, float],
+        step: int,
+        time: float,
+        timestamp: typing.Optional[typing.Union[datetime.datetime, float]] = None,
+    ) -> bool:
+        """Append a set of metric values to the spool, unless it has been closed.
+
+        Parameters
+        ----------
+        run_index : int
+            Index of the run which the metrics belong to
+        metrics : dict[str, float]
+            Value of each metric
+        step : int
+            Step index of the metric values
+        time : float
+            Time in seconds since the start of the run
+        timestamp : typing.Optional[typing.Union[datetime.datetime, float]], optional
+            Time at which the metrics were recorded, by default the current time
+
+        Returns
+        -------
+        bool
+            Whether the metrics were written, False if the spool has been closed
+
+        """
+        if not metrics:
+            return True
+        with self._lock:
+            if self.closed:
+                return False
+            # Values are written before the set which references them, so an interrupted write never corrupts the spool
+            self._files["metric_values"].append(
+                b"".join(
+                    METRIC_VALUE_RECORD.pack(self._string(name), value)
+                    for name, value in metrics.items()
+                )
+            )
+            self._files["metric_sets"].append(
+                METRIC_SET_RECORD.pack(
+                    run_index, step, time, _timestamp_seconds(timestamp), len(metrics)
+                )
+            )
+        return True
+
+    def log_event(
+        self,
+        run_index: int,
+        message: str,
+        timestamp: typing.Optional[typing.Union[datetime.datetime, float]] = None,
+        log_level: typing.Optional[str] = None,
+    ) -> bool:
+        """Append an event to the spool, unless it has been closed.
+
+        Parameters
+        ----------
+        run_index : int
+            Index of the run which the event belongs to
+        message : str
+            The event message
+        timestamp : typing.Optional[typing.Union[datetime.datetime, float]], optional
+            Time at which the event occurred, by default the current time
+        log_level : typing.Optional[str], optional
+            Log level of the event, by default "info"
+
+        Returns
+        -------
+        bool
+            Whether the event was written, False if the spool has been closed
+
+        """
+        with self._lock:
+            if self.closed:
+                return False
+            self._files["events"].append(
+                EVENT_RECORD.pack(
+                    run_index,
+                    self._string(message),
+                    _timestamp_seconds(timestamp),
+                    LOG_LEVELS.index(log_level or "info"),
+                )
+            )
+        return True
+
+    def flush(self) -> None:
+        """Write all spooled data held in memory to disk."""
+        with self._lock:
+            if self.closed:
+                return
+            for mapped_file in self._files.values():
+                mapped_file.flush()
+
+    def close(self) -> None:
+        """Write all spooled data to disk and close the spool files."""
+        with self._lock:
+            self.closed = True
+            for mapped_file in self._files.values():
+                mapped_file.close()
+
+
+class SpooledRun:
+    """Simvue run which writes its metrics and events to a spool, delegating everything else to an offline run.
+
+    Once the spool is closed, metrics and events are logged to the offline run instead, to be sent with it by Simvue.
+    """
+
+    def __init__(self, run: "simvue.Run", spool: Spool):
+        """Wrap an offline run so that its metrics and events are written to a spool.
+
+        Parameters
+        ----------
+        run : simvue.Run
+            The offline run to wrap, not yet initialised
+        spool : Spool
+            The spool to write metrics and events to
+
+        """
+        self._run = run
+        self._spool = spool
+        self._spool_index: typing.Optional[int] = None
+        self._step: int = 0
+
+    def __getattr__(self, name: str) -> typing.Any:
+        """Retrieve any other attribute from the wrapped run.
+
+        Parameters
+        ----------
+        name : str
+            Name of the attribute
+
+        Returns
+        -------
+        typing.Any
+            The attribute of the wrapped run
+
+        """
+        return getattr(self._run, name)
+
+    def init(self, *args: typing.Any, **kwargs: typing.Any) -> bool:
+        """Initialise the wrapped run, and register it with the spool.
+
+        Parameters
+        ----------
+        *args : typing.Any
+            Positional arguments for simvue.Run.init
+        **kwargs : typing.Any
+            Keyword arguments for simvue.Run.init
+
+        Returns
+        -------
+        bool
+            Whether the run was initialised successfully
+
+        """
+        # Record a unique ID in the metadata, so the run can be found on the server when the spool is synced
+        _spool_id = uuid.uuid4().hex
+        kwargs["metadata"] = {
+            **(kwargs.get("metadata") or {}),
+            SPOOL_METADATA_KEY: _spool_id,
+        }
+        _initialised = self._run.init(*args, **kwargs)
+        self._spool_index = self._spool.register_run(
+            self._run.id, kwargs.get("name") or "", _spool_id
+        )
+        return _initialised
+
+    def log_metrics(
+        self,
+        metrics: dict[str, float],
+        step: typing.Optional[int] = None,
+        time: typing.Optional[float] = None,
+        timestamp: typing.Optional[datetime.datetime] = None,
+    ) -> bool:
+        """Write metrics to the spool.
+
+        Parameters
+        ----------
+        metrics : dict[str, float]
+            Value of each metric
+        step : typing.Optional[int], optional
+            Step index of the metric values, by default the number of previous calls
+        time : typing.Optional[float], optional
+            Time in seconds since the start of the run, by default the current duration of the run
+        timestamp : typing.Optional[datetime.datetime], optional
+            Time at which the metrics were recorded, by default the current time
+
+        Returns
+        -------
+        bool
+            Whether the metrics were written
+
+        """
+        _step = self._step if step is None else step
+        _time = self._run.duration if time is None else time
+        self._step += 1
+        if self._spool.log_metrics(
+            self._spool_index, metrics, step=_step, time=_time, timestamp=timestamp
+        ):
+            return True
+        return self._run.log_metrics(
+            metrics, step=_step, time=_time, timestamp=timestamp
+        )
+
+    def log_event(
+        self,
+        message: str,
+        *,
+        timestamp: typing.Optional[datetime.datetime] = None,
+        log_level: typing.Optional[str] = None,
+    ) -> bool:
+        """Write an event to the spool.
+
+        Parameters
+        ----------
+        message : str
+            The event message
+        timestamp : typing.Optional[datetime.datetime], optional
+            Time at which the event occurred, by default the current time
+        log_level : typing.Optional[str], optional
+            Log level of the event, by default "info"
+
+        Returns
+        -------
+        bool
+            Whether the event was written
+
+        """
+        if self._spool.log_event(
+            self._spool_index, message, timestamp=timestamp, log_level=log_level
+        ):
+            return True
+        return self._run.log_event(message, timestamp=timestamp, log_level=log_level)
+
+
+def read_strings(directory: typing.Union[str, pathlib.Path]) -> list[str]:
+    """Read the string table of a spool.
+
+    Parameters
+    ----------
+    directory : typing.Union[str, pathlib.Path]
+        The spool directory
+
+    Returns
+    -------
+    list[str]
+        Every string in the table, in order of index
+
+    """
+    _path = pathlib.Path(directory).joinpath("strings.bin")
+    if not _path.exists():
+        return []
+    _data = _path.read_bytes()
+    _, _size = MappedFile.HEADER.unpack_from(_data)
+    _strings = []
+    _offset, _end = MappedFile.HEADER.size, MappedFile.HEADER.size + _size
+    while _offset < _end:
+        (_length,) = STRING_LENGTH.unpack_from(_data, _offset)
+        _offset += STRING_LENGTH.size
+        _strings.append(_data[_offset : _offset + _length].decode())
+        _offset += _length
+    return _strings
+
+
+def read_runs(directory: typing.Union[str, pathlib.Path]) -> list[dict[str, str]]:
+    """Read the runs registered with a spool.
+
+    Parameters
+    ----------
+    directory : typing.Union[str, pathlib.Path]
+        The spool directory
+
+    Returns
+    -------
+    list[dict[str, str]]
+        The offline ID, name and spool ID of each run, in order of index
+
+    """
+    _path = pathlib.Path(directory).joinpath("runs.json")
+    return json.loads(_path.read_text()) if _path.exists() else []
+
+
+def read_records(
+    directory: typing.Union[str, pathlib.Path], name: str, dtype: numpy.dtype
+) -> numpy.ndarray:
+    """Memory map the records in one of the spool files, without reading them into memory.
+
+    Parameters
+    ----------
+    directory : typing.Union[str, pathlib.Path]
+        The spool directory
+    name : str
+        Name of the spool file, one of metric_sets, metric_values or events
+    dtype : numpy.dtype
+        Layout of the records in the file
+
+    Returns
+    -------
+    numpy.ndarray
+        Read-only array of records
+
+    Raises
+    ------
+    ValueError
+        Raised if the file is not of the expected type
+
+    """
+    _path = pathlib.Path(directory).joinpath(f"{name}.bin")
+    if not _path.exists():
+        return numpy.empty(0, dtype=dtype)
+    with open(_path, "rb") as spool_file:
+        _magic, _size = MappedFile.HEADER.unpack(
+            spool_file.read(MappedFile.HEADER.size)
+        )
+    if _magic != SPOOL_FILES[name]:
+        raise ValueError(f"{_path} is not a valid spool file.")
+    if not _size // dtype.itemsize:
+        return numpy.empty(0, dtype=dtype)
+    return numpy.memmap(
+        _path,
+        dtype=dtype,
+        mode="r",
+        offset=MappedFile.HEADER.size,
+        shape=(_size // dtype.itemsize,),
+    )
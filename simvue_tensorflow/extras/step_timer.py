@@ -0,0 +1,85 @@
+"""Step Timer.
+
+Timing of training steps in a fixed-size ring buffer, from which percentiles of recent step times are calculated.
+"""
+
+import time
+import typing
+
+import numpy
+
+PERCENTILES: tuple[int, ...] = (50, 95, 99)
+
+
+class StepTimer:
+    """Records the duration of the most recent steps in a fixed-size ring buffer."""
+
+    def __init__(self, capacity: int = 1024):
+        """Create a ring buffer holding the duration of the most recent steps.
+
+        Parameters
+        ----------
+        capacity : int, optional
+            Maximum number of step durations held, after which the oldest are overwritten, by default 1024
+
+        """
+        self._durations = numpy.zeros(capacity)
+        self._count: int = 0
+        self._start: typing.Optional[float] = None
+
+    @property
+    def count(self) -> int:
+        """Number of steps recorded since the last reset.
+
+        Returns
+        -------
+        int
+            Number of recorded steps, including any which have been overwritten
+
+        """
+        return self._count
+
+    def reset(self) -> None:
+        """Discard all recorded step durations."""
+        self._count = 0
+        self._start = None
+
+    def begin(self) -> None:
+        """Mark the start of a step."""
+        self._start = time.perf_counter()
+
+    def end(self, steps: int = 1) -> None:
+        """Mark the end of a step, recording its duration if its start was marked.
+
+        Parameters
+        ----------
+        steps : int, optional
+            Number of steps run since the start was marked, by default 1
+            If the model runs several steps in each execution, the mean duration of each is recorded for every step.
+
+        """
+        if self._start is None:
+            return
+        _rows = numpy.arange(self._count, self._count + steps) % len(self._durations)
+        self._durations[_rows] = (time.perf_counter() - self._start) / steps
+        self._count += steps
+        self._start = None
+
+    def percentiles(self) -> dict[str, float]:
+        """Calculate percentiles of the recorded step durations.
+
+        Returns
+        -------
+        dict[str, float]
+            The 50th, 95th and 99th percentile step durations in milliseconds, empty if no steps have been recorded
+
+        """
+        _recorded = self._durations[: min(self._count, len(self._durations))]
+        if not len(_recorded):
+            return {}
+        return {
+            f"p{percentile}_ms": value * 1e3
+            for percentile, value in zip(
+                PERCENTILES, numpy.percentile(_recorded, PERCENTILES).tolist()
+            )
+        }
@@ -0,0 +1,260 @@
+"""Training Loop.
+
+Tracking of custom training loops written with tf.GradientTape, driving a TensorVue callback through the same methods
+as model.fit and model.evaluate so that the same runs, alerts and early stopping are used. Metrics are accumulated into
+variables from inside the compiled step, and only copied to the host when they are logged.
+"""
+
+import typing
+from collections.abc import Iterable, Iterator
+
+import tensorflow as tf
+
+from simvue_tensorflow.extras.device_buffer import materialise_logs
+
+if typing.TYPE_CHECKING:
+    from simvue_tensorflow.plugin import TensorVue
+
+
+class MetricAccumulator:
+    """Running means of metrics, held in variables which can be updated from inside a tf.function."""
+
+    def __init__(self, metric_names: typing.Sequence[str]):
+        """Create the variables which metrics are accumulated into.
+
+        Parameters
+        ----------
+        metric_names : typing.Sequence[str]
+            Names of the metrics, all of which must be given each time the metrics are recorded
+
+        """
+        self.metric_names = tuple(metric_names)
+        # Aggregated across replicas when read, in the same way as Keras metrics
+        _variable_options = {
+            "trainable": False,
+            "synchronization": tf.VariableSynchronization.ON_READ,
+            "aggregation": tf.VariableAggregation.SUM,
+        }
+        self._totals = tf.Variable(
+            tf.zeros(len(self.metric_names)),
+            name="tensorvue_totals",
+            **_variable_options,
+        )
+        self._count = tf.Variable(0.0, name="tensorvue_count", **_variable_options)
+
+    def record(self, metrics: dict[str, tf.Tensor]) -> None:
+        """Add the values of the metrics for a step to the running totals, without copying them to the host.
+
+        Parameters
+        ----------
+        metrics : dict[str, tf.Tensor]
+            Scalar value of each metric for this step
+
+        """
+        self._totals.assign_add(
+            tf.stack([tf.cast(metrics[name], tf.float32) for name in self.metric_names])
+        )
+        self._count.assign_add(1.0)
+
+    def reset(self) -> None:
+        """Set the running totals back to zero."""
+        self._totals.assign(tf.zeros_like(self._totals))
+        self._count.assign(0.0)
+
+    def result(self) -> dict[str, tf.Tensor]:
+        """Calculate the mean of each metric since the last reset, keeping the values on-device.
+
+        Returns
+        -------
+        dict[str, tf.Tensor]
+            Mean of each metric, as scalar tensors
+
+        """
+        return dict(
+            zip(
+                self.metric_names,
+                tf.unstack(tf.math.divide_no_nan(self._totals, self._count)),
+            )
+        )
+
+
+class TrainingLoop:
+    """Tracks a custom training loop with a TensorVue callback.
+
+    Metrics are recorded from inside the step function, and the loop is wrapped in the methods of this class, which
+    call the methods of the callback in the same order as model.fit and model.evaluate:
+
+    ```
+    loop = TrainingLoop(tensorvue, model, epochs=5, steps=len(train_batches))
+
+    @tf.function
+    def train_step(images, labels):
+        ...
+        loop.record(loss=loss, accuracy=accuracy)
+
+    with loop:
+        for epoch in loop.epochs():
+            for images, labels in loop.steps(train_batches):
+                train_step(images, labels)
+            for images, labels in loop.test_steps(validation_batches):
+                test_step(images, labels)
+
+    for images, labels in loop.test_steps(test_batches):
+        test_step(images, labels)
+    ```
+
+    Batches tested within the loop are treated as validation of the current Epoch, and batches tested after it as an
+    evaluation of the final model. Training stops early, at the end of a step, if the callback sets the stop_training
+    attribute of the model, such as when early stopping criteria are satisfied or an aborting alert fires.
+
+    The running means of the metrics are passed to the callback after each step as tensors, which are only copied to
+    the host once the callback logs them. If its batch metrics are buffered, such as with tensor_logs=True or
+    batch_flush_steps, they stay on-device until the buffers are flushed. If a batch_sampling policy is used, only
+    sampled batches are copied.
+    """
+
+    def __init__(
+        self,
+        callback: "TensorVue",
+        model: typing.Any,
+        epochs: int,
+        steps: typing.Optional[int] = None,
+        metric_names: typing.Sequence[str] = ("accuracy", "loss"),
+    ):
+        """Create a tracker for a custom training loop.
+
+        Parameters
+        ----------
+        callback : TensorVue
+            The callback to track the loop with
+        model : typing.Any
+            The Keras model being trained
+        epochs : int
+            Number of Epochs to train for
+        steps : typing.Optional[int], optional
+            Number of training steps in each Epoch, by default None if unknown
+        metric_names : typing.Sequence[str], optional
+            Names of the metrics recorded in each step, by default ("accuracy", "loss")
+
+        """
+        self.callback = callback
+        self.model = model
+        self.epochs_total = epochs
+        self.steps_total = steps
+        self._metrics = MetricAccumulator(metric_names)
+        self._epoch_logs: dict[str, float] = {}
+        self._training: bool = False
+
+    def record(self, **metrics: tf.Tensor) -> None:
+        """Record the metrics of a training or test step, which can be called from inside a tf.function.
+
+        Parameters
+        ----------
+        **metrics : tf.Tensor
+            Scalar value of each metric for this step
+
+        """
+        self._metrics.record(metrics)
+
+    def __enter__(self) -> "TrainingLoop":
+        """Begin training, initialising the simulation run.
+
+        Returns
+        -------
+        TrainingLoop
+            This tracker
+
+        """
+        self.model.stop_training = False
+        self.callback.set_model(self.model)
+        self.callback.set_params(
+            {"verbose": 0, "epochs": self.epochs_total, "steps": self.steps_total}
+        )
+        self.callback.on_train_begin({})
+        self._training = True
+        return self
+
+    def __exit__(self, exc_type: typing.Optional[type], *args: typing.Any) -> None:
+        """End training, closing the simulation run, unless an exception was raised as with model.fit.
+
+        Parameters
+        ----------
+        exc_type : typing.Optional[type]
+            Type of any exception raised by the loop
+        *args : typing.Any
+            Further details of the exception
+
+        """
+        self._training = False
+        if exc_type is None:
+            self.callback.on_train_end(self._epoch_logs)
+
+    def epochs(self) -> Iterator[int]:
+        """Iterate over the Epochs, until all have been trained or training is stopped.
+
+        Yields
+        ------
+        int
+            Index of the Epoch, counting from 0
+
+        """
+        for epoch in range(self.epochs_total):
+            self._epoch_logs = {}
+            self.callback.on_epoch_begin(epoch, {})
+            yield epoch
+            self.callback.on_epoch_end(epoch, dict(self._epoch_logs))
+            if self.model.stop_training:
+                return
+
+    def steps(self, batches: Iterable[typing.Any]) -> Iterator[typing.Any]:
+        """Iterate over the training batches of an Epoch, until all have been trained or training is stopped.
+
+        Parameters
+        ----------
+        batches : Iterable[typing.Any]
+            The training batches
+
+        Yields
+        ------
+        typing.Any
+            Each batch, to be passed to the training step
+
+        """
+        self._metrics.reset()
+        for batch, element in enumerate(batches):
+            self.callback.on_train_batch_begin(batch, {})
+            yield element
+            self.callback.on_train_batch_end(batch, self._metrics.result())
+            if self.model.stop_training:
+                break
+        self._epoch_logs.update(materialise_logs(self._metrics.result()))
+
+    def test_steps(self, batches: Iterable[typing.Any]) -> Iterator[typing.Any]:
+        """Iterate over test batches, which validate the current Epoch if training, or evaluate the final model.
+
+        Parameters
+        ----------
+        batches : Iterable[typing.Any]
+            The test batches
+
+        Yields
+        ------
+        typing.Any
+            Each batch, to be passed to the test step
+
+        """
+        self.model.stop_evaluating = False
+        self._metrics.reset()
+        self.callback.on_test_begin({})
+        for batch, element in enumerate(batches):
+            self.callback.on_test_batch_begin(batch, {})
+            yield element
+            self.callback.on_test_batch_end(batch, self._metrics.result())
+            if self.model.stop_evaluating:
+                break
+        _logs = materialise_logs(self._metrics.result())
+        self.callback.on_test_end(_logs)
+        if self._training:
+            self._epoch_logs.update(
+                {f"val_{name}": value for name, value in _logs.items()}
+            )
@@ -0,0 +1,290 @@
+"""Trials.
+
+Running the trials of a hyperparameter optimisation concurrently in a pool of processes, each pinned to its own subset
+of CPU cores with the TensorFlow thread pools sized to match, and each given its own simulation and evaluation runs for
+a TensorVue callback in optimisation framework mode.
+"""
+
+import concurrent.futures
+import contextlib
+import multiprocessing
+import os
+import traceback
+import typing
+
+import tensorflow as tf
+
+if typing.TYPE_CHECKING:
+    import simvue
+
+# Cores which the current worker process is pinned to, set once the worker starts
+_worker_cores: tuple[int, ...] = ()
+
+
+class TrialResult(typing.NamedTuple):
+    """Outcome of a single trial."""
+
+    index: int
+    params: dict[str, typing.Any]
+    simulation_run_id: typing.Optional[str] = None
+    evaluation_run_id: typing.Optional[str] = None
+    cores: tuple[int, ...] = ()
+    result: typing.Any = None
+    error: typing.Optional[str] = None
+
+
+def available_cores() -> list[int]:
+    """Find the CPU cores which this process may run on.
+
+    Returns
+    -------
+    list[int]
+        Indices of the cores in the affinity mask of this process, or of all cores if affinity is not supported
+
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def partition_cores(cores: list[int], n_workers: int) -> list[tuple[int, ...]]:
+    """Split cores into equally sized, contiguous subsets, one for each worker.
+
+    Parameters
+    ----------
+    cores : list[int]
+        Indices of the cores to split
+    n_workers : int
+        Number of subsets to split them into, any remaining cores are left unused
+
+    Returns
+    -------
+    list[tuple[int, ...]]
+        The cores of each worker
+
+    Raises
+    ------
+    ValueError
+        Raised if there are fewer cores than workers
+
+    """
+    if not 0 < n_workers <= len(cores):
+        raise ValueError(
+            f"Cannot split {len(cores)} cores between {n_workers} workers, each worker needs at least one core."
+        )
+    _size = len(cores) // n_workers
+    return [tuple(cores[i * _size : (i + 1) * _size]) for i in range(n_workers)]
+
+
+def _initialise_worker(
+    core_subsets: "multiprocessing.Queue", inter_op_threads: int
+) -> None:
+    """Pin a new worker process to the next subset of cores, and size the TensorFlow thread pools to match.
+
+    Parameters
+    ----------
+    core_subsets : multiprocessing.Queue
+        Subsets of cores not yet taken by a worker
+    inter_op_threads : int
+        Number of threads for running independent operations concurrently
+
+    """
+    global _worker_cores
+    _worker_cores = core_subsets.get()
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, _worker_cores)
+    # Thread pools are created when the TensorFlow runtime is initialised, which has not happened in a new process
+    tf.config.threading.set_intra_op_parallelism_threads(len(_worker_cores))
+    tf.config.threading.set_inter_op_parallelism_threads(inter_op_threads)
+
+
+def _run_trial(
+    trial_function: typing.Callable[
+        [dict[str, typing.Any], "simvue.Run", "simvue.Run"], typing.Any
+    ],
+    index: int,
+    params: dict[str, typing.Any],
+    run_name: str,
+    run_folder: str,
+    run_tags: list[str],
+    run_mode: str,
+) -> TrialResult:
+    """Create the runs of a trial and run it, within a worker process.
+
+    Parameters
+    ----------
+    trial_function : typing.Callable[[dict[str, typing.Any], simvue.Run, simvue.Run], typing.Any]
+        Function which trains and evaluates a model, given its parameters and the simulation and evaluation runs
+    index : int
+        Index of the trial
+    params : dict[str, typing.Any]
+        Parameters of the trial, which are also recorded as the metadata of its runs
+    run_name : str
+        Name of the optimisation, from which the names of the runs are formed
+    run_folder : str
+        Folder to store the runs in
+    run_tags : list[str]
+        Tags associated with the runs
+    run_mode : str
+        Whether Simvue should run in Online or Offline mode, or be disabled
+
+    Returns
+    -------
+    TrialResult
+        The value returned by the trial function, or a traceback if it raised an exception
+
+    """
+    # Imported here, as Simvue is slow to import and is only needed by the workers
+    import simvue
+
+    _runs: dict[str, simvue.Run] = {}
+    try:
+        with contextlib.ExitStack() as stack:
+            for kind, tags, description in (
+                ("simulation", run_tags + ["simulation"], f"Training of trial {index}"),
+                ("evaluation", run_tags, f"Evaluation of trial {index}"),
+            ):
+                _runs[kind] = stack.enter_context(simvue.Run(mode=run_mode))
+                # TensorVue takes the trial number from the end of the simulation run name
+                _runs[kind].init(
+                    name=f"{run_name}_{kind}_{index}",
+                    folder=run_folder,
+                    description=description,
+                    tags=tags,
+                    metadata=params,
+                )
+            _result = trial_function(params, _runs["simulation"], _runs["evaluation"])
+    except Exception:
+        _result, _error = None, traceback.format_exc()
+    else:
+        _error = None
+
+    return TrialResult(
+        index=index,
+        params=params,
+        simulation_run_id=_runs["simulation"].id if "simulation" in _runs else None,
+        evaluation_run_id=_runs["evaluation"].id if "evaluation" in _runs else None,
+        cores=_worker_cores,
+        result=_result,
+        error=_error,
+    )
+
+
+class TrialExecutor:
+    """Runs trials concurrently in a pool of processes, each pinned to its own subset of CPU cores.
+
+    The trial function is given the parameters of the trial, and a simulation and evaluation run which have already
+    been initialised. It should pass these to a TensorVue callback with optimisation_framework=True, train and evaluate
+    the model, and return any results to collect, such as the logs returned by model.evaluate. The runs are closed
+    once it returns, and marked as failed if it raises an exception.
+
+    Workers are started with the spawn method, so the trial function must be defined at the top level of an importable
+    module, and its parameters and result must be picklable.
+    """
+
+    def __init__(
+        self,
+        trial_function: typing.Callable[
+            [dict[str, typing.Any], "simvue.Run", "simvue.Run"], typing.Any
+        ],
+        run_name: str,
+        run_folder: typing.Optional[str] = None,
+        run_tags: typing.Optional[list[str]] = None,
+        run_mode: typing.Literal["online", "offline", "disabled"] = "online",
+        n_workers: typing.Optional[int] = None,
+        cores: typing.Optional[list[int]] = None,
+        inter_op_threads: int = 1,
+    ):
+        """Create an executor for the trials of an optimisation.
+
+        Parameters
+        ----------
+        trial_function : typing.Callable[[dict[str, typing.Any], simvue.Run, simvue.Run], typing.Any]
+            Function which trains and evaluates a model, given its parameters and the simulation and evaluation runs
+        run_name : str
+            Name of the optimisation, the runs of each trial are named {run_name}_simulation_{index} and
+            {run_name}_evaluation_{index}
+        run_folder : typing.Optional[str], optional
+            Folder to store the runs in, by default a folder with the same name as the optimisation
+        run_tags : typing.Optional[list[str]], optional
+            Tags associated with the runs, by default None
+        run_mode : typing.Literal["online", "offline", "disabled"], optional
+            Whether Simvue should run in Online or Offline mode, or be disabled such as for testing, by default Online
+        n_workers : typing.Optional[int], optional
+            Number of trials to run at once, by default one for each core, up to the number of trials
+        cores : typing.Optional[list[int]], optional
+            CPU cores to split between the workers, by default all cores this process may run on
+        inter_op_threads : int, optional
+            Number of threads each worker uses to run independent operations concurrently, by default 1
+            Each worker uses one thread per core for running each operation.
+
+        """
+        self.trial_function = trial_function
+        self.run_name = run_name
+        self.run_folder = run_folder or f"/{run_name}"
+        self.run_tags = run_tags or []
+        self.run_mode = run_mode
+        self.n_workers = n_workers
+        self.cores = cores or available_cores()
+        self.inter_op_threads = inter_op_threads
+
+    def run(
+        self,
+        trials: typing.Iterable[dict[str, typing.Any]],
+        callback: typing.Optional[typing.Callable[[TrialResult], None]] = None,
+    ) -> list[TrialResult]:
+        """Run every trial, waiting for them all to finish.
+
+        Parameters
+        ----------
+        trials : typing.Iterable[dict[str, typing.Any]]
+            Parameters of each trial
+        callback : typing.Optional[typing.Callable[[TrialResult], None]], optional
+            Function called in this process with the result of each trial as it finishes, by default None
+
+        Returns
+        -------
+        list[TrialResult]
+            Result of each trial, in the order the trials were given
+
+        """
+        _trials = list(trials)
+        if not _trials:
+            return []
+        _n_workers = min(self.n_workers or len(self.cores), len(_trials))
+        _context = multiprocessing.get_context("spawn")
+        _core_subsets = _context.Queue()
+        for subset in partition_cores(self.cores, _n_workers):
+            _core_subsets.put(subset)
+
+        _results: list[typing.Optional[TrialResult]] = [None] * len(_trials)
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=_n_workers,
+            mp_context=_context,
+            initializer=_initialise_worker,
+            initargs=(_core_subsets, self.inter_op_threads),
+        ) as pool:
+            _futures = {
+                pool.submit(
+                    _run_trial,
+                    self.trial_function,
+                    index,
+                    params,
+                    self.run_name,
+                    self.run_folder,
+                    self.run_tags,
+                    self.run_mode,
+                ): index
+                for index, params in enumerate(_trials)
+            }
+            for future in concurrent.futures.as_completed(_futures):
+                _index = _futures[future]
+                try:
+                    _result = future.result()
+                except Exception as e:
+                    # The worker died, or the trial function or its result could not be pickled
+                    _result = TrialResult(_index, _trials[_index], error=repr(e))
+                _results[_index] = _result
+                if callback:
+                    callback(_result)
+        return _results
@@ -0,0 +1,194 @@
+"""Uploader.
+
+Background uploading of artifacts to Simvue runs, so that training is not blocked by large files.
+"""
+
+import concurrent.futures
+import pathlib
+import shutil
+import tempfile
+import threading
+import time
+import typing
+
+from simvue_tensorflow.extras.chunks import ChunkStore
+
+if typing.TYPE_CHECKING:
+    import simvue
+
+
+class UploadRecord(typing.NamedTuple):
+    """Timing information for a completed artifact upload."""
+
+    name: str
+    size: int
+    latency: float
+    uploaded: int
+
+
+class ArtifactUploader:
+    """Uploads artifacts to Simvue runs from a pool of background threads."""
+
+    def __init__(self, max_workers: int = 2, max_inflight_bytes: int = 1024**3):
+        """Create a pool of background threads for uploading artifacts to Simvue runs.
+
+        Parameters
+        ----------
+        max_workers : int, optional
+            Number of threads used to upload artifacts concurrently, by default 2
+        max_inflight_bytes : int, optional
+            Maximum total size of artifacts which can be queued or uploading at once, by default 1 GiB
+            Submitting an artifact which would exceed this blocks until enough uploads have completed.
+
+        """
+        self.max_inflight_bytes = max_inflight_bytes
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="tensorvue_upload"
+        )
+        self._condition = threading.Condition()
+        self._inflight_bytes: int = 0
+        self._futures: list[concurrent.futures.Future] = []
+        self._completed: list[UploadRecord] = []
+        self._staging_dir: typing.Optional[tempfile.TemporaryDirectory] = None
+
+    def submit(
+        self,
+        run: "simvue.Run",
+        file_path: typing.Union[str, pathlib.Path],
+        category: typing.Literal["input", "output", "code"],
+        name: typing.Optional[str] = None,
+        snapshot: bool = False,
+        chunk_store: typing.Optional[ChunkStore] = None,
+        chunk_run: typing.Optional["simvue.Run"] = None,
+    ) -> concurrent.futures.Future:
+        """Queue a file to be uploaded to a run in the background.
+
+        Parameters
+        ----------
+        run : simvue.Run
+            The run to save the file to
+        file_path : typing.Union[str, pathlib.Path]
+            Path to the file to upload
+        category : typing.Literal["input", "output", "code"]
+            Category of the artifact
+        name : typing.Optional[str], optional
+            Name to store the artifact under, by default the name of the file
+        snapshot : bool, optional
+            Whether to upload a copy of the file, so that it can be overwritten during the upload, by default False
+        chunk_store : typing.Optional[ChunkStore], optional
+            If provided, upload the file as content-addressed chunks with a manifest, by default None
+        chunk_run : typing.Optional[simvue.Run], optional
+            The run to save new chunks to when using a chunk store, by default the same run as the manifest
+
+        Returns
+        -------
+        concurrent.futures.Future
+            Future which completes once the file has been uploaded
+
+        """
+        file_path = pathlib.Path(file_path)
+        name = name or file_path.name
+        size = file_path.stat().st_size
+
+        # Always admit a file if nothing else is in flight, so that a single large file cannot block forever
+        with self._condition:
+            self._condition.wait_for(
+                lambda: not self._inflight_bytes
+                or self._inflight_bytes + size <= self.max_inflight_bytes
+            )
+            self._inflight_bytes += size
+
+        if snapshot:
+            if not self._staging_dir:
+                self._staging_dir = tempfile.TemporaryDirectory(prefix="tensorvue_")
+            _staged_path = pathlib.Path(
+                tempfile.mkdtemp(dir=self._staging_dir.name)
+            ).joinpath(file_path.name)
+            shutil.copyfile(file_path, _staged_path)
+            file_path = _staged_path
+
+        future = self._executor.submit(
+            self._upload,
+            run,
+            file_path,
+            category,
+            name,
+            size,
+            snapshot,
+            chunk_store,
+            chunk_run,
+        )
+        self._futures.append(future)
+        return future
+
+    def _upload(
+        self,
+        run: "simvue.Run",
+        file_path: pathlib.Path,
+        category: typing.Literal["input", "output", "code"],
+        name: str,
+        size: int,
+        snapshot: bool,
+        chunk_store: typing.Optional[ChunkStore],
+        chunk_run: typing.Optional["simvue.Run"],
+    ) -> None:
+        """Upload a file to a run, recording how long it took.
+
+        Parameters
+        ----------
+        run : simvue.Run
+            The run to save the file to
+        file_path : pathlib.Path
+            Path to the file to upload
+        category : typing.Literal["input", "output", "code"]
+            Category of the artifact
+        name : str
+            Name to store the artifact under
+        size : int
+            Size of the file in bytes
+        snapshot : bool
+            Whether the file is a staged copy which should be removed after uploading
+        chunk_store : typing.Optional[ChunkStore]
+            If provided, upload the file as content-addressed chunks with a manifest
+        chunk_run : typing.Optional[simvue.Run]
+            The run to save new chunks to when using a chunk store
+
+        """
+        try:
+            _start = time.perf_counter()
+            if chunk_store:
+                _uploaded = chunk_store.upload(
+                    run, file_path, category, name, chunk_run=chunk_run
+                )
+            else:
+                run.save_file(file_path=file_path, category=category, name=name)
+                _uploaded = size
+            with self._condition:
+                self._completed.append(
+                    UploadRecord(name, size, time.perf_counter() - _start, _uploaded)
+                )
+        finally:
+            if snapshot:
+                file_path.unlink(missing_ok=True)
+            with self._condition:
+                self._inflight_bytes -= size
+                self._condition.notify_all()
+
+    def pop_completed(self) -> list[UploadRecord]:
+        """Retrieve timings of uploads which have completed since this was last called.
+
+        Returns
+        -------
+        list[UploadRecord]
+            Name, size, latency and number of bytes sent of each completed upload
+
+        """
+        with self._condition:
+            _completed, self._completed = self._completed, []
+        return _completed
+
+    def join(self) -> None:
+        """Wait for all queued uploads to complete, raising any errors which occurred during upload."""
+        _futures, self._futures = self._futures, []
+        for future in _futures:
+            future.result()
@@ -0,0 +1,134 @@
+"""Weight Statistics.
+
+Summary statistics of a model's trainable variables, computed on-device in a single compiled pass so that only
+the summaries are copied to the host.
+"""
+
+import numpy
+import tensorflow as tf
+
+# Statistics computed for each variable, in the order they are stacked on-device
+STATISTICS: tuple[str, ...] = ("norm", "mean", "std", "min", "max", "update_ratio")
+
+# Histograms cover values within this many standard deviations of the mean of each variable,
+# so that the same bins can be used for every variable throughout training
+HISTOGRAM_RANGE: float = 4.0
+
+
+class WeightStatistics:
+    """Computes norms, moments, histograms and update ratios of trainable variables, comparing against a snapshot."""
+
+    def __init__(
+        self,
+        variables: list[tf.Variable],
+        histogram_bins: int = 32,
+        prefix: str = "weights",
+    ):
+        """Create a summary of the given variables, keeping an on-device snapshot of them to compare updates against.
+
+        Parameters
+        ----------
+        variables : list[tf.Variable]
+            The trainable variables of the model
+        histogram_bins : int, optional
+            Number of bins in the histogram of each variable, or 0 for no histograms, by default 32
+        prefix : str, optional
+            Prefix of the metric names, by default "weights"
+
+        """
+        self.variables = variables
+        self.histogram_bins = histogram_bins
+        self.names = [
+            f"{prefix}/{getattr(variable, 'path', None) or variable.name}"
+            for variable in variables
+        ]
+        self._snapshots = [
+            tf.Variable(tf.zeros(variable.shape, tf.float32), trainable=False)
+            for variable in variables
+        ]
+        self._has_snapshot = False
+        self._summarise = tf.function(self._summarise_variables)
+
+    @property
+    def histogram_ticks(self) -> numpy.ndarray:
+        """Centre of each histogram bin, in standard deviations from the mean of the variable.
+
+        Returns
+        -------
+        numpy.ndarray
+            Bin centres
+
+        """
+        _edges = numpy.linspace(
+            -HISTOGRAM_RANGE, HISTOGRAM_RANGE, self.histogram_bins + 1
+        )
+        return (_edges[1:] + _edges[:-1]) / 2
+
+    def _summarise_variables(self) -> tuple[tf.Tensor, tf.Tensor]:
+        """Compute the statistics of every variable, and snapshot them for the next comparison.
+
+        Returns
+        -------
+        tuple[tf.Tensor, tf.Tensor]
+            Statistics of each variable stacked as (variables, statistics),
+            and histograms stacked as (variables, bins)
+
+        """
+        _statistics, _histograms = [], []
+        for variable, snapshot in zip(self.variables, self._snapshots):
+            _values = tf.reshape(tf.cast(variable, tf.float32), [-1])
+            _previous = tf.reshape(snapshot, [-1])
+            _mean = tf.reduce_mean(_values)
+            _std = tf.math.reduce_std(_values)
+            _norm = tf.norm(_values)
+            _statistics.append(
+                tf.stack(
+                    [
+                        _norm,
+                        _mean,
+                        _std,
+                        tf.reduce_min(_values),
+                        tf.reduce_max(_values),
+                        tf.norm(_values - _previous)
+                        / tf.maximum(tf.norm(_previous), 1e-12),
+                    ]
+                )
+            )
+            if self.histogram_bins:
+                _histograms.append(
+                    tf.histogram_fixed_width(
+                        (_values - _mean) / tf.maximum(_std, 1e-12),
+                        [-HISTOGRAM_RANGE, HISTOGRAM_RANGE],
+                        nbins=self.histogram_bins,
+                    )
+                )
+            snapshot.assign(tf.reshape(_values, snapshot.shape))
+        return (
+            tf.stack(_statistics),
+            tf.stack(_histograms) if _histograms else tf.zeros([0, 0], tf.int32),
+        )
+
+    def compute(self) -> tuple[dict[str, float], dict[str, numpy.ndarray]]:
+        """Compute the statistics of every variable, comparing against the values at the previous computation.
+
+        Returns
+        -------
+        tuple[dict[str, float], dict[str, numpy.ndarray]]
+            Each statistic of each variable, without update ratios the first time this is called,
+            and the histogram of each variable as the fraction of its values in each bin
+
+        """
+        _statistics, _histograms = (tensor.numpy() for tensor in self._summarise())
+        _included = STATISTICS if self._has_snapshot else STATISTICS[:-1]
+        self._has_snapshot = True
+
+        statistics = {
+            f"{name}/{statistic}": value
+            for name, values in zip(self.names, _statistics.tolist())
+            for statistic, value in zip(_included, values)
+        }
+        histograms = {
+            f"{name}/histogram": counts / max(counts.sum(), 1)
+            for name, counts in zip(self.names, _histograms)
+        }
+        return statistics, histograms
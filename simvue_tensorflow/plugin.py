@@ -3,21 +3,111 @@
 Generic callback class which can be used in any Tensorflow Keras CNN to automatically add Simvue tracking and monitoring.
 """
 
-import inspect
+import atexit
+import concurrent.futures
+import functools
 import pathlib
+import sys
+import tempfile
+import time
 import typing
 
-import simvue
-from simvue.api.objects import (
-    EventsAlert,
-    MetricsRangeAlert,
-    MetricsThresholdAlert,
-    UserAlert,
-)
+import tensorflow as tf
 from tensorflow.keras.callbacks import Callback
 
 import simvue_tensorflow.extras.operators as operators
-from simvue_tensorflow.extras.create_alerts import create_alerts
+from simvue_tensorflow.extras.alert_evaluation import LocalAlertEvaluator
+from simvue_tensorflow.extras.chunks import ChunkStore
+from simvue_tensorflow.extras.create_alerts import AlertRegistry, _alert_method
+from simvue_tensorflow.extras.device_buffer import DeviceMetricBuffer, materialise_logs
+from simvue_tensorflow.extras.distribution import get_strategy, is_chief, reduce_logs
+from simvue_tensorflow.extras.early_stopping import Criterion, Progress
+from simvue_tensorflow.extras.events import EventStream
+from simvue_tensorflow.extras.input_pipeline import InputPipelineTimer
+from simvue_tensorflow.extras.metric_buffer import MetricBuffer
+from simvue_tensorflow.extras.metric_history import MetricHistory
+from simvue_tensorflow.extras.model_config import MODEL_CONFIGS
+from simvue_tensorflow.extras.overhead import OverheadTracker, Timer
+from simvue_tensorflow.extras.resources import ResourceSampler
+from simvue_tensorflow.extras.sampling import SamplingPolicy
+from simvue_tensorflow.extras.snapshot import AsyncModelSaver
+from simvue_tensorflow.extras.spool import Spool, SpooledRun
+from simvue_tensorflow.extras.step_timer import StepTimer
+from simvue_tensorflow.extras.uploader import ArtifactUploader
+from simvue_tensorflow.extras.weight_stats import WeightStatistics
+
+if typing.TYPE_CHECKING:
+    import simvue
+
+# Default for script_filepath, which refers to the script being run
+MAIN_SCRIPT: str = "__main__"
+
+# Interval between progress events when the number of steps in each Epoch is unknown
+PROGRESS_INTERVAL_SECONDS: float = 10.0
+
+
+def _tracked_hook(hook: typing.Callable) -> typing.Callable:
+    """Wrap a callback method so that it only runs on the chief worker, and records how long it takes.
+
+    Parameters
+    ----------
+    hook : typing.Callable
+        The callback method to wrap
+
+    Returns
+    -------
+    typing.Callable
+        The wrapped method, which does nothing unless called on the chief worker of a distributed training cluster
+
+    """
+    _name = hook.__name__
+
+    @functools.wraps(hook)
+    def _hook(self: "TensorVue", *args, **kwargs) -> None:
+        if not self._is_chief:
+            return
+        if not self._overhead:
+            try:
+                hook(self, *args, **kwargs)
+            finally:
+                self._events.flush()
+            return
+        self._hook_start = _start = time.perf_counter()
+        try:
+            hook(self, *args, **kwargs)
+        finally:
+            self._events.flush()
+            self._overhead.record(_name, time.perf_counter() - _start)
+
+    return _hook
+
+
+def _delete_run(run: "simvue.Run") -> bool:
+    """Delete a run which was created but never started, from the server or from the offline cache.
+
+    Parameters
+    ----------
+    run : simvue.Run
+        The run to delete
+
+    Returns
+    -------
+    bool
+        Whether the run was deleted
+
+    """
+    # Imported here, as Simvue is slow to import and is not needed until training begins
+    from simvue.api.objects import Run
+
+    try:
+        Run(
+            identifier=run.id,
+            server_url=run.user_config.server.url,
+            server_token=run.user_config.server.token,
+        ).delete()
+    except Exception:
+        return False
+    return True
 
 
 class TensorVue(Callback):
@@ -39,7 +129,7 @@ class TensorVue(Callback):
         epoch_alerts: typing.Optional[list[str]] = None,
         evaluation_alerts: typing.Optional[list[str]] = None,
         start_alerts_from_epoch: int = 0,
-        script_filepath: str = inspect.stack()[-1].filename,
+        script_filepath: typing.Optional[str] = MAIN_SCRIPT,
         model_checkpoint_filepath: typing.Optional[str] = None,
         model_final_filepath: str = "/tmp/simvue/final_model.keras",
         evaluation_parameter: str = None,
@@ -47,8 +137,33 @@ class TensorVue(Callback):
         evaluation_condition: operators.Operator = None,
         create_epoch_runs: typing.Optional[bool] = True,
         optimisation_framework: bool = False,
-        simulation_run: typing.Optional[simvue.Run] = None,
-        evaluation_run: typing.Optional[simvue.Run] = None,
+        simulation_run: typing.Optional["simvue.Run"] = None,
+        evaluation_run: typing.Optional["simvue.Run"] = None,
+        batch_flush_steps: typing.Optional[int] = None,
+        batch_flush_seconds: typing.Optional[float] = None,
+        upload_workers: int = 2,
+        upload_max_inflight_bytes: int = 1024**3,
+        prewarm_epoch_runs: bool = True,
+        batch_sampling: typing.Optional[SamplingPolicy] = None,
+        tensor_logs: bool = False,
+        metric_directions: typing.Optional[
+            dict[str, typing.Literal["maximise", "minimise"]]
+        ] = None,
+        strategy_aware: bool = False,
+        global_batch_size: typing.Optional[int] = None,
+        offline_spool_dir: typing.Optional[str] = None,
+        track_overhead: bool = True,
+        checkpoint_chunk_size: typing.Optional[int] = None,
+        async_model_saving: bool = False,
+        weight_stats_steps: typing.Optional[int] = None,
+        weight_histogram_bins: int = 32,
+        step_time_buffer_size: int = 1024,
+        input_bound_threshold: typing.Optional[float] = 0.5,
+        resource_sample_seconds: typing.Optional[float] = None,
+        early_stopping: typing.Optional[Criterion] = None,
+        local_alerts: bool = False,
+        event_level: typing.Literal["debug", "info", "warning"] = "debug",
+        batch_events: bool = True,
     ):
         """Tensorflow Callback class for adding Simvue integration.
 
@@ -82,14 +197,16 @@ class TensorVue(Callback):
             Which of the alerts defined above to add to the evaluation runs, by default None
         start_alerts_from_epoch : int, optional
             The number of the epoch which you would like to begin setting alerts for, by default 0
-        script_filepath : str, optional
-            Path of the file to upload as Code to the simulation run, by default inspect.stack()[-1].filename
+        script_filepath : typing.Optional[str], optional
+            Path of the file to upload as Code to the simulation run, or None to not upload any code,
+            by default the script being run
         model_checkpoint_filepath : typing.Optional[str], optional
-            If using the ModelCheckpoint callback, the path where the checkpoint files are saved after each epoch, by default None
+            If using the ModelCheckpoint callback, the path where the checkpoint files are saved after each epoch,
+            or if using async_model_saving, the path to save checkpoints to, by default None
         model_final_filepath : str, optional
             The location where the final model should be stored after training is complete, by default "/tmp/simvue/final_model.keras"
         evaluation_parameter: str, optional
-            The parameter to check the value of after each Epoch, eitheer accuracy, loss, val_accuracy, or val_loss
+            The parameter to check the value of after each Epoch, any metric in the logs such as accuracy, loss, val_accuracy, or val_loss
         evaluation_target: float, optional
             The target value of the parameter, which will cause the training to stop if satisfied
         evaluation_condition: operators.Operator, optional
@@ -104,17 +221,110 @@ class TensorVue(Callback):
         evaluation_run : typing.Optional[simvue.Run], optional
             If using the ML Opt framework and this callback is being called within the evaluation function,
             the 'eval' run which has been created by the framework for this trial, by default None
+        batch_flush_steps : typing.Optional[int], optional
+            If provided, buffer batch metrics and upload them in bulk every this many steps, by default None
+        batch_flush_seconds : typing.Optional[float], optional
+            If provided, buffer batch metrics and upload them in bulk at least this often in seconds, by default None
+            If specified without batch_flush_steps, up to 1024 steps are buffered between uploads
+        upload_workers : int, optional
+            Number of background threads used to upload model checkpoints and the final model, by default 2
+        upload_max_inflight_bytes : int, optional
+            Maximum total size of model files which can be waiting to upload at once, by default 1 GiB
+            Training is paused when saving a model file would exceed this, until enough uploads have completed
+        prewarm_epoch_runs : bool, optional
+            Whether to create the run for the next Epoch in the background while the current Epoch is training, by default True
+            The next Epoch's run is only started once that Epoch begins. If training stops early, the unused run is deleted
+        batch_sampling : typing.Optional[SamplingPolicy], optional
+            Policy deciding which training batches have their metrics logged, by default None
+            Options are EveryNSteps, TimeInterval, LogSpaced and Adaptive from simvue_tensorflow.extras.sampling.
+            If not provided, every batch is logged to the Epoch runs, or no batches are logged if Epoch runs are disabled.
+            If provided when Epoch runs are disabled, sampled batches are logged to the simulation run as batch_accuracy and batch_loss.
+        tensor_logs : bool, optional
+            Whether to have batch logs passed in as tensors, keeping them on-device until they are flushed, by default False
+            Enables buffered batch logging. Batch logs passed in as tensors by a TrainingLoop are accepted either way. Tensorflow only passes tensor logs to callbacks when using legacy Keras (tf_keras),
+            Keras 3 always converts logs to floats before calling callbacks.
+        metric_directions : typing.Optional[dict[str, typing.Literal["maximise", "minimise"]]], optional
+            Whether an increase or decrease in each metric counts as an improvement after each Epoch, by default None
+            Metrics not specified are minimised if their name suggests a loss or error (eg 'loss', 'mae'), otherwise maximised.
+        strategy_aware : bool, optional
+            Whether to account for a tf.distribute strategy which the model is being trained with, by default False
+            Runs are only created and logged to by the chief worker, any per-replica values in the logs are averaged
+            over the replicas, and the training throughput of each replica is logged to the simulation run after each Epoch.
+        global_batch_size : typing.Optional[int], optional
+            Number of samples in each training batch across all replicas, by default None
+            If provided, throughput is logged in samples per second as well as steps per second.
+        offline_spool_dir : typing.Optional[str], optional
+            If provided in offline mode, directory where metrics and events are written to a compact binary spool, by default None
+            All other run data is stored in the Simvue offline cache as normal. Once the runs have been uploaded with
+            simvue-sender, upload the spool in large batches with simvue-tensorflow-sync.
+        track_overhead : bool, optional
+            Whether to time each method of this callback, and any custom timers, by default True
+            Summaries are logged to the simulation run after each Epoch as tensorvue/overhead/* metrics,
+            along with the fraction of the Epoch spent in this callback. Custom timers are logged as tensorvue/timers/*.
+        checkpoint_chunk_size : typing.Optional[int], optional
+            If provided, upload model checkpoints and the final model as content-addressed chunks of this many bytes,
+            by default None. Only chunks which have changed since a previous upload are sent, compressed and stored in
+            the simulation run, and each Epoch run stores a manifest listing the chunks of its checkpoint, which can be
+            reassembled with simvue_tensorflow.extras.chunks.assemble_file.
+        async_model_saving : bool, optional
+            Whether to save a checkpoint after each Epoch and the final model from a background thread, by default False
+            A snapshot of the weights and optimizer state is copied into memory, after which training continues while it
+            is saved and uploaded, with at most one save in progress at a time. Checkpoints are saved to
+            model_checkpoint_filepath, or a temporary file if not provided, so the ModelCheckpoint callback is not needed.
+            Checkpoints are uploaded to each Epoch run, or to the simulation run if Epoch runs are disabled. Subclassed
+            models which cannot be cloned are saved before training continues, and only uploaded in the background.
+        weight_stats_steps : typing.Optional[int], optional
+            If provided, log statistics of each trainable variable to the simulation run every this many training steps,
+            by default None. The norm, mean, standard deviation, minimum, maximum and ratio of the norm of the update
+            since the previous computation to the norm of the variable are logged as weights/<variable>/<statistic>,
+            computed on-device in a single pass over the model's trainable variables.
+        weight_histogram_bins : int, optional
+            Number of bins in the histogram of each variable logged alongside its statistics, or 0 for no histograms,
+            by default 32. Histograms cover four standard deviations either side of the mean of each variable,
+            and are logged as weights/<variable>/histogram grid metrics. Not available with an offline spool.
+        step_time_buffer_size : int, optional
+            Number of recent training steps whose durations are kept, or 0 to not time steps, by default 1024
+            The 50th, 95th and 99th percentile step times in the latest Epoch are logged to the simulation run as
+            step_time/p*_ms, along with the throughput and the estimated time remaining as progress/eta_seconds.
+        input_bound_threshold : typing.Optional[float], optional
+            Fraction of an Epoch spent waiting for input above which training is reported as input-bound with an event,
+            or None to not measure input waits, by default 0.5. The time between training steps and, for datasets
+            passed through instrument_dataset, the time each step waits for its batch are logged to the simulation
+            run after each Epoch as input/step_gap_fraction and input/wait_fraction, which alerts can be defined on.
+        resource_sample_seconds : typing.Optional[float], optional
+            If provided, sample the resource usage of this process from a background thread this often in seconds
+            during training, by default None. The resident memory, CPU utilisation, number of open file handles and
+            the current and peak memory of each TensorFlow device are logged to the simulation run as resources/*.
+        early_stopping : typing.Optional[Criterion], optional
+            Criteria for stopping training early, by default None. Options are Threshold, Plateau and Budget from
+            simvue_tensorflow.extras.early_stopping, which can be combined with & and |, for example
+            Plateau("val_loss", patience=3, min_delta=1e-3) | Budget(seconds=3600). Metric criteria are checked
+            after each Epoch, and budgets after each step. Used alongside the evaluation_* arguments, if provided.
+        local_alerts : bool, optional
+            Whether to also evaluate metric alerts in-process as each value is logged, by default False
+            Alerts are still created on the server, but fire within the step which triggered them, logging an event to
+            the run, and stopping training or evaluation if they have trigger_abort set. The window of each alert is
+            in seconds as on the server, and batch metrics are checked every batch, even if the batch is not logged.
+        event_level : typing.Literal["debug", "info", "warning"], optional
+            Lowest level of event to log, by default "debug" to log all events. Progress updates such as
+            'Training is X% complete.' are debug events, and early termination and triggered alerts are warnings.
+        batch_events : bool, optional
+            Whether to submit the events logged to each run by each callback method together, by default True
+            Each event keeps its own message, level and the time it was logged, and is sent once the method returns.
 
         Raises
         ------
         ValueError
-            Raised if the ML Optimisation framework is not enabled and no run name was provided
+            Raised if the ML Optimisation framework is not enabled and no run name was provided,
+            or if an offline spool directory was provided when not in offline mode
         KeyError
             Raised if attempted to add an alert to a run which was not defined
 
         """
         if not optimisation_framework and not run_name:
             raise ValueError("Must provide a run name!")
+        if offline_spool_dir and run_mode != "offline":
+            raise ValueError("Offline spool can only be used in offline mode!")
         self.run_name = run_name
         self.run_folder = run_folder or f"/{self.run_name}"
         self.run_description = (
@@ -125,31 +335,121 @@ class TensorVue(Callback):
         self.run_metadata = run_metadata or {}
         self.run_mode = run_mode
         self.alert_definitions = alert_definitions
-        self.script_filepath = script_filepath
+        self.script_filepath = (
+            getattr(sys.modules["__main__"], "__file__", None)
+            if script_filepath == MAIN_SCRIPT
+            else script_filepath
+        )
         self.model_checkpoint_filepath = model_checkpoint_filepath
         self.model_final_filepath = model_final_filepath
         self.evaluation_parameter = evaluation_parameter
         self.evaluation_condition = evaluation_condition
         self.evaluation_target = evaluation_target
+        self.early_stopping = early_stopping
         self.create_epoch_runs = create_epoch_runs
         self.optimisation_framework = optimisation_framework
         self.simulation_run = simulation_run
         self.eval_run = evaluation_run
+        self.batch_sampling = batch_sampling
+        self.offline_spool_dir = offline_spool_dir
+        self._spool: typing.Optional[Spool] = None
+        self._overhead: typing.Optional[OverheadTracker] = (
+            OverheadTracker() if track_overhead else None
+        )
+        self._hook_start: float = 0.0
+        self._events = EventStream(event_level, batch_events)
+        self._epochs_completed: int = 0
+        self._metric_history = MetricHistory(metric_directions)
+        self._train_step: int = 0
+        self._last_batch_end: typing.Optional[float] = None
+        self._steps_per_execution: int = 1
+        self._block_begin: int = 0
+
+        self.strategy_aware = strategy_aware
+        self.global_batch_size = global_batch_size
+        self._strategy: typing.Optional[tf.distribute.Strategy] = None
+        self._is_chief: bool = True
+        self._epoch_start: tuple[int, float] = (0, time.perf_counter())
+        self._epoch_train_end: float = time.perf_counter()
+        self._train_start: float = time.perf_counter()
+        self._last_progress: float = time.perf_counter()
+        self._step_timer: typing.Optional[StepTimer] = (
+            StepTimer(step_time_buffer_size) if step_time_buffer_size else None
+        )
+        self.input_bound_threshold = input_bound_threshold
+        self._input_timer: typing.Optional[InputPipelineTimer] = (
+            InputPipelineTimer() if input_bound_threshold is not None else None
+        )
+        self._input_bound: bool = False
+        self.resource_sample_seconds = resource_sample_seconds
+        self._resource_sampler: typing.Optional[ResourceSampler] = None
+
+        self._uploader = ArtifactUploader(upload_workers, upload_max_inflight_bytes)
+        self._chunk_store: typing.Optional[ChunkStore] = (
+            ChunkStore(checkpoint_chunk_size) if checkpoint_chunk_size else None
+        )
 
-        # Create alerts in a disabled run up front, to validate that they have been defined accurately
-        if alert_definitions:
-            with simvue.Run(mode="disabled") as temp_run:
-                temp_run._user_config.run.mode == self.run_mode
-                [
-                    create_alerts(alert_name, alert_definition, temp_run)
-                    for alert_name, alert_definition in alert_definitions.items()
-                ]
+        self.weight_stats_steps = weight_stats_steps
+        self.weight_histogram_bins = weight_histogram_bins
+        self._weight_statistics: typing.Optional[WeightStatistics] = None
+
+        self._model_saver: typing.Optional[AsyncModelSaver] = None
+        if async_model_saving:
+            self._model_saver = AsyncModelSaver()
+            if not self.model_checkpoint_filepath:
+                self._checkpoint_dir = tempfile.TemporaryDirectory(prefix="tensorvue_")
+                self.model_checkpoint_filepath = str(
+                    pathlib.Path(self._checkpoint_dir.name, "checkpoint.keras")
+                )
+        self._uploading_epoch_runs: list[
+            tuple["simvue.Run", concurrent.futures.Future]
+        ] = []
+        self._upload_counts: dict[str, int] = {}
+
+        self.prewarm_epoch_runs = prewarm_epoch_runs
+        self._epoch_run_creator = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="tensorvue_epoch_run"
+        )
+        self._next_epoch_run: typing.Optional[tuple[int, concurrent.futures.Future]] = (
+            None
+        )
+
+        self.tensor_logs = tensor_logs
+        self.buffer_batch_metrics = (
+            tensor_logs
+            or batch_flush_steps is not None
+            or batch_flush_seconds is not None
+        )
+
+        if self.buffer_batch_metrics:
+            # Batch logs may be tensors, such as from a TrainingLoop, which are kept on-device until flushed
+            _buffer_options = {
+                "capacity": batch_flush_steps or 1024,
+                "flush_seconds": batch_flush_seconds,
+            }
+            self._train_batch_buffer = DeviceMetricBuffer(
+                ["accuracy", "loss"], **_buffer_options
+            )
+            self._validation_batch_buffer = DeviceMetricBuffer(
+                ["val_accuracy", "val_loss"], **_buffer_options
+            )
+            self._evaluation_batch_buffer = DeviceMetricBuffer(
+                ["accuracy", "loss"], **_buffer_options
+            )
+            self._simulation_batch_buffer = DeviceMetricBuffer(
+                ["batch_accuracy", "batch_loss"], **_buffer_options
+            )
+
+        # Check the source of each alert up front, the rest is checked against Simvue before the first run is created
+        for alert_name, alert_definition in (alert_definitions or {}).items():
+            _alert_method(alert_name, alert_definition)
 
         self.manifest_alerts = manifest_alerts or []
         self.simulation_alerts = simulation_alerts or []
         self.epoch_alerts = epoch_alerts or []
         self.evaluation_alerts = evaluation_alerts or []
         self.start_alerts_from_epoch = start_alerts_from_epoch
+        self._alert_registry = AlertRegistry(self.alert_definitions or {})
 
         for alert_name in (
             self.simulation_alerts
@@ -162,9 +462,138 @@ class TensorVue(Callback):
                     f"Alert name {alert_name} not present in alert definitions."
                 )
 
+        self._local_alerts: dict[str, LocalAlertEvaluator] = {}
+        if local_alerts:
+            for scope, alert_names in (
+                ("simulation", self.simulation_alerts),
+                ("epoch", self.epoch_alerts),
+                ("evaluation", self.evaluation_alerts),
+            ):
+                if _evaluator := LocalAlertEvaluator(
+                    self.alert_definitions, alert_names
+                ):
+                    self._local_alerts[scope] = _evaluator
+
         super().__init__()
 
-    def create_manifest_run(self) -> simvue.Run:
+        # Tells legacy Keras that batch logs can be passed in without converting them to floats
+        self._supports_tf_logs = tensor_logs
+
+    def set_model(self, model: typing.Any) -> None:
+        """Set the model being tracked, detecting the distribution strategy and number of steps in each execution.
+
+        Parameters
+        ----------
+        model : typing.Any
+            The Keras model which this callback is attached to
+
+        """
+        super().set_model(model)
+        # Keras 3 stores the number of steps run in each call to the compiled function as an int, legacy Keras as a variable
+        self._steps_per_execution = int(
+            getattr(model, "steps_per_execution", None)
+            or getattr(model, "_steps_per_execution", None)
+            or 1
+        )
+        if self.strategy_aware:
+            self._strategy = get_strategy(model)
+            self._is_chief = is_chief(self._strategy)
+
+    def timer(self, name: str) -> Timer:
+        """Time a block of user code, logging a summary of its duration to the simulation run after each Epoch.
+
+        Can be used as a context manager or as a function decorator, and does nothing if track_overhead is disabled.
+
+        Parameters
+        ----------
+        name : str
+            Name of the timer, the summary is logged as tensorvue/timers/{name}/* metrics
+
+        Returns
+        -------
+        Timer
+            Context manager which records the time spent inside it
+
+        """
+        return Timer(self._overhead, name)
+
+    def instrument_dataset(
+        self, dataset: tf.data.Dataset, stage: typing.Optional[str] = None
+    ) -> tf.data.Dataset:
+        """Time the elements passing through a dataset, to measure how long training waits for its input.
+
+        Keras fetches each batch inside the training step, so waiting on a tf.data pipeline is only measured if
+        the dataset passed to model.fit is instrumented. Intermediate stages of the pipeline can also be instrumented,
+        and the mean time spent waiting for each of their elements is logged as input/stages/{stage}/latency_ms after each Epoch.
+
+        Parameters
+        ----------
+        dataset : tf.data.Dataset
+            The dataset to instrument
+        stage : typing.Optional[str], optional
+            Name of an intermediate stage of the pipeline, by default None for the dataset passed to model.fit,
+            which should be instrumented after any prefetching
+
+        Returns
+        -------
+        tf.data.Dataset
+            The dataset, with the same elements, or unchanged if input_bound_threshold is None
+
+        """
+        if not self._input_timer:
+            return dataset
+        return self._input_timer.instrument(dataset, stage)
+
+    def _overhead_metrics(
+        self, final_hook: typing.Optional[str] = None
+    ) -> dict[str, float]:
+        """Summarise the time spent in this callback and in custom timers since the last summary.
+
+        Parameters
+        ----------
+        final_hook : typing.Optional[str], optional
+            Name of the method currently running, if its time so far should be included, by default None
+            Used when the summary is logged just before the run is closed.
+
+        Returns
+        -------
+        dict[str, float]
+            Overhead and timer metrics, empty if track_overhead is disabled
+
+        """
+        if not self._overhead:
+            return {}
+        if final_hook:
+            self._overhead.record(final_hook, time.perf_counter() - self._hook_start)
+        return self._overhead.publish()
+
+    def _create_run(self) -> "simvue.Run":
+        """Create a run, which writes its metrics and events to the offline spool if one is in use.
+
+        Returns
+        -------
+        simvue.Run
+            The uninitialised run
+
+        """
+        # Imported here, as Simvue is slow to import and is not needed until training begins
+        import simvue
+
+        self._alert_registry.validate()
+        run = simvue.Run(mode=self.run_mode)
+        if not self.offline_spool_dir:
+            return run
+        if not self._spool:
+            self._spool = Spool(self.offline_spool_dir)
+        return SpooledRun(run, self._spool)
+
+    def _close_spool(self) -> None:
+        """Write all spooled metrics and events to disk and close the spool, if one is in use."""
+        if self._spool:
+            self._spool.close()
+            self._spool = None
+
+    def create_manifest_run(self) -> "simvue.Run":
         """Create a Manifest run with user defined inputs.
 
         Returns
@@ -173,7 +602,7 @@ class TensorVue(Callback):
             The manifest run
 
         """
-        manifest_run = simvue.Run(mode=self.run_mode)
+        manifest_run = self._create_run()
         manifest_run.init(
             name=f"{self.run_name}_manifest",
             tags=self.run_tags
@@ -184,10 +613,7 @@ class TensorVue(Callback):
             description=self.run_description,
             metadata=self.run_metadata,
         )
-        [
-            create_alerts(alert_name, self.alert_definitions[alert_name], manifest_run)
-            for alert_name in self.manifest_alerts
-        ]
+        self._alert_registry.attach(self.manifest_alerts, manifest_run)
 
         if self.script_filepath:
             manifest_run.save_file(
@@ -196,6 +622,440 @@ class TensorVue(Callback):
             )
         return manifest_run
 
+    def _log_buffered(
+        self,
+        buffer: MetricBuffer,
+        run: "simvue.Run",
+        step: int,
+        values: tuple[typing.Optional[float], ...],
+    ) -> None:
+        """Add batch metrics to a buffer, uploading its contents to the run once it is due to be flushed.
+
+        Parameters
+        ----------
+        buffer : MetricBuffer
+            The buffer to store the values in
+        run : "simvue.Run"
+            The run which the buffered metrics belong to
+        step : int
+            The step index to log the values against
+        values : tuple[typing.Optional[float], ...]
+            Value of each metric, in the order defined by the buffer
+
+        """
+        if buffer.append(step, values):
+            buffer.flush(run)
+
+    def _close_uploaded_epoch_runs(self) -> None:
+        """Close any Epoch runs which were left open until their checkpoint had finished uploading."""
+        _still_uploading = []
+        for epoch_run, upload in self._uploading_epoch_runs:
+            if upload.done():
+                upload.result()
+                epoch_run.close()
+            else:
+                _still_uploading.append((epoch_run, upload))
+        self._uploading_epoch_runs = _still_uploading
+
+    def _upload_checkpoint(
+        self,
+        epoch_run: "simvue.Run",
+        file_path: pathlib.Path,
+        name: typing.Optional[str] = None,
+    ) -> None:
+        """Upload a checkpoint saved in the background to its Epoch run, waiting until the upload completes.
+
+        Parameters
+        ----------
+        epoch_run : simvue.Run
+            The Epoch run which the checkpoint was saved at the end of, or the simulation run if there are no Epoch runs
+        file_path : pathlib.Path
+            Path to the saved checkpoint
+        name : typing.Optional[str], optional
+            Name to upload the checkpoint as, by default the name of the file
+
+        """
+        self._uploader.submit(
+            epoch_run,
+            file_path,
+            category="output",
+            name=name,
+            chunk_store=self._chunk_store,
+            chunk_run=self.simulation_run,
+        ).result()
+
+    def _start_weight_statistics(self) -> None:
+        """Prepare to compute statistics of the model's trainable variables, defining grids for their histograms."""
+        with get_strategy(self.model).scope():
+            self._weight_statistics = WeightStatistics(
+                self.model.trainable_variables,
+                # Spooled metrics are scalars, so histograms cannot be stored
+                0 if self.offline_spool_dir else self.weight_histogram_bins,
+            )
+        if not self._weight_statistics.histogram_bins:
+            return
+        _ticks = [self._weight_statistics.histogram_ticks.tolist()]
+        for name in self._weight_statistics.names:
+            self.simulation_run.assign_metric_to_grid(
+                metric_name=f"{name}/histogram",
+                axes_ticks=_ticks,
+                axes_labels=["standard deviations from mean"],
+            )
+
+    def _log_upload_metrics(self) -> None:
+        """Log the latency (s) and throughput (MiB/s) of each completed artifact upload to the simulation run.
+
+        When uploading in chunks, the fraction of each file's size which was actually sent is also logged.
+        """
+        for upload in self._uploader.pop_completed():
+            _step = self._upload_counts.get(upload.name, 0)
+            self._upload_counts[upload.name] = _step + 1
+            _metrics = {
+                f"upload_latency/{upload.name}": upload.latency,
+                f"upload_throughput/{upload.name}": upload.size
+                / max(upload.latency, 1e-9)
+                / 1024**2,
+            }
+            if self._chunk_store:
+                _metrics[f"upload_sent_fraction/{upload.name}"] = upload.uploaded / max(
+                    upload.size, 1
+                )
+            self.simulation_run.log_metrics(_metrics, step=_step)
+
+    def _create_epoch_run(self, epoch: int, running: bool = True) -> "simvue.Run":
+        """Create and initialise the run for an Epoch, adding any Epoch alerts.
+
+        Parameters
+        ----------
+        epoch : int
+            The epoch which the run will track
+        running : bool, optional
+            Whether to start the run, or only create it to be started by _start_epoch_run, by default True
+
+        Returns
+        -------
+        simvue.Run
+            The initialised Epoch run
+
+        """
+        epoch_run = self._create_run()
+        epoch_run.init(
+            name=self.run_name + f"_epoch_{epoch+1}",
+            folder=self.run_folder,
+            description=f"Tracking the training performed during Epoch {epoch+1}.",
+            tags=self.run_tags + ["epoch", "training"],
+            metadata=self.run_metadata,
+            running=running,
+        )
+
+        if epoch + 1 >= self.start_alerts_from_epoch:
+            self._alert_registry.attach(self.epoch_alerts, epoch_run)
+        return epoch_run
+
+    def _start_epoch_run(self, epoch_run: "simvue.Run") -> None:
+        """Start an Epoch run which was created in advance, so that its start time and duration begin from now.
+
+        Parameters
+        ----------
+        epoch_run : simvue.Run
+            An Epoch run created by _create_epoch_run without being started
+
+        """
+        if epoch_run.mode != "disabled":
+            epoch_run.reconnect(epoch_run.id)
+
+    def _discard_next_epoch_run(self) -> None:
+        """Delete the prewarmed run for the next Epoch, if one was created but is no longer needed."""
+        if not self._next_epoch_run:
+            return
+        _epoch, next_epoch_run = self._next_epoch_run
+        self._next_epoch_run = None
+        atexit.unregister(self._discard_next_epoch_run)
+        spare_run = next_epoch_run.result()
+        if spare_run.mode == "disabled" or _delete_run(spare_run):
+            return
+
+        # If the run could not be deleted, record why it is empty
+        self._start_epoch_run(spare_run)
+        spare_run.log_event(
+            f"Run was created in advance for Epoch {_epoch+1}, but training stopped before the Epoch began.",
+            log_level="warning",
+        )
+        spare_run.set_status("terminated")
+        spare_run.close()
+
+    def _reduce_logs(self, logs: typing.Optional[dict]) -> typing.Optional[dict]:
+        """Average any per-replica values in the logs over the replicas, if a distribution strategy was detected.
+
+        Parameters
+        ----------
+        logs : typing.Optional[dict]
+            Logs passed into a callback method
+
+        Returns
+        -------
+        typing.Optional[dict]
+            The logs, with each per-replica value replaced by its mean across replicas
+
+        """
+        if not self._strategy:
+            return logs
+        return reduce_logs(logs, self._strategy, keep_on_device=self.tensor_logs)
+
+    def _throughput_metrics(self) -> dict[str, float]:
+        """Calculate the training throughput and step times during the latest Epoch, and the time remaining.
+
+        Returns
+        -------
+        dict[str, float]
+            Throughput in steps per second, and samples per second if the global batch size is known,
+            in total and for each replica if a distribution strategy was detected. Percentiles of the step time,
+            if steps are being timed, and the estimated time remaining based on the average Epoch duration so far.
+
+        """
+        _start_step, _start_time = self._epoch_start
+        _steps_per_second = (self._train_step - _start_step) / max(
+            self._epoch_train_end - _start_time, 1e-9
+        )
+        _metrics = {"throughput/steps_per_second": _steps_per_second}
+        if self.global_batch_size:
+            _samples_per_second = _steps_per_second * self.global_batch_size
+            _metrics["throughput/samples_per_second"] = _samples_per_second
+            if self._strategy:
+                _metrics["throughput/samples_per_second_per_replica"] = (
+                    _samples_per_second / self._strategy.num_replicas_in_sync
+                )
+        if self._step_timer:
+            _metrics.update(
+                {
+                    f"step_time/{name}": value
+                    for name, value in self._step_timer.percentiles().items()
+                }
+            )
+        # Based on time rather than steps, as the number of steps in each Epoch may not be known
+        _epoch_seconds = (time.perf_counter() - self._train_start) / max(
+            self._epochs_completed, 1
+        )
+        _metrics["progress/eta_seconds"] = _epoch_seconds * max(
+            self.params.get("epochs", 0) - self._epochs_completed, 0
+        )
+        return _metrics
+
+    def _input_metrics(self, epoch: int) -> dict[str, float]:
+        """Summarise the time spent waiting for input during the latest Epoch, reporting if training became input-bound.
+
+        Parameters
+        ----------
+        epoch : int
+            The epoch which has just been trained
+
+        Returns
+        -------
+        dict[str, float]
+            Fractions of the Epoch spent between steps and waiting for input, and latencies of instrumented stages,
+            empty if input waits are not being measured
+
+        """
+        if not self._input_timer:
+            return {}
+        _summary = self._input_timer.summary()
+        _input_bound = _summary["wait_fraction"] > self.input_bound_threshold
+        if _input_bound != self._input_bound:
+            self._input_bound = _input_bound
+            if _input_bound:
+                self._events.emit(
+                    self.simulation_run,
+                    "Training is input-bound: {:.0f}% of Epoch {} was spent waiting for input.",
+                    100 * _summary["wait_fraction"],
+                    epoch + 1,
+                    level="warning",
+                )
+            else:
+                self._events.emit(
+                    self.simulation_run,
+                    "Training is no longer input-bound after Epoch {}.",
+                    epoch + 1,
+                )
+        return {f"input/{name}": value for name, value in _summary.items()}
+
+    def _check_early_stopping(self, epoch: int) -> None:
+        """Stop training if the early stopping criteria are satisfied, logging the reason to the simulation run.
+
+        Parameters
+        ----------
+        epoch : int
+            The epoch currently being trained, counting from 1
+
+        """
+        if self.model.stop_training:
+            return
+        _progress = Progress(
+            self._epochs_completed,
+            self._train_step,
+            time.perf_counter() - self._train_start,
+        )
+        if not self.early_stopping.satisfied(_progress):
+            return
+        self.model.stop_training = True
+        termination_message = f"Training terminating early on epoch {epoch} - {self.early_stopping.describe(_progress)}."
+        self._events.emit(self.simulation_run, termination_message, level="warning")
+        print(termination_message)
+
+    def _check_local_alerts(
+        self, scope: str, run: "simvue.Run", metrics: dict[str, typing.Any]
+    ) -> None:
+        """Evaluate metric alerts in-process against newly logged values, stopping if an aborting alert fires.
+
+        Parameters
+        ----------
+        scope : str
+            Which type of run the values were logged to, one of simulation, epoch or evaluation
+        run : simvue.Run
+            The run the values were logged to
+        metrics : dict[str, typing.Any]
+            The newly logged values
+
+        """
+        if not (_evaluator := self._local_alerts.get(scope)):
+            return
+        if (
+            scope == "epoch"
+            and self._epochs_completed + 1 < self.start_alerts_from_epoch
+        ):
+            return
+        for alert in _evaluator.observe(materialise_logs(metrics)):
+            self._events.emit(
+                run,
+                "Alert {} triggered: {}.",
+                alert.name,
+                alert.description,
+                level="warning",
+            )
+            if not alert.trigger_abort:
+                continue
+            if scope == "evaluation":
+                self.model.stop_evaluating = True
+            else:
+                self.model.stop_training = True
+            self._events.emit(
+                run,
+                "{} aborted by alert {}.",
+                "Evaluation" if scope == "evaluation" else "Training",
+                alert.name,
+                level="warning",
+            )
+
+    def _progress_message(self, batch: int, phase: str) -> typing.Optional[str]:
+        """Describe the progress through the current Epoch or evaluation, if it has moved on enough to report.
+
+        Parameters
+        ----------
+        batch : int
+            The first batch about to be processed
+        phase : str
+            Name of the phase being reported, such as Training or Evaluation
+
+        Returns
+        -------
+        typing.Optional[str]
+            Progress message every 10% of the steps if the number of steps is known, otherwise every 10 seconds
+
+        """
+        _steps = self.params.get("steps")
+        if _steps:
+            # Report when the steps in this execution, of which there may be several, pass a multiple of 10%
+            _end = min(batch + self._steps_per_execution, _steps)
+            if int(batch / (_steps / 10)) != int(_end / (_steps / 10)):
+                return f"{phase} is {10* int(batch / (_steps / 10))}% complete."
+            return None
+
+        # Number of steps is unknown, such as for datasets of unknown cardinality, so report periodically instead
+        _now = time.perf_counter()
+        if batch == 0:
+            self._last_progress = _now
+            return f"{phase} has started."
+        if _now - self._last_progress >= PROGRESS_INTERVAL_SECONDS:
+            self._last_progress = _now
+            return f"{phase} has completed {batch} steps."
+        return None
+
+    def _last_step(self, batch: int) -> int:
+        """Find the last step run by an execution, as Keras reports the final execution of an Epoch as if it were full.
+
+        Parameters
+        ----------
+        batch : int
+            The batch passed to the end of batch method, the last of the execution if it ran all of its steps
+
+        Returns
+        -------
+        int
+            The last batch which was actually run, if the number of steps is known
+
+        """
+        _steps = self.params.get("steps")
+        return min(batch, _steps - 1) if _steps else batch
+
+    def _log_train_batch(self, batch: int, logs: dict) -> None:
+        """Log metrics from a training batch to the Epoch run, or to the simulation run if Epoch runs are disabled.
+
+        Parameters
+        ----------
+        batch : int
+            The batch being trained
+        logs : dict
+            Aggregated metrics for this training up to this batch, such as accuracy and loss
+
+        """
+        _values = (logs.get("accuracy"), logs.get("loss"))
+        if self.create_epoch_runs:
+            run, step, metric_names = self.epoch_run, batch, ("accuracy", "loss")
+        else:
+            run, step = self.simulation_run, self._train_step
+            metric_names = ("batch_accuracy", "batch_loss")
+
+        if self.buffer_batch_metrics:
+            self._log_buffered(
+                self._train_batch_buffer
+                if self.create_epoch_runs
+                else self._simulation_batch_buffer,
+                run,
+                step,
+                _values,
+            )
+        else:
+            run.log_metrics(
+                materialise_logs(dict(zip(metric_names, _values))), step=step
+            )
+
+    def _sample_train_batch(self, batch: int, logs: dict, steps: int) -> None:
+        """Log metrics from a training batch if the sampling policy selects it, and update the policy.
+
+        Parameters
+        ----------
+        batch : int
+            The batch being trained
+        logs : dict
+            Aggregated metrics for this training up to this batch, such as accuracy and loss
+        steps : int
+            Number of steps run by this execution
+
+        """
+        _batch_end = time.perf_counter()
+        _step_seconds = (
+            (_batch_end - self._last_batch_end) / steps
+            if self._last_batch_end is not None
+            else None
+        )
+        self._last_batch_end = _batch_end
+
+        _logging_seconds = None
+        if self.batch_sampling.should_log(self._train_step, steps):
+            self._log_train_batch(batch, logs)
+            _logging_seconds = time.perf_counter() - _batch_end
+        self.batch_sampling.update(_step_seconds, _logging_seconds)
+
+    @_tracked_hook
     def on_train_begin(self, logs: dict):
         """Upload relevant information to Simvue at the start of the training session.
 
@@ -211,7 +1071,7 @@ class TensorVue(Callback):
 
         """
         if not self.optimisation_framework:
-            self.simulation_run = simvue.Run(mode=self.run_mode)
+            self.simulation_run = self._create_run()
             self.simulation_run.init(
                 name=self.run_name + "_simulation",
                 description=self.run_description,
@@ -229,7 +1089,10 @@ class TensorVue(Callback):
             )
 
         else:
-            self.run_name = self.simulation_run._name
+            # Runs from Simvue 2 and later, such as those created by extras.trials.TrialExecutor, only have a name property
+            self.run_name = (
+                getattr(self.simulation_run, "_name", None) or self.simulation_run.name
+            )
             self.run_folder = (
                 self.simulation_run._data["folder"]
                 + f"/trial_{self.run_name.split('_')[-1]}"
@@ -242,27 +1105,47 @@ class TensorVue(Callback):
                 ],
             )
 
-        self.simulation_run.update_metadata(self.params)
-
-        [
-            create_alerts(
-                alert_name, self.alert_definitions[alert_name], self.simulation_run
+        _metadata = dict(self.params)
+        if self._strategy:
+            _metadata["distribution_strategy"] = type(self._strategy).__name__
+            _metadata["num_replicas"] = self._strategy.num_replicas_in_sync
+        if self._steps_per_execution > 1:
+            _metadata["steps_per_execution"] = self._steps_per_execution
+        self.simulation_run.update_metadata(_metadata)
+        # Discard any run prewarmed by a previous call to model.fit which raised an exception
+        self._discard_next_epoch_run()
+        self._train_step = 0
+        self._epochs_completed = 0
+        self._train_start = time.perf_counter()
+        self._input_bound = False
+        self._metric_history.reset()
+        if self.early_stopping:
+            self.early_stopping.reset(self._metric_history.direction)
+        if "simulation" in self._local_alerts:
+            self._local_alerts["simulation"].reset()
+        if self._overhead:
+            self._overhead.reset()
+        if self.batch_sampling:
+            self.batch_sampling.reset()
+
+        self._alert_registry.attach(self.simulation_alerts, self.simulation_run)
+
+        if self.weight_stats_steps:
+            self._start_weight_statistics()
+        if self.resource_sample_seconds:
+            self._resource_sampler = ResourceSampler(
+                self.simulation_run, self.resource_sample_seconds
             )
-            for alert_name in self.simulation_alerts
-        ]
+            self._resource_sampler.start()
 
         if self.script_filepath:
             self.simulation_run.save_file(
                 file_path=self.script_filepath,
                 category="code",
             )
-        model_config = self.model.get_config()
-        self.simulation_run.save_object(
-            obj=model_config,
-            category="input",
-            name="model_config",
-        )
+        MODEL_CONFIGS.save(self.model, self.simulation_run, self.run_mode)
 
+    @_tracked_hook
     def on_train_end(self, logs: dict):
         """Upload relevant information to Simvue at the end of the training session.
 
@@ -278,17 +1161,48 @@ class TensorVue(Callback):
                     "Directory to store final model in was not found - creating directory..."
                 )
                 pathlib.Path(self.model_final_filepath).parent.mkdir(exist_ok=True)
-            self.model.save(self.model_final_filepath)
-            self.simulation_run.save_file(
-                file_path=self.model_final_filepath,
+            _upload_final_model = functools.partial(
+                self._uploader.submit,
+                self.simulation_run,
                 category="output",
                 name="final_model.keras",
+                chunk_store=self._chunk_store,
+                chunk_run=self.simulation_run,
+            )
+            if self._model_saver:
+                self._model_saver.save(
+                    self.model, self.model_final_filepath, then=_upload_final_model
+                )
+            else:
+                self.model.save(self.model_final_filepath)
+                _upload_final_model(self.model_final_filepath)
+
+        self._discard_next_epoch_run()
+
+        # Wait for all model files to finish saving and uploading before closing any runs
+        if self._model_saver:
+            self._model_saver.join()
+        self._uploader.join()
+        self._close_uploaded_epoch_runs()
+        self._log_upload_metrics()
+
+        if self._resource_sampler:
+            self._resource_sampler.stop()
+            self._resource_sampler = None
+
+        if _overhead_metrics := self._overhead_metrics("on_train_end"):
+            self.simulation_run.log_metrics(
+                _overhead_metrics, step=self._epochs_completed + 1
             )
+
+        self._events.flush()
         if not self.optimisation_framework:
             self.simulation_run.close()
+        self._close_spool()
 
         self.simulation_run = None
 
+    @_tracked_hook
     def on_epoch_begin(self, epoch: int, logs: dict) -> None:
         """Upload relevant information to Simvue at the start of a new epoch.
 
@@ -305,37 +1219,60 @@ class TensorVue(Callback):
             If the user does not want Epoch runs, exit this method after logging an Event
 
         """
-        self.simulation_run.log_event(f"Starting Epoch {epoch+1}:")
+        self._events.emit(self.simulation_run, "Starting Epoch {}:", epoch + 1)
+        self._last_batch_end = None
+        self._epoch_start = (self._train_step, time.perf_counter())
+        if self._step_timer:
+            self._step_timer.reset()
+        if self._input_timer:
+            self._input_timer.reset()
+        if "epoch" in self._local_alerts:
+            self._local_alerts["epoch"].reset()
 
         if not self.create_epoch_runs:
             return
 
-        self.epoch_run = simvue.Run(mode=self.run_mode)
-        self.epoch_run.init(
-            name=self.run_name + f"_epoch_{epoch+1}",
-            folder=self.run_folder,
-            description=f"Tracking the training performed during Epoch {epoch+1}.",
-            tags=self.run_tags + ["epoch", "training"],
-            metadata=self.run_metadata,
-        )
-
-        if self.epoch_alerts and epoch + 1 >= self.start_alerts_from_epoch:
-            [
-                create_alerts(
-                    alert_name, self.alert_definitions[alert_name], self.epoch_run
-                )
-                for alert_name in self.epoch_alerts
-            ]
+        if self._next_epoch_run and self._next_epoch_run[0] == epoch:
+            self.epoch_run = self._next_epoch_run[1].result()
+            self._next_epoch_run = None
+            atexit.unregister(self._discard_next_epoch_run)
+            self._start_epoch_run(self.epoch_run)
+        else:
+            self._discard_next_epoch_run()
+            self.epoch_run = self._create_epoch_run(epoch)
+
+        # Create the next Epoch's run in the background while this Epoch trains
+        if self.prewarm_epoch_runs and epoch + 1 < self.params.get("epochs", 0):
+            self._next_epoch_run = (
+                epoch + 1,
+                self._epoch_run_creator.submit(
+                    self._create_epoch_run, epoch + 1, running=False
+                ),
+            )
+            # Keras does not end training if model.fit raises, so the run is also discarded if it is never used
+            atexit.register(self._discard_next_epoch_run)
 
         if epoch > 0:
-            self.epoch_run.log_event("Accuracy and Loss values before epoch training:")
-            self.epoch_run.log_event(f"Accuracy: {self.accuracy}, Loss: {self.loss}")
-            if self.val_accuracy and self.val_loss:
-                self.epoch_run.log_event(
-                    f"Validation Accuracy: {self.val_accuracy}, Validation Loss: {self.val_loss}"
+            _previous = self._metric_history.latest()
+            self._events.emit(
+                self.epoch_run, "Accuracy and Loss values before epoch training:"
+            )
+            self._events.emit(
+                self.epoch_run,
+                "Accuracy: {}, Loss: {}",
+                _previous.get("accuracy"),
+                _previous.get("loss"),
+            )
+            if _previous.get("val_accuracy") and _previous.get("val_loss"):
+                self._events.emit(
+                    self.epoch_run,
+                    "Validation Accuracy: {}, Validation Loss: {}",
+                    _previous.get("val_accuracy"),
+                    _previous.get("val_loss"),
                 )
-        self.epoch_run.log_event("Beginning training...")
+        self._events.emit(self.epoch_run, "Beginning training...", level="debug")
 
+    @_tracked_hook
     def on_epoch_end(self, epoch: int, logs: dict):
         """Upload relevant information to Simvue at the end of an epoch.
 
@@ -354,11 +1291,14 @@ class TensorVue(Callback):
             Raised if an evalation parameter has been specified for early stopping, but this cannot be found in the logs
 
         """
-        available_metrics = (
-            ["accuracy", "loss", "val_accuracy", "val_loss"]
-            if logs.get("val_accuracy") and logs.get("val_loss")
-            else ["accuracy", "loss"]
-        )
+        logs = materialise_logs(self._reduce_logs(logs))
+
+        if self.create_epoch_runs and self.buffer_batch_metrics:
+            self._train_batch_buffer.flush(self.epoch_run)
+        elif self.buffer_batch_metrics:
+            self._simulation_batch_buffer.flush(self.simulation_run)
+
+        epoch_metrics = self._metric_history.update(logs)
         runs_to_update = (
             (self.epoch_run, self.simulation_run)
             if self.create_epoch_runs
@@ -366,54 +1306,109 @@ class TensorVue(Callback):
         )
 
         for run in runs_to_update:
-            run.log_event(f"Epoch {epoch+1} training complete!")
-            run.log_event("Accuracy and Loss values after epoch training:")
-            run.log_event(f"Accuracy: {logs.get('accuracy')}, Loss: {logs.get('loss')}")
+            self._events.emit(run, "Epoch {} training complete!", epoch + 1)
+            self._events.emit(run, "Accuracy and Loss values after epoch training:")
+            self._events.emit(
+                run, "Accuracy: {}, Loss: {}", logs.get("accuracy"), logs.get("loss")
+            )
             if logs.get("val_accuracy") and logs.get("val_loss"):
-                run.log_event(
-                    f"Validation Accuracy: {logs.get('val_accuracy')}, Validation Loss: {logs.get('val_loss')}"
+                self._events.emit(
+                    run,
+                    "Validation Accuracy: {}, Validation Loss: {}",
+                    logs.get("val_accuracy"),
+                    logs.get("val_loss"),
                 )
 
         if epoch > 0 and self.create_epoch_runs:
-            self.epoch_run.log_event(
-                "Improvements in Accuracy and Loss after epoch training:"
+            self._events.emit(
+                self.epoch_run,
+                "Improvements in Accuracy and Loss after epoch training:",
             )
 
-        for metric in available_metrics:
-            value = logs.get(metric)
-            self.simulation_run.log_metrics({metric: value}, step=epoch + 1)
-            if not self.create_epoch_runs:
-                continue
-            elif epoch > 0:
-                change: float = value - getattr(self, metric)
-                if (metric in ["accuracy", "val_accuracy"] and change > 0) or (
-                    metric in ["loss", "val_loss"] and change < 0
-                ):
-                    improved: bool = True
-                else:
-                    improved = False
-
-                self.epoch_run.log_event(
-                    f"Improved {metric}: {improved}. Change in {metric}: {change}"
-                )
-            self.epoch_run.update_metadata({f"final_{metric}": value})
+        _present_metrics = epoch_metrics.present()
+        self._epochs_completed = epoch + 1
+        _epoch_metrics = {
+            **_present_metrics,
+            **self._throughput_metrics(),
+            **self._input_metrics(epoch),
+            **self._overhead_metrics(),
+        }
+        self.simulation_run.log_metrics(_epoch_metrics, step=epoch + 1)
+        self._check_local_alerts("simulation", self.simulation_run, _epoch_metrics)
 
-        self.accuracy = logs.get("accuracy")
-        self.loss = logs.get("loss")
-        self.val_accuracy = logs.get("val_accuracy")
-        self.val_loss = logs.get("val_loss")
+        if self.create_epoch_runs:
+            if epoch > 0:
+                for metric, change, improved in zip(
+                    epoch_metrics.names,
+                    epoch_metrics.changes.tolist(),
+                    epoch_metrics.improved.tolist(),
+                ):
+                    # Change is NaN if the metric was not reported in both epochs
+                    if change == change:
+                        self._events.emit(
+                            self.epoch_run,
+                            "Improved {0}: {1}. Change in {0}: {2}",
+                            metric,
+                            improved,
+                            change,
+                        )
+            self.epoch_run.update_metadata(
+                {f"final_{metric}": value for metric, value in _present_metrics.items()}
+            )
 
         if self.create_epoch_runs:
-            if self.model_checkpoint_filepath:
+            # Send this Epoch's events before its run can be closed
+            self._events.flush()
+            if self._model_saver:
+                # Keep the Epoch run open until its checkpoint has been saved and uploaded
+                self._uploading_epoch_runs.append(
+                    (
+                        self.epoch_run,
+                        self._model_saver.save(
+                            self.model,
+                            self.model_checkpoint_filepath,
+                            then=functools.partial(
+                                self._upload_checkpoint, self.epoch_run
+                            ),
+                        ),
+                    )
+                )
+            elif self.model_checkpoint_filepath:
                 if not pathlib.Path(self.model_checkpoint_filepath).exists():
                     raise FileNotFoundError(
                         f"Model checkpoint has not been created at {self.model_checkpoint_filepath}. Have you enabled the ModelCheckpoint callback? "
                     )
-                self.epoch_run.save_file(
-                    self.model_checkpoint_filepath, category="output"
+                # Checkpoint file will be overwritten next epoch, so upload a snapshot of it
+                # and keep the Epoch run open until the upload completes
+                self._uploading_epoch_runs.append(
+                    (
+                        self.epoch_run,
+                        self._uploader.submit(
+                            self.epoch_run,
+                            self.model_checkpoint_filepath,
+                            category="output",
+                            snapshot=True,
+                            chunk_store=self._chunk_store,
+                            chunk_run=self.simulation_run,
+                        ),
+                    )
                 )
-
-            self.epoch_run.close()
+            else:
+                self.epoch_run.close()
+
+            self._close_uploaded_epoch_runs()
+        elif self._model_saver:
+            # Without Epoch runs, each checkpoint is uploaded to the simulation run under the name of its Epoch
+            self._model_saver.save(
+                self.model,
+                self.model_checkpoint_filepath,
+                then=functools.partial(
+                    self._upload_checkpoint,
+                    self.simulation_run,
+                    name=f"epoch_{epoch+1}_{pathlib.Path(self.model_checkpoint_filepath).name}",
+                ),
+            )
+        self._log_upload_metrics()
         if all(
             (
                 self.evaluation_condition,
@@ -429,9 +1424,19 @@ class TensorVue(Callback):
             if terminate:
                 self.model.stop_training = True
                 termination_message = f"Training terminating early on epoch {epoch+1} - {self.evaluation_parameter} = {logs.get(self.evaluation_parameter)} which is {self.evaluation_condition} the target of {self.evaluation_target}."
-                self.simulation_run.log_event(termination_message)
+                self._events.emit(
+                    self.simulation_run, termination_message, level="warning"
+                )
                 print(termination_message)
 
+        if self.early_stopping:
+            self.early_stopping.update(_present_metrics)
+            self._check_early_stopping(epoch + 1)
+
+        if self.model.stop_training:
+            self._discard_next_epoch_run()
+
+    @_tracked_hook
     def on_train_batch_begin(self, batch: int, logs: dict) -> None:
         """Upload relevant information to Simvue at the start of a new training batch.
 
@@ -448,16 +1453,18 @@ class TensorVue(Callback):
             If the user does not want Epoch runs, exit the method as there is nothing to log
 
         """
+        self._block_begin = batch
+        if self._step_timer:
+            self._step_timer.begin()
+        if self._input_timer:
+            self._input_timer.step_begin()
         # Print progress in 10% increments, to prevent message spam
-        if not self.create_epoch_runs:
+        if not self.create_epoch_runs or not self._events.enabled("debug"):
             return
-        if int((batch) / (self.params.get("steps") / 10)) != int(
-            (batch + 1) / (self.params.get("steps") / 10)
-        ):
-            self.epoch_run.log_event(
-                f"Training is {10* int((batch) / (self.params.get('steps') / 10))}% complete."
-            )
+        if _message := self._progress_message(batch, "Training"):
+            self._events.emit(self.epoch_run, _message, level="debug")
 
+    @_tracked_hook
     def on_train_batch_end(self, batch: int, logs: dict) -> None:
         """Upload relevant information to Simvue at the end of a training batch.
 
@@ -468,21 +1475,55 @@ class TensorVue(Callback):
         logs : dict
             Aggregated metrics for this training up to this batch, such as accuracy and loss
 
-        Returns
-        -------
-        None
-            If the user does not want Epoch runs, exit the method as there is nothing to log
-
         """
-        if not self.create_epoch_runs:
-            return
-        self.epoch_run.log_metrics(
-            {
-                "accuracy": logs.get("accuracy"),
-                "loss": logs.get("loss"),
-            }
-        )
+        # Keras calls this once for each execution, which may run several steps
+        batch = self._last_step(batch)
+        _steps = batch - self._block_begin + 1
+        if self._step_timer:
+            self._step_timer.end(_steps)
+        if self._input_timer:
+            self._input_timer.step_end()
+        self._train_step += _steps
+        if self.early_stopping and self.early_stopping.checks_progress:
+            self._check_early_stopping(self._epochs_completed + 1)
+        if (
+            self._weight_statistics
+            and self._train_step // self.weight_stats_steps
+            != (self._train_step - _steps) // self.weight_stats_steps
+        ):
+            _statistics, _histograms = self._weight_statistics.compute()
+            self.simulation_run.log_metrics(
+                {**_statistics, **_histograms}, step=self._train_step
+            )
+        self._epoch_train_end = time.perf_counter()
+        logs = self._reduce_logs(logs)
+        if self._local_alerts:
+            if self.create_epoch_runs:
+                self._check_local_alerts(
+                    "epoch",
+                    self.epoch_run,
+                    {"accuracy": logs.get("accuracy"), "loss": logs.get("loss")},
+                )
+            else:
+                self._check_local_alerts(
+                    "simulation",
+                    self.simulation_run,
+                    {
+                        "batch_accuracy": logs.get("accuracy"),
+                        "batch_loss": logs.get("loss"),
+                    },
+                )
+        if not self.batch_sampling:
+            if self.create_epoch_runs:
+                self._log_train_batch(batch, logs)
+        else:
+            self._sample_train_batch(batch, logs, _steps)
+
+        # Time spent in this method is not counted as waiting for the next batch
+        if self._input_timer:
+            self._input_timer.step_gap_begin()
 
+    @_tracked_hook
     def on_test_begin(self, logs: dict):
         """Upload relevant information to Simvue at the start of validation or evaluation.
 
@@ -499,10 +1540,12 @@ class TensorVue(Callback):
         """
         if self.simulation_run:  # This is here because these can be called during training if validation set provided
             if self.create_epoch_runs:
-                self.epoch_run.log_event("Validating results...")
+                self._events.emit(
+                    self.epoch_run, "Validating results...", level="debug"
+                )
         else:
             if not self.optimisation_framework:
-                self.eval_run = simvue.Run(mode=self.run_mode)
+                self.eval_run = self._create_run()
                 self.eval_run.init(
                     name=self.run_name + "_evaluation",
                     folder=self.run_folder,
@@ -521,25 +1564,20 @@ class TensorVue(Callback):
                         "evaluation",
                     ]
                 )
-            [
-                create_alerts(
-                    alert_name, self.alert_definitions[alert_name], self.eval_run
-                )
-                for alert_name in self.evaluation_alerts
-            ]
+            self._alert_registry.attach(self.evaluation_alerts, self.eval_run)
+            if "evaluation" in self._local_alerts:
+                self._local_alerts["evaluation"].reset()
+            if self._overhead:
+                self._overhead.reset()
 
             if self.script_filepath:
                 self.eval_run.save_file(
                     file_path=self.script_filepath,
                     category="code",
                 )
-            model_config = self.model.get_config()
-            self.eval_run.save_object(
-                obj=model_config,
-                category="input",
-                name="model_config",
-            )
+            MODEL_CONFIGS.save(self.model, self.eval_run, self.run_mode)
 
+    @_tracked_hook
     def on_test_end(self, logs: dict):
         """Upload relevant information to Simvue at the end of validation or evaluation.
 
@@ -549,17 +1587,36 @@ class TensorVue(Callback):
             Aggregated accuracy/loss metrics for the test, output from the final call of on_test_batch_end
 
         """
+        logs = materialise_logs(self._reduce_logs(logs))
+
+        if self.buffer_batch_metrics:
+            if self.simulation_run:
+                if self.create_epoch_runs:
+                    self._validation_batch_buffer.flush(self.epoch_run)
+            else:
+                self._evaluation_batch_buffer.flush(self.eval_run)
+
         if not self.simulation_run:
-            self.eval_run.log_event("Accuracy and Loss values after evaluation:")
-            self.eval_run.log_event(
-                f"Accuracy: {logs.get('accuracy')}, Loss: {logs.get('loss')}"
+            self._events.emit(
+                self.eval_run, "Accuracy and Loss values after evaluation:"
+            )
+            self._events.emit(
+                self.eval_run,
+                "Accuracy: {}, Loss: {}",
+                logs.get("accuracy"),
+                logs.get("loss"),
             )
             self.eval_run.update_metadata(
                 {"final_accuracy": logs.get("accuracy"), "final_loss": logs.get("loss")}
             )
+            if _overhead_metrics := self._overhead_metrics("on_test_end"):
+                self.eval_run.log_metrics(_overhead_metrics, step=0)
+            self._events.flush()
             if not self.optimisation_framework:
                 self.eval_run.close()
+            self._close_spool()
 
+    @_tracked_hook
     def on_test_batch_begin(self, batch: int, logs: dict):
         """Upload relevant information to Simvue at the start of a validation or evaluation batch.
 
@@ -571,14 +1628,11 @@ class TensorVue(Callback):
             Currently no data is passed into this argument by Tensorflow.
 
         """
-        if not self.simulation_run:
-            if int((batch) / (self.params.get("steps") / 10)) != int(
-                (batch + 1) / (self.params.get("steps") / 10)
-            ):
-                self.eval_run.log_event(
-                    f"Evaluation is {10* int((batch) / (self.params.get('steps') / 10))}% complete."
-                )
+        if not self.simulation_run and self._events.enabled("debug"):
+            if _message := self._progress_message(batch, "Evaluation"):
+                self._events.emit(self.eval_run, _message, level="debug")
 
+    @_tracked_hook
     def on_test_batch_end(self, batch: int, logs: dict):
         """Upload relevant information to Simvue at the end of a validation or evaluation batch.
 
@@ -590,19 +1644,58 @@ class TensorVue(Callback):
             Aggregated metrics for this evaluation up to this batch, such as accuracy and loss
 
         """
-        if self.simulation_run:
-            if self.create_epoch_runs:
-                self.epoch_run.log_metrics(
+        if not self.simulation_run:
+            # Only the number of evaluation steps is known, validation during training uses the training parameters
+            batch = self._last_step(batch)
+        logs = self._reduce_logs(logs)
+        if self._local_alerts:
+            if not self.simulation_run:
+                self._check_local_alerts(
+                    "evaluation",
+                    self.eval_run,
+                    {"accuracy": logs.get("accuracy"), "loss": logs.get("loss")},
+                )
+            elif self.create_epoch_runs:
+                self._check_local_alerts(
+                    "epoch",
+                    self.epoch_run,
                     {
                         "val_accuracy": logs.get("accuracy"),
                         "val_loss": logs.get("loss"),
                     },
+                )
+        if self.simulation_run:
+            if self.create_epoch_runs and self.buffer_batch_metrics:
+                self._log_buffered(
+                    self._validation_batch_buffer,
+                    self.epoch_run,
+                    batch,
+                    (logs.get("accuracy"), logs.get("loss")),
+                )
+            elif self.create_epoch_runs:
+                self.epoch_run.log_metrics(
+                    materialise_logs(
+                        {
+                            "val_accuracy": logs.get("accuracy"),
+                            "val_loss": logs.get("loss"),
+                        }
+                    ),
                     step=batch,
                 )
+        elif self.buffer_batch_metrics:
+            self._log_buffered(
+                self._evaluation_batch_buffer,
+                self.eval_run,
+                batch,
+                (logs.get("accuracy"), logs.get("loss")),
+            )
         else:
             self.eval_run.log_metrics(
-                {
-                    "accuracy": logs.get("accuracy"),
-                    "loss": logs.get("loss"),
-                }
+                materialise_logs(
+                    {
+                        "accuracy": logs.get("accuracy"),
+                        "loss": logs.get("loss"),
+                    }
+                ),
+                step=batch,
             )
@@ -0,0 +1,228 @@
+"""Spool Sync.
+
+Command line tool which uploads the metrics and events held in a TensorVue offline spool to a Simvue server in large batches.
+
+The runs themselves must be uploaded first using `simvue-sender`, after which this can be run with:
+
+    simvue-tensorflow-sync <spool directory>
+"""
+
+import argparse
+import datetime
+import json
+import pathlib
+import typing
+
+import numpy
+from simvue.api.objects import Events, Metrics, Run
+
+from simvue_tensorflow.extras.spool import (
+    EVENT_DTYPE,
+    LOG_LEVELS,
+    METRIC_SET_DTYPE,
+    METRIC_VALUE_DTYPE,
+    SPOOL_METADATA_KEY,
+    read_records,
+    read_runs,
+    read_strings,
+)
+
+
+def _find_server_run_id(
+    run: dict[str, str], cache_directory: typing.Optional[pathlib.Path]
+) -> str:
+    """Find the ID on the server of a run which was created offline.
+
+    Parameters
+    ----------
+    run : dict[str, str]
+        The offline ID, name and spool ID of the run
+    cache_directory : typing.Optional[pathlib.Path]
+        The Simvue offline cache directory, used to look up the server ID of runs which have not been closed
+
+    Returns
+    -------
+    str
+        The ID of the run on the server
+
+    Raises
+    ------
+    RuntimeError
+        Raised if the run has not been uploaded to the server
+
+    """
+    if cache_directory:
+        _id_file = cache_directory.joinpath("server_ids", f"{run['offline_id']}.txt")
+        if _id_file.exists():
+            return _id_file.read_text()
+
+    _server_runs = Run.get(
+        filters=json.dumps([f"metadata.{SPOOL_METADATA_KEY} == {run['spool_id']}"])
+    )
+    if not (_server_run := next(_server_runs, None)):
+        raise RuntimeError(
+            f"Run '{run['name']}' has not been uploaded to the server, run simvue-sender before syncing the spool."
+        )
+    return _server_run[0]
+
+
+def _timestamp(seconds: float) -> datetime.datetime:
+    """Convert a number of seconds since the epoch to a UTC datetime.
+
+    Parameters
+    ----------
+    seconds : float
+        Seconds since the epoch
+
+    Returns
+    -------
+    datetime.datetime
+        The equivalent UTC datetime
+
+    """
+    return datetime.datetime.fromtimestamp(seconds, tz=datetime.timezone.utc)
+
+
+def sync_spool(
+    spool_directory: typing.Union[str, pathlib.Path],
+    cache_directory: typing.Optional[typing.Union[str, pathlib.Path]] = None,
+    batch_size: int = 10000,
+) -> tuple[int, int]:
+    """Upload the metrics and events held in a spool to the server, continuing from where any previous sync stopped.
+
+    Parameters
+    ----------
+    spool_directory : typing.Union[str, pathlib.Path]
+        The spool directory written by TensorVue
+    cache_directory : typing.Optional[typing.Union[str, pathlib.Path]], optional
+        The Simvue offline cache directory which the runs were created in, by default None
+    batch_size : int, optional
+        Maximum number of metric sets or events to upload in each request, by default 10000
+
+    Returns
+    -------
+    tuple[int, int]
+        Number of metric sets and events uploaded
+
+    """
+    spool_directory = pathlib.Path(spool_directory)
+    cache_directory = pathlib.Path(cache_directory) if cache_directory else None
+    _state_path = spool_directory.joinpath("sync_state.json")
+    _state = (
+        json.loads(_state_path.read_text())
+        if _state_path.exists()
+        else {"metric_sets": 0, "events": 0}
+    )
+
+    _runs = read_runs(spool_directory)
+    _strings = numpy.array(read_strings(spool_directory), dtype=object)
+    _server_ids: dict[int, str] = {}
+
+    def _server_id(run_index: int) -> str:
+        if run_index not in _server_ids:
+            _server_ids[run_index] = _find_server_run_id(
+                _runs[run_index], cache_directory
+            )
+        return _server_ids[run_index]
+
+    _metric_sets = read_records(spool_directory, "metric_sets", METRIC_SET_DTYPE)
+    _metric_values = read_records(spool_directory, "metric_values", METRIC_VALUE_DTYPE)
+    # Values for each set are stored contiguously, so their offsets follow from the number of values in each set
+    _value_offsets = numpy.zeros(len(_metric_sets) + 1, dtype=numpy.int64)
+    numpy.cumsum(_metric_sets["count"], out=_value_offsets[1:])
+
+    _synced_sets = 0
+    for _start in range(_state["metric_sets"], len(_metric_sets), batch_size):
+        _end = min(_start + batch_size, len(_metric_sets))
+        _batch = _metric_sets[_start:_end]
+        _values = _metric_values[_value_offsets[_start] : _value_offsets[_end]]
+        _names = _strings[_values["name"]].tolist()
+        _numbers = _values["value"].tolist()
+        _offsets = (_value_offsets[_start : _end + 1] - _value_offsets[_start]).tolist()
+
+        for run_index in numpy.unique(_batch["run"]).tolist():
+            _rows = numpy.flatnonzero(_batch["run"] == run_index).tolist()
+            Metrics.new(
+                run=_server_id(run_index),
+                metrics=[
+                    {
+                        "values": dict(
+                            zip(
+                                _names[_offsets[row] : _offsets[row + 1]],
+                                _numbers[_offsets[row] : _offsets[row + 1]],
+                            )
+                        ),
+                        "step": int(_batch["step"][row]),
+                        "time": float(_batch["time"][row]),
+                        "timestamp": _timestamp(_batch["timestamp"][row]),
+                    }
+                    for row in _rows
+                ],
+            ).commit()
+
+        _synced_sets += _end - _start
+        _state["metric_sets"] = _end
+        _state_path.write_text(json.dumps(_state))
+
+    _events = read_records(spool_directory, "events", EVENT_DTYPE)
+    _synced_events = 0
+    for _start in range(_state["events"], len(_events), batch_size):
+        _end = min(_start + batch_size, len(_events))
+        _batch = _events[_start:_end]
+        _messages = _strings[_batch["message"]].tolist()
+
+        for run_index in numpy.unique(_batch["run"]).tolist():
+            Events.new(
+                run=_server_id(run_index),
+                events=[
+                    {
+                        "message": _messages[row],
+                        "timestamp": _timestamp(_batch["timestamp"][row]),
+                        "log_level": LOG_LEVELS[_batch["level"][row]],
+                    }
+                    for row in numpy.flatnonzero(_batch["run"] == run_index).tolist()
+                ],
+            ).commit()
+
+        _synced_events += _end - _start
+        _state["events"] = _end
+        _state_path.write_text(json.dumps(_state))
+
+    return _synced_sets, _synced_events
+
+
+def main(args: typing.Optional[list[str]] = None) -> None:
+    """Upload the metrics and events held in a TensorVue offline spool to the server.
+
+    Parameters
+    ----------
+    args : typing.Optional[list[str]], optional
+        Command line arguments, by default those passed to the program
+
+    """
+    parser = argparse.ArgumentParser(
+        prog="simvue-tensorflow-sync",
+        description="Upload the metrics and events held in a TensorVue offline spool to the Simvue server.",
+    )
+    parser.add_argument("spool_directory", type=pathlib.Path)
+    parser.add_argument(
+        "--cache-directory",
+        type=pathlib.Path,
+        default=None,
+        help="Simvue offline cache directory which the runs were created in",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=10000,
+        help="Maximum number of metric sets or events to upload in each request",
+    )
+    _args = parser.parse_args(args)
+    _metric_sets, _events = sync_spool(
+        _args.spool_directory, _args.cache_directory, _args.batch_size
+    )
+    print(f"Uploaded {_metric_sets} metric sets and {_events} events.")
+
+
+if __name__ == "__main__":
+    main()
@@ -16,6 +16,21 @@ def folder_setup():
         client.delete_folder(folder, remove_runs=True)
         
         
+@pytest.fixture(scope='session', autouse=True)
+def cpu_logical_devices():
+    import tensorflow as tf
+    # Split the CPU into two logical devices before Tensorflow is initialised, so that replicas can be simulated without GPUs
+    cpu = tf.config.list_physical_devices("CPU")[0]
+    try:
+        tf.config.set_logical_device_configuration(
+            cpu, [tf.config.LogicalDeviceConfiguration()] * 2
+        )
+    except RuntimeError:
+        # Tensorflow was already initialised, so the devices can no longer be configured
+        pass
+    return tf.config.list_logical_devices("CPU")
+
+
 @pytest.fixture()
 def tensorflow_example_data():
     from tensorflow import keras
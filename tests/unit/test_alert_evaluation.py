@@ -0,0 +1,50 @@
+from unittest.mock import patch
+
+from simvue_tensorflow.extras.alert_evaluation import LocalAlertEvaluator
+
+ALERT_DEFINITIONS = {
+    "loss_high": {
+        "source": "metrics",
+        "metric": "loss",
+        "rule": "is above",
+        "threshold": 1.0,
+        "window": 10,
+    },
+    "loss_diverged": {
+        "source": "metrics",
+        "metric": "loss",
+        "rule": "is outside range",
+        "range_low": 0.0,
+        "range_high": 5.0,
+        "aggregation": "at least one",
+        "trigger_abort": True,
+    },
+    "nan_event": {"source": "events", "pattern": "NaN"},
+}
+
+
+def _observe(evaluator, now, metrics):
+    with patch("time.monotonic", return_value=now):
+        return [alert.name for alert in evaluator.observe(metrics)]
+
+
+def test_alerts_fire_once_per_breach_over_their_window():
+    evaluator = LocalAlertEvaluator(ALERT_DEFINITIONS, list(ALERT_DEFINITIONS))
+    assert evaluator
+
+    assert _observe(evaluator, 0.0, {"loss": 0.5, "accuracy": 0.1}) == []
+    # Average over the last 10 seconds is 1.25, but the latest value is within range
+    assert _observe(evaluator, 1.0, {"loss": 2.0}) == ["loss_high"]
+    assert _observe(evaluator, 2.0, {"loss": 2.0}) == []
+    # Earlier values have left the window
+    assert _observe(evaluator, 20.0, {"loss": 0.5}) == []
+    assert _observe(evaluator, 21.0, {"loss": 7.0}) == ["loss_high", "loss_diverged"]
+    # Missing metrics do not change the state of any alert
+    assert _observe(evaluator, 22.0, {}) == []
+
+    evaluator.reset()
+    assert _observe(evaluator, 23.0, {"loss": 7.0}) == ["loss_high", "loss_diverged"]
+
+
+def test_only_metric_alerts_are_evaluated():
+    assert not LocalAlertEvaluator(ALERT_DEFINITIONS, ["nan_event"])
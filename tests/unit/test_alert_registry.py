@@ -0,0 +1,193 @@
+import inspect
+from unittest.mock import MagicMock, patch
+
+import numpy
+import pytest
+import simvue
+from tensorflow import keras
+
+from simvue_tensorflow.extras.create_alerts import AlertRegistry, validate_alert
+from simvue_tensorflow.plugin import TensorVue
+
+THRESHOLD_ALERT = {
+    "source": "metrics",
+    "rule": "is below",
+    "metric": "accuracy",
+    "frequency": 1,
+    "window": 1,
+    "threshold": 0.8,
+}
+
+
+def test_alerts_created_once():
+    registry = AlertRegistry(
+        {
+            "accuracy_below_80_percent": {
+                "source": "metrics",
+                "rule": "is below",
+                "metric": "accuracy",
+                "frequency": 1,
+                "window": 1,
+                "threshold": 0.8,
+            },
+            "model_diverged": {
+                "source": "events",
+                "frequency": 1,
+                "pattern": "Model diverged with loss = NaN",
+            },
+        }
+    )
+    runs = [MagicMock() for _ in range(3)]
+    for run in runs:
+        run.create_metric_threshold_alert.return_value = "threshold_id"
+        run.create_event_alert.return_value = "event_id"
+
+    registry.attach(["accuracy_below_80_percent"], runs[0])
+    registry.attach(["accuracy_below_80_percent", "model_diverged"], runs[1])
+    registry.attach(["accuracy_below_80_percent", "model_diverged"], runs[2])
+
+    # Each alert should only be created on the first run which needs it
+    runs[0].create_metric_threshold_alert.assert_called_once()
+    runs[0].add_alerts.assert_not_called()
+    runs[1].create_metric_threshold_alert.assert_not_called()
+    runs[1].create_event_alert.assert_called_once()
+    runs[1].add_alerts.assert_called_once_with(ids=["threshold_id"])
+    runs[2].create_metric_threshold_alert.assert_not_called()
+    runs[2].create_event_alert.assert_not_called()
+    runs[2].add_alerts.assert_called_once_with(ids=["threshold_id", "event_id"])
+
+
+@pytest.mark.parametrize(
+    "method, alert_definition",
+    [
+        ("create_event_alert", {"source": "events", "pattern": "NaN"}),
+        ("create_metric_threshold_alert", THRESHOLD_ALERT),
+        (
+            "create_metric_range_alert",
+            {
+                "source": "metrics",
+                "rule": "is outside range",
+                "metric": "loss",
+                "range_low": 0,
+                "range_high": 10,
+            },
+        ),
+        ("create_user_alert", {"source": "user"}),
+    ],
+)
+def test_alert_arguments_match_run(method, alert_definition):
+    parameters = inspect.signature(getattr(simvue.Run, method)).parameters
+    for name, parameter in parameters.items():
+        if name in ("self", "name"):
+            continue
+        if parameter.default is inspect.Parameter.empty:
+            # Each required argument of the method must be given, other than the source deciding the method
+            if name == "threshold":
+                continue
+            with pytest.raises(ValueError, match=f"{name}\n  Field required"):
+                validate_alert(
+                    "missing_argument",
+                    {
+                        key: value
+                        for key, value in alert_definition.items()
+                        if key != name
+                    },
+                )
+        elif name == "attach_to_run":
+            # Alerts are attached to runs by the registry
+            with pytest.raises(ValueError):
+                validate_alert("attached", {**alert_definition, name: True})
+        else:
+            validate_alert(
+                "optional_argument", {**alert_definition, name: parameter.default}
+            )
+
+
+def test_valid_alerts():
+    validate_alert("accuracy_below_80_percent", THRESHOLD_ALERT)
+    validate_alert(
+        "loss_outside_range",
+        {
+            "source": "metrics",
+            "rule": "is outside range",
+            "metric": "loss",
+            "range_low": 0,
+            "range_high": 10,
+        },
+    )
+    validate_alert("model_diverged", {"source": "events", "pattern": "NaN"})
+    validate_alert("user_alert", {"source": "user", "notification": "email"})
+
+
+@pytest.mark.parametrize(
+    "alert_name, changes",
+    [
+        ("invalid name!", {}),
+        ("missing_metric", {"metric": None}),
+        ("unexpected_argument", {"pattern": "NaN"}),
+        ("invalid_rule", {"rule": "is inside range"}),
+        ("invalid_notification", {"notification": "slack"}),
+        ("invalid_frequency", {"frequency": 0}),
+        ("non_integer_frequency", {"frequency": "often"}),
+        ("invalid_window", {"window": 1.5}),
+        ("invalid_threshold", {"threshold": "high"}),
+        ("invalid_trigger_abort", {"trigger_abort": "sometimes"}),
+    ],
+)
+def test_invalid_alerts(alert_name, changes):
+    alert_definition = {**THRESHOLD_ALERT, **changes}
+    alert_definition = {
+        key: value for key, value in alert_definition.items() if value is not None
+    }
+    with pytest.raises(ValueError):
+        validate_alert(alert_name, alert_definition)
+
+
+def test_invalid_range():
+    with pytest.raises(ValueError, match="range_low"):
+        validate_alert(
+            "missing_range_low",
+            {
+                "source": "metrics",
+                "rule": "is outside range",
+                "metric": "loss",
+                "range_low": None,
+                "range_high": 10,
+            },
+        )
+
+
+def test_alerts_validated_before_creation():
+    registry = AlertRegistry(
+        {"invalid_threshold": {**THRESHOLD_ALERT, "threshold": "high"}}
+    )
+    run = MagicMock()
+    with pytest.raises(ValueError):
+        registry.attach(["invalid_threshold"], run)
+    run.create_metric_threshold_alert.assert_not_called()
+
+
+def test_tensorvue_validates_alerts_before_creating_runs(tmp_path):
+    tensorvue = TensorVue(
+        run_name="invalid_alert",
+        alert_definitions={
+            "invalid_threshold": {**THRESHOLD_ALERT, "threshold": "high"}
+        },
+        simulation_alerts=["invalid_threshold"],
+        model_final_filepath=str(tmp_path.joinpath("model.keras")),
+    )
+    model = keras.Sequential([keras.Input((4,)), keras.layers.Dense(2)])
+    model.compile(optimizer="sgd", loss="mse")
+    with patch("simvue.Run") as run_class, pytest.raises(ValueError, match="threshold"):
+        model.fit(
+            numpy.zeros((4, 4)),
+            numpy.zeros((4, 2)),
+            callbacks=[tensorvue],
+            verbose=0,
+        )
+    run_class.assert_not_called()
+
+
+def test_unknown_alert_source():
+    with pytest.raises(RuntimeError):
+        validate_alert("unknown_source", {"source": "logs"})
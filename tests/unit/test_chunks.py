@@ -0,0 +1,62 @@
+import pathlib
+from unittest.mock import MagicMock
+
+from simvue_tensorflow.extras.chunks import ChunkStore, assemble_file
+
+
+def make_run(run_id, stored_chunks, manifests):
+    def save_file(file_path, category, name):
+        stored_chunks[(run_id, name)] = pathlib.Path(file_path).read_bytes()
+
+    def save_object(obj, category, name):
+        manifests.append(obj)
+
+    run = MagicMock()
+    run.id = run_id
+    run.save_file.side_effect = save_file
+    run.save_object.side_effect = save_object
+    return run
+
+
+def test_only_changed_chunks_uploaded(tmp_path):
+    stored_chunks, manifests = {}, []
+    simulation_run = make_run("simulation", stored_chunks, manifests)
+    store = ChunkStore(chunk_size=1024)
+
+    file_path = tmp_path.joinpath("checkpoint.keras")
+    contents = bytearray(b"".join(bytes([index]) * 1024 for index in range(3)) + b"end")
+    file_path.write_bytes(contents)
+    first_uploaded = store.upload(
+        make_run("epoch_1", stored_chunks, manifests),
+        file_path,
+        "output",
+        "checkpoint.keras",
+        chunk_run=simulation_run,
+    )
+
+    # Only the second chunk changes in the next checkpoint
+    contents[1024:2048] = b"x" * 1024
+    file_path.write_bytes(contents)
+    second_uploaded = store.upload(
+        make_run("epoch_2", stored_chunks, manifests),
+        file_path,
+        "output",
+        "checkpoint.keras",
+        chunk_run=simulation_run,
+    )
+
+    assert len(stored_chunks) == 5
+    assert 0 < second_uploaded < first_uploaded
+    assert [len(manifest["chunks"]) for manifest in manifests] == [4, 4]
+    assert manifests[0]["chunks"][0] == manifests[1]["chunks"][0]
+    assert manifests[0]["chunks"][1] != manifests[1]["chunks"][1]
+    assert {chunk["run"] for chunk in manifests[1]["chunks"]} == {"simulation"}
+
+    client = MagicMock()
+    client.get_artifact_as_file.side_effect = (
+        lambda run_id, name, output_dir: pathlib.Path(output_dir, name).write_bytes(
+            stored_chunks[(run_id, name)]
+        )
+    )
+    assembled = assemble_file(manifests[1], tmp_path.joinpath("restored.keras"), client)
+    assert assembled.read_bytes() == bytes(contents)
@@ -0,0 +1,65 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+import tensorflow as tf
+
+from simvue_tensorflow.extras.distribution import get_strategy, is_chief, reduce_logs
+from simvue_tensorflow.plugin import TensorVue
+
+@pytest.fixture()
+def mirrored_strategy(cpu_logical_devices):
+    if len(cpu_logical_devices) < 2:
+        pytest.skip("Tensorflow was initialised before logical devices were configured")
+    return tf.distribute.MirroredStrategy(["/cpu:0", "/cpu:1"])
+
+
+def test_reduce_per_replica_logs(mirrored_strategy):
+    per_replica_loss = mirrored_strategy.run(
+        lambda: tf.cast(
+            tf.distribute.get_replica_context().replica_id_in_sync_group, tf.float32
+        )
+    )
+    logs = reduce_logs({"loss": per_replica_loss, "accuracy": 0.5}, mirrored_strategy)
+    assert logs == {"loss": 0.5, "accuracy": 0.5}
+
+    on_device = reduce_logs({"loss": per_replica_loss}, mirrored_strategy, True)
+    assert tf.is_tensor(on_device["loss"])
+
+
+def test_get_strategy(mirrored_strategy):
+    with mirrored_strategy.scope():
+        model = tf.keras.Sequential([tf.keras.Input((4,)), tf.keras.layers.Dense(1)])
+    assert get_strategy(model).num_replicas_in_sync == 2
+    assert get_strategy().num_replicas_in_sync == 1
+
+
+@pytest.mark.parametrize(
+    "task_type, task_id, cluster, expected",
+    [
+        (None, None, {}, True),
+        ("chief", 0, {"chief": ["a"], "worker": ["b"]}, True),
+        ("worker", 0, {"chief": ["a"], "worker": ["b"]}, False),
+        ("worker", 0, {"worker": ["a", "b"]}, True),
+        ("worker", 1, {"worker": ["a", "b"]}, False),
+    ],
+)
+def test_is_chief(task_type, task_id, cluster, expected):
+    strategy = MagicMock()
+    strategy.cluster_resolver.task_type = task_type
+    strategy.cluster_resolver.task_id = task_id
+    strategy.cluster_resolver.cluster_spec.return_value.as_dict.return_value = cluster
+    assert is_chief(strategy) == expected
+
+
+def test_non_chief_worker_does_not_log():
+    callback = TensorVue(run_name="non_chief", strategy_aware=True)
+    with patch("simvue_tensorflow.plugin.is_chief", return_value=False), patch(
+        "simvue.Run"
+    ) as run:
+        callback.set_model(MagicMock())
+        callback.on_train_begin({})
+        callback.on_epoch_begin(0, {})
+        callback.on_train_batch_end(0, {"accuracy": 0.5, "loss": 1.0})
+        callback.on_epoch_end(0, {"accuracy": 0.5, "loss": 1.0})
+        callback.on_train_end({})
+    run.assert_not_called()
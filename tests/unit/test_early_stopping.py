@@ -0,0 +1,63 @@
+from simvue_tensorflow.extras.early_stopping import (
+    Budget,
+    Plateau,
+    Progress,
+    Threshold,
+)
+
+PROGRESS = Progress(epochs=1, steps=10, seconds=1.0)
+
+
+def _direction(metric_name):
+    return "minimise" if "loss" in metric_name else "maximise"
+
+
+def test_plateau_with_min_delta_and_patience():
+    criterion = Plateau("val_loss", patience=2, min_delta=0.1)
+    criterion.reset(_direction)
+    for value in (1.0, 0.5, 0.45, 0.42):
+        assert not criterion.satisfied(PROGRESS)
+        criterion.update({"val_loss": value})
+    assert criterion.satisfied(PROGRESS)
+
+    # Epochs where the metric was not reported do not count towards the patience
+    criterion.reset(_direction)
+    for logs in ({"val_loss": 1.0}, {}, {}, {"val_loss": 1.0}):
+        criterion.update(logs)
+    assert not criterion.satisfied(PROGRESS)
+
+
+def test_threshold_smoothing_and_patience():
+    criterion = Threshold("accuracy", ">", 0.8, patience=2, smoothing=0.5)
+    criterion.reset(_direction)
+    # Smoothed values are 0.6, 0.8, 0.9 and 0.95
+    for value, satisfied in ((0.6, False), (1.0, False), (1.0, False), (1.0, True)):
+        criterion.update({"accuracy": value})
+        assert criterion.satisfied(PROGRESS) == satisfied
+
+    criterion.update({"accuracy": 0.0})
+    assert not criterion.satisfied(PROGRESS)
+
+
+def test_combined_criteria():
+    plateau = Plateau("accuracy", patience=1)
+    criterion = (plateau & Threshold("loss", "<", 0.5)) | Budget(steps=100)
+    assert criterion.checks_progress
+    criterion.reset(_direction)
+
+    criterion.update({"accuracy": 0.9, "loss": 0.4})
+    criterion.update({"accuracy": 0.8, "loss": 0.6})
+    assert plateau.satisfied(PROGRESS)
+    assert not criterion.satisfied(PROGRESS)
+
+    criterion.update({"accuracy": 0.8, "loss": 0.3})
+    assert criterion.satisfied(PROGRESS)
+    assert " and " in criterion.describe(PROGRESS)
+
+    criterion.reset(_direction)
+    assert not criterion.satisfied(PROGRESS)
+    finished = Progress(epochs=1, steps=100, seconds=1.0)
+    assert criterion.satisfied(finished)
+    assert criterion.describe(finished) == (
+        "100 steps have been trained, reaching the budget of 100"
+    )
@@ -0,0 +1,118 @@
+from unittest.mock import MagicMock, patch
+
+import numpy
+from tensorflow import keras
+
+from simvue_tensorflow.plugin import TensorVue
+
+
+class _StopAfterSecondEpoch(keras.callbacks.Callback):
+    def on_epoch_end(self, epoch, logs=None):
+        self.model.stop_training = epoch == 1
+
+
+def _fit(tensorvue, callbacks, epochs=4):
+    model = keras.Sequential([keras.Input((4,)), keras.layers.Dense(2)])
+    model.compile(optimizer="sgd", loss="mse")
+    model.fit(
+        numpy.zeros((8, 4)),
+        numpy.zeros((8, 2)),
+        epochs=epochs,
+        batch_size=4,
+        callbacks=callbacks + [tensorvue],
+        verbose=0,
+    )
+
+
+def test_prewarmed_epoch_runs_started_when_used(tmp_path):
+    runs = []
+
+    def _create_run():
+        runs.append(MagicMock(mode="online", id=f"run_{len(runs)}"))
+        return runs[-1]
+
+    tensorvue = TensorVue(
+        run_name="prewarm", model_final_filepath=str(tmp_path.joinpath("model.keras"))
+    )
+    with (
+        patch.object(tensorvue, "_create_run", side_effect=_create_run),
+        patch("simvue.api.objects.Run") as run_object,
+    ):
+        _fit(tensorvue, [_StopAfterSecondEpoch()])
+
+    epoch_runs = {run.init.call_args.kwargs["name"]: run for run in runs}
+    # Prewarmed runs are only created, then started at the beginning of their Epoch
+    assert epoch_runs["prewarm_epoch_2"].init.call_args.kwargs["running"] is False
+    epoch_runs["prewarm_epoch_2"].reconnect.assert_called_once_with(
+        epoch_runs["prewarm_epoch_2"].id
+    )
+    epoch_runs["prewarm_epoch_2"].set_status.assert_not_called()
+
+    # The run prewarmed for the Epoch after training stopped is deleted without being started
+    unused_run = epoch_runs["prewarm_epoch_3"]
+    assert run_object.call_args.kwargs["identifier"] == unused_run.id
+    run_object.return_value.delete.assert_called_once()
+    unused_run.reconnect.assert_not_called()
+    unused_run.set_status.assert_not_called()
+    assert "prewarm_epoch_4" not in epoch_runs
+
+
+def test_prewarmed_epoch_run_terminated_if_not_deleted(tmp_path):
+    runs = []
+
+    def _create_run():
+        runs.append(MagicMock(mode="offline", id=f"run_{len(runs)}"))
+        return runs[-1]
+
+    tensorvue = TensorVue(
+        run_name="undeleted",
+        model_final_filepath=str(tmp_path.joinpath("model.keras")),
+    )
+    with (
+        patch.object(tensorvue, "_create_run", side_effect=_create_run),
+        patch("simvue.api.objects.Run") as run_object,
+    ):
+        run_object.return_value.delete.side_effect = RuntimeError("Deletion failed")
+        _fit(tensorvue, [_StopAfterSecondEpoch()])
+
+    # A run which could not be deleted is marked as terminated, explaining why it is empty
+    unused_run = next(
+        run for run in runs if run.init.call_args.kwargs["name"] == "undeleted_epoch_3"
+    )
+    unused_run.reconnect.assert_called_once_with(unused_run.id)
+    assert "created in advance" in unused_run.log_event.call_args.args[0]
+    unused_run.set_status.assert_called_once_with("terminated")
+    unused_run.close.assert_called_once()
+
+
+def test_prewarmed_epoch_run_discarded_after_failed_fit(tmp_path):
+    runs = []
+
+    def _create_run():
+        runs.append(MagicMock(mode="online"))
+        return runs[-1]
+
+    class _Fail(keras.callbacks.Callback):
+        def on_epoch_end(self, epoch, logs=None):
+            raise RuntimeError("Training failed")
+
+    tensorvue = TensorVue(
+        run_name="failed", model_final_filepath=str(tmp_path.joinpath("model.keras"))
+    )
+    with (
+        patch.object(tensorvue, "_create_run", side_effect=_create_run),
+        patch("simvue.api.objects.Run") as run_object,
+    ):
+        try:
+            _fit(tensorvue, [_Fail()])
+        except RuntimeError:
+            pass
+        assert tensorvue._next_epoch_run is not None
+        _fit(tensorvue, [], epochs=1)
+
+    unused_run = next(
+        run for run in runs if run.init.call_args.kwargs["name"] == "failed_epoch_2"
+    )
+    assert run_object.call_args_list[0].kwargs["identifier"] == unused_run.id
+    unused_run.reconnect.assert_not_called()
+    assert tensorvue._next_epoch_run is None
@@ -0,0 +1,76 @@
+import queue
+from unittest.mock import MagicMock, call
+
+import simvue
+
+from simvue_tensorflow.extras.events import EventStream
+
+
+class Unformattable:
+    def __format__(self, format_spec):
+        raise AssertionError("Filtered events should not be formatted")
+
+
+def test_filtered_events_are_not_formatted():
+    run = MagicMock()
+    events = EventStream(level="info")
+    assert not events.enabled("debug")
+    events.emit(run, "Training is {}% complete.", Unformattable(), level="debug")
+    events.emit(run, "Epoch {} training complete!", 1)
+    events.emit(run, "Training terminating early.", level="warning")
+    assert run.log_event.call_args_list == [
+        call("Epoch 1 training complete!", log_level="info"),
+        call("Training terminating early.", log_level="warning"),
+    ]
+
+
+def test_events_batched_per_run():
+    epoch_run, simulation_run = MagicMock(), MagicMock()
+    events = EventStream(batch=True)
+    for run in (epoch_run, simulation_run):
+        events.emit(run, "Epoch {} training complete!", 2)
+        events.emit(run, "Accuracy: {}, Loss: {}", 0.5, 1.0)
+    events.emit(simulation_run, "Training terminating early.", level="warning")
+    epoch_run.log_event.assert_not_called()
+
+    events.flush()
+    # Each event is sent separately, with its own level and the time it was emitted
+    assert [
+        (call.args[0], call.kwargs["log_level"])
+        for call in simulation_run.log_event.call_args_list
+    ] == [
+        ("Epoch 2 training complete!", "info"),
+        ("Accuracy: 0.5, Loss: 1.0", "info"),
+        ("Training terminating early.", "warning"),
+    ]
+    _timestamps = [
+        call.kwargs["timestamp"] for call in simulation_run.log_event.call_args_list
+    ]
+    assert _timestamps == sorted(_timestamps)
+    assert _timestamps[0] >= epoch_run.log_event.call_args_list[0].kwargs["timestamp"]
+
+    events.flush()
+    assert epoch_run.log_event.call_count == 2
+
+
+def test_batched_events_queued_with_simvue_run_dispatcher():
+    run = MagicMock(spec=simvue.Run, mode="offline")
+    run.log_event.return_value = True
+    events = EventStream(batch=True)
+    events.emit(run, "Epoch {} training complete!", 1)
+    events.emit(run, "Accuracy: {}, Loss: {}", 0.5, 1.0)
+    events.emit(run, "Training terminating early.", level="warning")
+    run.dispatcher.add_item.side_effect = [None, queue.Full]
+    events.flush()
+
+    # The first event is logged through the run, and the rest queued without blocking
+    assert [call.args[0] for call in run.log_event.call_args_list] == [
+        "Epoch 1 training complete!",
+        "Training terminating early.",
+    ]
+    _item = run.dispatcher.add_item.call_args_list[0]
+    assert _item.args[0]["message"] == "Accuracy: 0.5, Loss: 1.0"
+    assert _item.args[0]["log_level"] == "info"
+    assert isinstance(_item.args[0]["timestamp"], str)
+    assert _item.kwargs["object_type"] == "events"
+    assert not _item.kwargs["blocking"]
@@ -0,0 +1,43 @@
+import time
+
+import pytest
+import tensorflow as tf
+
+from simvue_tensorflow.extras.input_pipeline import InputPipelineTimer
+
+
+def _slow_elements():
+    for value in range(6):
+        time.sleep(0.02)
+        yield value
+
+
+@pytest.mark.parametrize("gap_seconds", (0.0, 0.05))
+def test_input_wait_fractions(gap_seconds):
+    timer = InputPipelineTimer()
+    dataset = tf.data.Dataset.from_generator(
+        _slow_elements, output_signature=tf.TensorSpec((), tf.int64)
+    )
+    dataset = timer.instrument(timer.instrument(dataset, stage="source").batch(2))
+    iterator = iter(dataset)
+
+    timer.reset()
+    values = []
+    for _ in range(3):
+        timer.step_begin()
+        values += next(iterator).numpy().tolist()
+        timer.step_end()
+        timer.step_gap_begin()
+        time.sleep(gap_seconds)
+
+    # Elements pass through unchanged
+    assert values == list(range(6))
+
+    summary = timer.summary()
+    assert summary["stages/source/latency_ms"] >= 20
+    if gap_seconds:
+        assert summary["step_gap_fraction"] > 0.2
+        assert summary["wait_fraction"] > 0.9
+    else:
+        assert summary["step_gap_fraction"] < 0.1
+        assert summary["wait_fraction"] > 0.8
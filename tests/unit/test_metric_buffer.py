@@ -0,0 +1,103 @@
+import queue
+from unittest.mock import MagicMock
+
+import simvue
+
+from simvue_tensorflow.extras.metric_buffer import MetricBuffer
+
+
+def test_buffer_flushes_with_original_steps():
+    run = MagicMock(mode="disabled")
+    buffer = MetricBuffer(["accuracy", "loss"], capacity=3)
+
+    # Buffer should only be due for flushing once it is full
+    assert not buffer.append(0, (0.1, 2.0))
+    assert not buffer.append(1, (None, 1.5))
+    assert buffer.append(2, (0.3, 1.0))
+    assert len(buffer) == 3
+
+    buffer.flush(run)
+    assert len(buffer) == 0
+
+    logged = [(call.args[0], call.kwargs["step"]) for call in run.log_metrics.call_args_list]
+    # Missing values should be dropped rather than logged as NaN
+    assert logged == [
+        ({"accuracy": 0.1, "loss": 2.0}, 0),
+        ({"loss": 1.5}, 1),
+        ({"accuracy": 0.3, "loss": 1.0}, 2),
+    ]
+
+
+def test_buffer_queued_with_simvue_run_dispatcher():
+    run = MagicMock(spec=simvue.Run, mode="offline", id="offline_1", duration=1.0)
+    run.log_metrics.return_value = True
+    buffer = MetricBuffer(["accuracy", "loss"], capacity=4)
+    buffer.append(0, (0.1, 2.0))
+    buffer.append(1, (None, None))
+    buffer.append(2, (0.3, 1.0))
+    buffer.append(3, (0.4, 0.5))
+    run.dispatcher.add_item.side_effect = [None, queue.Full]
+    buffer.flush(run)
+
+    # The first step is logged through the run, and the rest queued without blocking, apart from empty steps
+    assert [call.kwargs["step"] for call in run.log_metrics.call_args_list] == [0, 3]
+    _item = run.dispatcher.add_item.call_args_list[0]
+    assert _item.args[0]["values"] == {"accuracy": 0.3, "loss": 1.0}
+    assert _item.args[0]["step"] == 2
+    assert isinstance(_item.args[0]["timestamp"], str)
+    assert _item.kwargs["object_type"] == "metrics_regular"
+    assert not _item.kwargs["blocking"]
+
+
+def test_buffer_not_queued_after_failed_log():
+    run = MagicMock(spec=simvue.Run, mode="online", duration=1.0)
+    # Errors are suppressed by the run, which then skips logging
+    run.log_metrics.return_value = False
+    buffer = MetricBuffer(["loss"], capacity=2)
+    buffer.append(0, (1.0,))
+    buffer.append(1, (0.5,))
+    buffer.flush(run)
+
+    assert run.log_metrics.call_count == 2
+    run.dispatcher.add_item.assert_not_called()
+
+
+def test_buffer_due_after_flush_seconds():
+    buffer = MetricBuffer(["loss"], capacity=100, flush_seconds=0)
+    assert buffer.append(0, (1.0,))
+
+
+def test_device_buffer_accepts_tensors():
+    import tensorflow as tf
+
+    from simvue_tensorflow.extras.device_buffer import DeviceMetricBuffer
+
+    run = MagicMock(mode="disabled")
+    buffer = DeviceMetricBuffer(["accuracy", "loss"], capacity=2)
+    assert not buffer.append(0, (tf.constant(0.5), tf.constant(2.0)))
+    assert buffer.append(1, (None, 1.0))
+    buffer.flush(run)
+
+    logged = [(call.args[0], call.kwargs["step"]) for call in run.log_metrics.call_args_list]
+    assert logged == [({"accuracy": 0.5, "loss": 2.0}, 0), ({"loss": 1.0}, 1)]
+
+
+def test_device_buffer_keeps_float_precision():
+    import tensorflow as tf
+
+    from simvue_tensorflow.extras.device_buffer import DeviceMetricBuffer
+
+    run = MagicMock(mode="disabled")
+    buffer = DeviceMetricBuffer(["accuracy", "loss"], capacity=3)
+    buffer.append(0, (0.1, 0.2))
+    buffer.append(1, (tf.constant(0.5), 0.3))
+    buffer.append(2, (0.7, tf.constant(1.5, dtype=tf.float64)))
+    buffer.flush(run)
+
+    # Floats are not converted to tensors, which would round them to single precision
+    logged = [(call.args[0], call.kwargs["step"]) for call in run.log_metrics.call_args_list]
+    assert logged == [
+        ({"accuracy": 0.1, "loss": 0.2}, 0),
+        ({"accuracy": 0.5, "loss": 0.3}, 1),
+        ({"accuracy": 0.7, "loss": 1.5}, 2),
+    ]
@@ -0,0 +1,36 @@
+import numpy
+
+from simvue_tensorflow.extras.metric_history import MetricHistory
+
+
+def test_changes_and_improvements():
+    history = MetricHistory(metric_directions={"output_1_custom": "minimise"})
+    first = history.update({"accuracy": 0.5, "loss": 1.0, "auc": 0.6})
+    assert first.names == ["accuracy", "loss", "auc"]
+    assert numpy.isnan(first.changes).all()
+    assert not first.improved.any()
+
+    second = history.update(
+        {
+            "accuracy": 0.6,
+            "loss": 0.8,
+            "auc": 0.55,
+            "val_output_1_custom": 2.0,
+            "learning_rate_schedule": "not a metric",
+        }
+    )
+    # New metrics are discovered as they appear, non-numeric values are ignored
+    assert second.names == ["accuracy", "loss", "auc", "val_output_1_custom"]
+    numpy.testing.assert_allclose(second.changes[:3], [0.1, -0.2, -0.05])
+    assert second.improved.tolist() == [True, True, False, False]
+
+    third = history.update({"accuracy": 0.7, "val_output_1_custom": 1.0})
+    # Validation metrics use the direction configured for the base metric
+    assert third.improved.tolist() == [True, False, False, True]
+    assert third.present() == {"accuracy": 0.7, "val_output_1_custom": 1.0}
+    assert history.latest() == {
+        "accuracy": 0.7,
+        "loss": 0.8,
+        "auc": 0.55,
+        "val_output_1_custom": 1.0,
+    }
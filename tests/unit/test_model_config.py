@@ -0,0 +1,73 @@
+from unittest.mock import MagicMock, patch
+
+import tensorflow as tf
+
+from simvue_tensorflow.extras.model_config import ModelConfigCache
+
+
+def make_model(units):
+    return tf.keras.Sequential([tf.keras.Input((4,)), tf.keras.layers.Dense(units)])
+
+
+def make_run(run_id):
+    run = MagicMock()
+    run.id = run_id
+    run.save_object.return_value = True
+    return run
+
+
+def test_each_config_uploaded_once():
+    cache = ModelConfigCache()
+    model, other_model = make_model(2), make_model(3)
+    runs = [make_run(f"run_{index}") for index in range(4)]
+
+    with patch.object(model, "get_config", wraps=model.get_config) as get_config:
+        cache.save(model, runs[0], "online")
+        cache.save(model, runs[1], "online")
+    # Identical architecture in a new model, as in repeated trials
+    cache.save(make_model(2), runs[2], "online")
+    cache.save(other_model, runs[3], "online")
+
+    get_config.assert_called_once()
+    runs[0].save_object.assert_called_once()
+    runs[1].save_object.assert_not_called()
+    runs[2].save_object.assert_not_called()
+    runs[3].save_object.assert_called_once()
+
+    digest = cache.get(model)[1]
+    for run in runs[:3]:
+        run.update_metadata.assert_called_once_with(
+            {"model_config_sha256": digest, "model_config_run": "run_0"}
+        )
+    assert cache.get(other_model)[1] != digest
+
+
+def test_failed_upload_is_retried():
+    cache = ModelConfigCache()
+    model = make_model(2)
+    failed_run, run = make_run("failed"), make_run("run")
+    failed_run.save_object.return_value = False
+
+    cache.save(model, failed_run, "online")
+    cache.save(model, run, "online")
+
+    run.save_object.assert_called_once()
+    run.update_metadata.assert_called_once_with(
+        {"model_config_sha256": cache.get(model)[1], "model_config_run": "run"}
+    )
+
+
+def test_offline_runs_do_not_refer_to_offline_ids():
+    cache = ModelConfigCache()
+    model = make_model(2)
+    runs = [make_run(f"offline_{index}") for index in range(2)]
+
+    for run in runs:
+        cache.save(model, run, "offline")
+
+    runs[0].save_object.assert_called_once()
+    runs[1].save_object.assert_not_called()
+    for run in runs:
+        run.update_metadata.assert_called_once_with(
+            {"model_config_sha256": cache.get(model)[1]}
+        )
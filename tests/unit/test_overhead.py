@@ -0,0 +1,50 @@
+import pytest
+
+from simvue_tensorflow.extras.overhead import OverheadTracker, TimingHistogram, Timer
+
+
+def test_histogram_percentiles():
+    histogram = TimingHistogram()
+    for _ in range(98):
+        histogram.record(10e-6)
+    histogram.record(1e-3)
+    histogram.record(50e-3)
+
+    summary = histogram.summary()
+    assert summary["calls"] == 100
+    assert summary["max_us"] == pytest.approx(50e3)
+    assert summary["mean_us"] == pytest.approx((98 * 10 + 1e3 + 50e3) / 100)
+    # Percentiles are accurate to within the width of a bin (a quarter of a doubling)
+    assert 10 <= summary["p50_us"] <= 10 * 2**0.25
+    assert 1e3 <= summary["p99_us"] <= 1e3 * 2**0.25
+
+
+def test_tracker_publishes_and_resets():
+    tracker = OverheadTracker()
+    tracker.record("on_train_batch_end", 2e-6)
+    tracker.record("on_train_batch_end", 4e-6)
+
+    @tracker.timer("data_loading")
+    def load_data():
+        with tracker.timer("data_loading"):
+            pass
+
+    load_data()
+
+    metrics = tracker.publish()
+    assert metrics["tensorvue/overhead/on_train_batch_end/calls"] == 2
+    assert metrics["tensorvue/overhead/total_ms"] == pytest.approx(6e-3)
+    assert 0 < metrics["tensorvue/overhead/fraction"] <= 1
+    # Custom timers are reported separately, and do not count towards the overhead
+    assert metrics["tensorvue/timers/data_loading/calls"] == 2
+    assert not any("data_loading" in name for name in metrics if "overhead" in name)
+
+    assert tracker.publish() == {
+        "tensorvue/overhead/total_ms": 0.0,
+        "tensorvue/overhead/fraction": 0.0,
+    }
+
+
+def test_timer_without_tracker():
+    with Timer(None, "disabled"):
+        pass
@@ -0,0 +1,43 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+from simvue_tensorflow.extras.resources import ResourceSampler
+
+
+def test_samples_logged_in_background_until_stopped():
+    run = MagicMock()
+    sampler = ResourceSampler(run, interval=0.01)
+    sampler.start()
+    time.sleep(0.1)
+    sampler.stop()
+
+    samples = run.log_metrics.call_count
+    assert samples >= 2
+    assert not any(
+        thread.name == "tensorvue_resources" for thread in threading.enumerate()
+    )
+    time.sleep(0.05)
+    assert run.log_metrics.call_count == samples
+
+    metrics = run.log_metrics.call_args_list[0].args[0]
+    assert metrics["resources/rss_mib"] > 0
+    assert metrics["resources/open_files"] > 0
+    assert "resources/CPU:0/memory_mib" in metrics
+    assert [call.kwargs["step"] for call in run.log_metrics.call_args_list] == list(
+        range(samples)
+    )
+
+
+def test_sampling_failure_reported_once():
+    run = MagicMock()
+    run.log_metrics.side_effect = RuntimeError("Run is not active")
+    sampler = ResourceSampler(run, interval=0.01)
+    sampler.start()
+    time.sleep(0.1)
+    sampler.stop()
+
+    assert run.log_metrics.call_count >= 2
+    run.log_event.assert_called_once()
+    assert "Run is not active" in run.log_event.call_args.args[0]
+    assert run.log_event.call_args.kwargs["log_level"] == "warning"
@@ -0,0 +1,100 @@
+from unittest.mock import MagicMock, patch
+
+import numpy
+import pytest
+from tensorflow import keras
+
+from simvue_tensorflow.extras.sampling import (
+    Adaptive,
+    EveryNSteps,
+    LogSpaced,
+    SamplingPolicy,
+    TimeInterval,
+)
+from simvue_tensorflow.plugin import TensorVue
+
+
+def test_every_n_steps():
+    policy = EveryNSteps(5)
+    assert [step for step in range(1, 21) if policy.should_log(step)] == [5, 10, 15, 20]
+    # With several steps in each execution, the execution which passes each multiple of N is logged
+    executions = range(4, 25, 4)
+    assert [step for step in executions if policy.should_log(step, 4)] == [8, 12, 16, 20]
+
+
+def test_policy_must_implement_should_log():
+    with pytest.raises(TypeError):
+        SamplingPolicy()
+
+
+def test_time_interval():
+    policy = TimeInterval(3600)
+    assert [step for step in range(1, 10) if policy.should_log(step)] == [1]
+    policy.reset()
+    assert policy.should_log(1)
+
+
+def test_log_spaced():
+    policy = LogSpaced(steps_per_decade=1)
+    assert [step for step in range(1, 10001) if policy.should_log(step)] == [
+        1,
+        10,
+        100,
+        1000,
+        10000,
+    ]
+    policy.reset()
+    assert [step for step in range(1, 101) if policy.should_log(step)] == [1, 10, 100]
+
+
+def test_adaptive_throttles_to_target_fraction():
+    policy = Adaptive(target_fraction=0.01, smoothing=1)
+    assert policy.should_log(1)
+
+    # Logging costs as much as 1/10th of a step, so to stay under 1% must log every 10 steps
+    policy.update(step_seconds=1.0, logging_seconds=0.1)
+    assert policy.interval == 10
+    assert [step for step in range(2, 32) if policy.should_log(step)] == [11, 21, 31]
+
+    # The measured interval still applies after a reset, counting from the first step
+    policy.reset()
+    assert [step for step in range(1, 22) if policy.should_log(step)] == [10, 20]
+
+
+def test_policy_reset_for_second_fit(tmp_path):
+    runs = []
+
+    def _create_run():
+        runs.append(MagicMock(mode="disabled"))
+        return runs[-1]
+
+    model = keras.Sequential([keras.Input((4,)), keras.layers.Dense(2)])
+    model.compile(optimizer="sgd", loss="mse")
+    tensorvue = TensorVue(
+        run_name="sampling",
+        create_epoch_runs=False,
+        batch_sampling=LogSpaced(steps_per_decade=1),
+        model_final_filepath=str(tmp_path.joinpath("model.keras")),
+    )
+    with patch.object(tensorvue, "_create_run", side_effect=_create_run):
+        for _ in range(2):
+            model.fit(
+                numpy.zeros((12, 4)),
+                numpy.zeros((12, 2)),
+                batch_size=1,
+                callbacks=[tensorvue],
+                verbose=0,
+            )
+
+    simulation_runs = [
+        run
+        for run in runs
+        if run.init.call_args.kwargs["name"] == "sampling_simulation"
+    ]
+    assert len(simulation_runs) == 2
+    for run in simulation_runs:
+        assert [
+            call.kwargs["step"]
+            for call in run.log_metrics.call_args_list
+            if "batch_loss" in call.args[0]
+        ] == [1, 10]
@@ -0,0 +1,117 @@
+import threading
+from unittest.mock import patch
+
+import numpy
+import pytest
+import tensorflow as tf
+
+from simvue_tensorflow.extras.snapshot import AsyncModelSaver
+
+
+def make_model():
+    model = tf.keras.Sequential([tf.keras.Input((4,)), tf.keras.layers.Dense(2)])
+    model.compile(optimizer="adam", loss="mse")
+    model.fit(numpy.ones((8, 4)), numpy.ones((8, 2)), epochs=1, verbose=0)
+    return model
+
+
+def test_saves_snapshot_in_background(tmp_path):
+    model = make_model()
+    expected_weights = model.get_weights()
+    release = threading.Event()
+    saved_paths = []
+
+    def upload(file_path):
+        release.wait(timeout=5)
+        saved_paths.append(file_path)
+
+    saver = AsyncModelSaver()
+    first = saver.save(model, tmp_path.joinpath("checkpoint.keras"), then=upload)
+
+    # Training continues while the snapshot is saved, without affecting it
+    model.set_weights([weights + 1 for weights in expected_weights])
+
+    # Only one save can be in progress, so the next one waits for the first to be uploaded
+    second = threading.Thread(
+        target=saver.save, args=(model, tmp_path.joinpath("final.keras"))
+    )
+    second.start()
+    second.join(timeout=0.5)
+    assert second.is_alive()
+
+    release.set()
+    second.join(timeout=30)
+    saver.join()
+    assert first.done()
+    assert saved_paths == [tmp_path.joinpath("checkpoint.keras")]
+
+    checkpoint = tf.keras.models.load_model(tmp_path.joinpath("checkpoint.keras"))
+    for saved, expected in zip(checkpoint.get_weights(), expected_weights):
+        numpy.testing.assert_allclose(saved, expected)
+    assert int(checkpoint.optimizer.iterations.numpy()) == 1
+
+    final = tf.keras.models.load_model(tmp_path.joinpath("final.keras"))
+    for saved, expected in zip(final.get_weights(), expected_weights):
+        numpy.testing.assert_allclose(saved, expected + 1)
+
+
+
+def test_model_which_cannot_be_cloned_saved_before_training_continues(tmp_path):
+    model = make_model()
+    expected_weights = model.get_weights()
+    uploaded = threading.Event()
+
+    saver = AsyncModelSaver()
+    # Legacy Keras cannot clone subclassed models
+    # Patched on the module the saver looks it up from, which depends on how Keras was first imported
+    with patch.object(
+        tf.keras.models,
+        "clone_model",
+        side_effect=ValueError("Expected a functional model"),
+    ):
+        saved = saver.save(
+            model,
+            tmp_path.joinpath("checkpoint.keras"),
+            then=lambda file_path: uploaded.wait(timeout=5) and file_path,
+        )
+
+    # The file is written before save returns, while the function still runs in the background
+    assert tmp_path.joinpath("checkpoint.keras").exists()
+    assert not saved.done()
+    model.set_weights([weights + 1 for weights in expected_weights])
+
+    uploaded.set()
+    assert saved.result(timeout=30) == tmp_path.joinpath("checkpoint.keras")
+    checkpoint = tf.keras.models.load_model(tmp_path.joinpath("checkpoint.keras"))
+    for saved_weights, expected in zip(checkpoint.get_weights(), expected_weights):
+        numpy.testing.assert_allclose(saved_weights, expected)
+
+
+def test_optimizer_state_saved_by_path(tmp_path):
+    model = make_model()
+    model.fit(numpy.ones((8, 4)), numpy.zeros((8, 2)), epochs=2, verbose=0)
+    expected = model.optimizer.variables
+
+    saver = AsyncModelSaver()
+    saver.save(model, tmp_path.joinpath("checkpoint.keras"))
+    saver.join()
+
+    checkpoint = tf.keras.models.load_model(tmp_path.joinpath("checkpoint.keras"))
+    # Loading drops the name of the model from the paths of the optimizer variables
+    assert len(checkpoint.optimizer.variables) == len(expected)
+    for saved, variable in zip(checkpoint.optimizer.variables, expected):
+        assert variable.path.endswith(saved.path.split("/")[-1])
+        numpy.testing.assert_allclose(saved.numpy(), variable.numpy())
+
+
+def test_mismatched_optimizer_state_raises(tmp_path):
+    model = make_model()
+    saver = AsyncModelSaver()
+    saver.save(model, tmp_path.joinpath("checkpoint.keras"))
+    saver.join()
+
+    # Recompiling replaces the optimizer of the model, but not of its copy
+    model.compile(optimizer="sgd", loss="mse")
+    model.fit(numpy.ones((8, 4)), numpy.ones((8, 2)), epochs=1, verbose=0)
+    with pytest.raises(ValueError, match="do not match"):
+        saver.save(model, tmp_path.joinpath("checkpoint.keras"))
@@ -0,0 +1,142 @@
+import datetime
+from unittest.mock import MagicMock, patch
+
+import numpy
+from tensorflow import keras
+
+from simvue_tensorflow.extras.spool import (
+    METRIC_SET_DTYPE,
+    SPOOL_METADATA_KEY,
+    Spool,
+    SpooledRun,
+    read_records,
+    read_runs,
+    read_strings,
+)
+from simvue_tensorflow.plugin import TensorVue
+from simvue_tensorflow.sync import sync_spool
+
+
+def test_spool_round_trip(tmp_path):
+    spool = Spool(tmp_path)
+    run = SpooledRun(MagicMock(id="offline_1", duration=1.5), spool)
+    run.init(name="spooled_run", metadata={"learning_rate": 0.01})
+    assert run._run.init.call_args.kwargs["metadata"]["learning_rate"] == 0.01
+    assert SPOOL_METADATA_KEY in run._run.init.call_args.kwargs["metadata"]
+
+    # Write enough records to grow the memory mapped files beyond their first chunk
+    for step in range(50000):
+        run.log_metrics({"accuracy": step / 50000, "loss": 1.0}, step=step, time=0.1)
+    run.log_metrics({"accuracy": 1.0})
+    run.log_event("Training complete!")
+    run.log_event("Training complete!", log_level="warning")
+    spool.close()
+
+    # Reopening the spool continues from the existing data
+    spool = Spool(tmp_path)
+    other_run = SpooledRun(MagicMock(id="offline_2", duration=0.0), spool)
+    other_run.init(name="other_run")
+    other_run.log_metrics({"val_loss": 0.5}, step=3, time=2.0)
+    spool.close()
+
+    assert read_strings(tmp_path) == [
+        "accuracy",
+        "loss",
+        "Training complete!",
+        "val_loss",
+    ]
+    metric_sets = read_records(tmp_path, "metric_sets", METRIC_SET_DTYPE)
+    assert len(metric_sets) == 50002
+    # Steps default to the number of previous calls, and time to the duration of the run
+    assert metric_sets[50000]["step"] == 50000
+    assert metric_sets[50000]["time"] == 1.5
+    assert metric_sets[-1][["run", "step", "count"]].tolist() == (1, 3, 1)
+
+    run_metrics = []
+    run_events = []
+    server_runs = {"offline_1": "server_1", "offline_2": "server_2"}
+    with patch("simvue_tensorflow.sync.Metrics") as metrics, patch(
+        "simvue_tensorflow.sync.Events"
+    ) as events, patch("simvue_tensorflow.sync.Run") as server_run:
+        # Closed runs are found by their spool ID, others by the server ID recorded in the cache
+        server_run.get.side_effect = lambda filters: iter(
+            [(server_runs["offline_1"], None)]
+        )
+        metrics.new.side_effect = (
+            lambda run, metrics: run_metrics.append((run, metrics)) or MagicMock()
+        )
+        events.new.side_effect = (
+            lambda run, events: run_events.append((run, events)) or MagicMock()
+        )
+        cache_directory = tmp_path.joinpath("cache")
+        cache_directory.joinpath("server_ids").mkdir(parents=True)
+        cache_directory.joinpath("server_ids", "offline_2.txt").write_text(
+            server_runs["offline_2"]
+        )
+        assert sync_spool(tmp_path, cache_directory, batch_size=20000) == (50002, 2)
+
+        # Nothing is uploaded twice
+        assert sync_spool(tmp_path, cache_directory) == (0, 0)
+
+    assert [run for run, _ in run_metrics] == ["server_1"] * 3 + ["server_2"]
+    assert sum(len(metric_sets) for _, metric_sets in run_metrics) == 50002
+    first_set = run_metrics[0][1][0]
+    assert first_set["values"] == {"accuracy": 0.0, "loss": 1.0}
+    assert first_set["step"] == 0
+    assert isinstance(first_set["timestamp"], datetime.datetime)
+    assert run_metrics[-1][1] == [
+        {
+            "values": {"val_loss": 0.5},
+            "step": 3,
+            "time": 2.0,
+            "timestamp": run_metrics[-1][1][0]["timestamp"],
+        }
+    ]
+    assert [event["log_level"] for event in run_events[0][1]] == ["info", "warning"]
+
+
+def test_spooled_run_logs_to_offline_run_once_spool_closed(tmp_path):
+    spool = Spool(tmp_path)
+    run = SpooledRun(MagicMock(id="offline_1", duration=1.5), spool)
+    run.init(name="spooled_run")
+    run.log_metrics({"loss": 1.0})
+    spool.close()
+
+    run.log_metrics({"loss": 0.5})
+    run.log_event("Logged after the spool was closed")
+    run._run.log_metrics.assert_called_once_with(
+        {"loss": 0.5}, step=1, time=1.5, timestamp=None
+    )
+    run._run.log_event.assert_called_once_with(
+        "Logged after the spool was closed", timestamp=None, log_level=None
+    )
+    assert len(read_records(tmp_path, "metric_sets", METRIC_SET_DTYPE)) == 1
+
+
+def test_evaluate_after_fit_offline(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    model = keras.Sequential([keras.Input((4,)), keras.layers.Dense(2)])
+    model.compile(optimizer="sgd", loss="mse", metrics=["accuracy"])
+    spool_directory = tmp_path.joinpath("spool")
+    tensorvue = TensorVue(
+        run_name="spooled",
+        run_mode="offline",
+        offline_spool_dir=str(spool_directory),
+        model_final_filepath=str(tmp_path.joinpath("model.keras")),
+    )
+    manifest_run = tensorvue.create_manifest_run()
+    x, y = numpy.zeros((8, 4)), numpy.zeros((8, 2))
+    model.fit(x, y, epochs=2, batch_size=4, callbacks=[tensorvue], verbose=0)
+    model.evaluate(x, y, batch_size=4, callbacks=[tensorvue], verbose=0)
+
+    # Runs created before the spool was closed can still be logged to
+    assert manifest_run.log_event("Logged after training")
+    manifest_run.close()
+
+    assert [run["name"] for run in read_runs(spool_directory)] == [
+        "spooled_manifest",
+        "spooled_simulation",
+        "spooled_epoch_1",
+        "spooled_epoch_2",
+        "spooled_evaluation",
+    ]
@@ -0,0 +1,18 @@
+import subprocess
+import sys
+
+
+def test_import_and_construction_do_not_import_simvue():
+    code = (
+        "import sys\n"
+        "from simvue_tensorflow.plugin import TensorVue\n"
+        "callback = TensorVue(\n"
+        "    run_name='startup',\n"
+        "    alert_definitions={'diverged': {'source': 'events', 'pattern': 'NaN'}},\n"
+        "    simulation_alerts=['diverged'],\n"
+        ")\n"
+        "assert 'simvue' not in sys.modules\n"
+        "assert 'pydantic' not in sys.modules\n"
+        "assert callback.script_filepath is None\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -0,0 +1,44 @@
+from unittest.mock import patch
+
+import pytest
+
+from simvue_tensorflow.extras.step_timer import StepTimer
+
+
+def test_percentiles_of_recent_steps():
+    timer = StepTimer(capacity=100)
+    assert timer.percentiles() == {}
+
+    # Old steps are overwritten by the most recent 100, which take 1 to 100 milliseconds
+    durations = [1.0] * 50 + [step / 1000 for step in range(1, 101)]
+    clock = iter(value for duration in durations for value in (0.0, duration))
+    with patch("time.perf_counter", lambda: next(clock)):
+        for _ in durations:
+            timer.begin()
+            timer.end()
+
+    assert timer.count == 150
+    percentiles = timer.percentiles()
+    assert percentiles["p50_ms"] == pytest.approx(50.5)
+    assert percentiles["p95_ms"] == pytest.approx(95.05)
+    assert percentiles["p99_ms"] == pytest.approx(99.01)
+
+    # A step is only recorded if its start was marked
+    timer.reset()
+    timer.end()
+    assert timer.count == 0
+
+
+def test_executions_of_several_steps():
+    timer = StepTimer(capacity=6)
+    clock = iter((0.0, 0.04, 0.0, 0.2))
+    with patch("time.perf_counter", lambda: next(clock)):
+        for steps in (4, 4):
+            timer.begin()
+            timer.end(steps)
+
+    # Each step is recorded with the mean duration of its execution, wrapping around the ring buffer
+    assert timer.count == 8
+    percentiles = timer.percentiles()
+    assert percentiles["p50_ms"] == pytest.approx(50.0)
+    assert percentiles["p99_ms"] == pytest.approx(50.0)
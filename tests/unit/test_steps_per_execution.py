@@ -0,0 +1,97 @@
+from unittest.mock import MagicMock, patch
+
+import numpy
+from tensorflow import keras
+
+from simvue_tensorflow.plugin import TensorVue
+
+
+def _logged_steps(run, predicate):
+    return [
+        call.kwargs["step"]
+        for call in run.log_metrics.call_args_list
+        if predicate(call.args[0])
+    ]
+
+
+def _progress_events(run, phase):
+    return [
+        call.args[0]
+        for call in run.log_event.call_args_list
+        if call.args[0].startswith(phase)
+    ]
+
+
+def test_several_steps_per_execution(tmp_path):
+    runs = []
+
+    def _create_run():
+        runs.append(MagicMock(mode="disabled"))
+        return runs[-1]
+
+    model = keras.Sequential([keras.Input((4,)), keras.layers.Dense(2)])
+    model.compile(
+        optimizer="sgd", loss="mse", metrics=["accuracy"], steps_per_execution=4
+    )
+    tensorvue = TensorVue(
+        run_name="executions",
+        weight_stats_steps=6,
+        weight_histogram_bins=0,
+        model_final_filepath=str(tmp_path.joinpath("model.keras")),
+    )
+    with patch.object(tensorvue, "_create_run", side_effect=_create_run):
+        # 13 training steps in each Epoch, so the last execution of each only runs one step
+        model.fit(
+            numpy.zeros((52, 4)),
+            numpy.zeros((52, 2)),
+            epochs=2,
+            batch_size=4,
+            callbacks=[tensorvue],
+            verbose=0,
+        )
+        assert tensorvue._steps_per_execution == 4
+        assert tensorvue._train_step == 26
+
+        # 7 evaluation steps, so the last execution only runs three steps
+        model.evaluate(
+            numpy.zeros((28, 4)),
+            numpy.zeros((28, 2)),
+            batch_size=4,
+            callbacks=[tensorvue],
+            verbose=0,
+        )
+
+    named_runs = {run.init.call_args.kwargs["name"]: run for run in runs}
+    simulation_run = named_runs["executions_simulation"]
+    simulation_run.update_metadata.assert_any_call(
+        {"epochs": 2, "steps": 13, "verbose": 0, "steps_per_execution": 4}
+    )
+
+    # Each execution is logged against its last step, which Keras reports as 15 for the final execution
+    for epoch in (1, 2):
+        epoch_run = named_runs[f"executions_epoch_{epoch}"]
+        assert _logged_steps(epoch_run, lambda metrics: "loss" in metrics) == [
+            3,
+            7,
+            11,
+            12,
+        ]
+        # Each execution reports the decile it starts in, if it passes into the next
+        assert _progress_events(epoch_run, "Training is") == [
+            "Training is 0% complete.",
+            "Training is 30% complete.",
+            "Training is 60% complete.",
+            "Training is 90% complete.",
+        ]
+
+    # After 4, 8, 12, 13, 17, 21, 25 and 26 steps, statistics are computed on passing each multiple of 6
+    assert _logged_steps(
+        simulation_run, lambda metrics: any(name.endswith("/norm") for name in metrics)
+    ) == [8, 12, 21, 25]
+
+    evaluation_run = named_runs["executions_evaluation"]
+    assert _logged_steps(evaluation_run, lambda metrics: "loss" in metrics) == [3, 6]
+    assert _progress_events(evaluation_run, "Evaluation is") == [
+        "Evaluation is 0% complete.",
+        "Evaluation is 50% complete.",
+    ]
@@ -125,8 +125,32 @@ def test_fit_earlystopping(folder_setup, tensorflow_example_data):
     # Check final value is over 0.8, and second to last value is not over 0.8
     assert accuracy_vals[-1] > 0.8
     assert accuracy_vals[-2] < 0.8
-    
-    
-    
-    
-    
\ No newline at end of file
+
+
+def test_fit_earlystopping_no_spare_epoch_run(folder_setup, tensorflow_example_data):
+    run_name = 'test_tensorflow_fit_earlystopping_epoch_runs-%s' % str(uuid.uuid4())
+
+    tensorvue = sv_tf.TensorVue(
+        run_name=run_name,
+        run_folder=folder_setup,
+        evaluation_parameter="accuracy",
+        evaluation_condition=">",
+        evaluation_target=0.8
+    )
+
+    tensorflow_example_data.model.fit(
+        tensorflow_example_data.img_train[:1000],
+        tensorflow_example_data.label_train[:1000],
+        epochs=10,
+        validation_split=0.2,
+        callbacks=[tensorvue,]
+    )
+    client = simvue.Client()
+    run_id = client.get_run_id_from_name(f"{run_name}_simulation")
+    accuracy_metric = client.get_metric_values(run_ids=[run_id], metric_names=["accuracy"], xaxis="step", output_format="dataframe")
+    epochs_trained = len(accuracy_metric['accuracy'].tolist())
+    assert epochs_trained < 10
+
+    # The run prewarmed for the epoch after training stopped should have been deleted
+    epoch_runs = client.get_runs(filters=[f'name contains {run_name}_epoch'], output_format="objects")
+    assert len(list(epoch_runs)) == epochs_trained
@@ -0,0 +1,128 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+import tensorflow as tf
+
+from simvue_tensorflow.extras.training_loop import MetricAccumulator, TrainingLoop
+from simvue_tensorflow.plugin import TensorVue
+
+
+def test_metrics_accumulated_in_tf_function():
+    accumulator = MetricAccumulator(["accuracy", "loss"])
+
+    @tf.function
+    def step(value):
+        accumulator.record({"loss": value, "accuracy": 2 * value})
+
+    for value in (1.0, 2.0, 3.0):
+        step(tf.constant(value))
+    result = accumulator.result()
+    assert float(result["loss"]) == pytest.approx(2.0)
+    assert float(result["accuracy"]) == pytest.approx(4.0)
+
+    accumulator.reset()
+    assert float(accumulator.result()["loss"]) == 0.0
+
+
+@pytest.mark.parametrize("tensor_logs", (False, True))
+def test_callback_driven_like_fit(tensor_logs):
+    callback = MagicMock(tensor_logs=tensor_logs)
+    model = MagicMock(stop_training=False)
+    loop = TrainingLoop(callback, model, epochs=3, steps=2)
+
+    def stop_after_second_epoch(epoch, logs):
+        model.stop_training = epoch == 1
+
+    callback.on_epoch_end.side_effect = stop_after_second_epoch
+
+    with loop:
+        for epoch in loop.epochs():
+            for value in loop.steps([1.0, 3.0]):
+                loop.record(loss=tf.constant(value), accuracy=tf.constant(0.5))
+            for value in loop.test_steps([4.0]):
+                loop.record(loss=tf.constant(value), accuracy=tf.constant(1.0))
+    for value in loop.test_steps([5.0]):
+        loop.record(loss=tf.constant(value), accuracy=tf.constant(1.0))
+
+    callback.set_params.assert_called_once_with(
+        {"verbose": 0, "epochs": 3, "steps": 2}
+    )
+    assert callback.on_epoch_begin.call_count == 2
+    assert callback.on_train_batch_end.call_count == 4
+    assert callback.on_test_begin.call_count == 3
+
+    # Batch logs stay on-device, and are only copied to the host once logged by the callback
+    _batch_logs = callback.on_train_batch_end.call_args_list[1].args[1]
+    assert tf.is_tensor(_batch_logs["loss"])
+    assert float(_batch_logs["loss"]) == pytest.approx(2.0)
+
+    assert callback.on_epoch_end.call_args.args[1] == {
+        "accuracy": 0.5,
+        "loss": 2.0,
+        "val_accuracy": 1.0,
+        "val_loss": 4.0,
+    }
+    callback.on_train_end.assert_called_once()
+    assert callback.on_test_end.call_args.args[0] == {"accuracy": 1.0, "loss": 5.0}
+
+
+@pytest.mark.parametrize("batch_flush_steps", (None, 10))
+def test_metrics_logged_by_tensorvue(tmp_path, batch_flush_steps):
+    runs = []
+
+    def _create_run():
+        runs.append(MagicMock(mode="disabled"))
+        return runs[-1]
+
+    model = tf.keras.Sequential([tf.keras.Input((4,)), tf.keras.layers.Dense(2)])
+    model.compile(optimizer="sgd", loss="mse")
+    tensorvue = TensorVue(
+        run_name="loop",
+        batch_flush_steps=batch_flush_steps,
+        model_final_filepath=str(tmp_path.joinpath("model.keras")),
+    )
+    loop = TrainingLoop(tensorvue, model, epochs=1, steps=3)
+
+    with patch.object(tensorvue, "_create_run", side_effect=_create_run):
+        with loop:
+            for epoch in loop.epochs():
+                for value in loop.steps([1.0, 2.0, 3.0]):
+                    loop.record(loss=tf.constant(value), accuracy=tf.constant(0.5))
+                    epoch_run = runs[-1]
+                    # Buffered metrics are not copied to the host until the buffer is flushed
+                    assert epoch_run.log_metrics.call_count == (
+                        0 if batch_flush_steps else int(value) - 1
+                    )
+                for value in loop.test_steps([4.0, 6.0]):
+                    loop.record(loss=tf.constant(value), accuracy=tf.constant(1.0))
+        for value in loop.test_steps([5.0]):
+            loop.record(loss=tf.constant(value), accuracy=tf.constant(1.0))
+
+    named_runs = {run.init.call_args.kwargs["name"]: run for run in runs}
+    epoch_run = named_runs["loop_epoch_1"]
+    assert [
+        (call.args[0], call.kwargs["step"])
+        for call in epoch_run.log_metrics.call_args_list
+        if "loss" in call.args[0]
+    ] == [
+        ({"accuracy": 0.5, "loss": 1.0}, 0),
+        ({"accuracy": 0.5, "loss": 1.5}, 1),
+        ({"accuracy": 0.5, "loss": 2.0}, 2),
+    ]
+    assert [
+        (call.args[0], call.kwargs["step"])
+        for call in epoch_run.log_metrics.call_args_list
+        if "val_loss" in call.args[0]
+    ] == [
+        ({"val_accuracy": 1.0, "val_loss": 4.0}, 0),
+        ({"val_accuracy": 1.0, "val_loss": 5.0}, 1),
+    ]
+    for call in epoch_run.log_metrics.call_args_list:
+        assert all(type(value) is float for value in call.args[0].values())
+
+    evaluation_run = named_runs["loop_evaluation"]
+    assert [
+        (call.args[0], call.kwargs["step"])
+        for call in evaluation_run.log_metrics.call_args_list
+        if "loss" in call.args[0]
+    ] == [({"accuracy": 1.0, "loss": 5.0}, 0)]
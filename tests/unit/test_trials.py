@@ -0,0 +1,50 @@
+import os
+
+import pytest
+import tensorflow as tf
+
+from simvue_tensorflow.extras.trials import TrialExecutor, partition_cores
+
+
+def _trial(params, simulation_run, evaluation_run):
+    if params["fail"]:
+        raise ValueError("Trial failed")
+    return {
+        "affinity": sorted(os.sched_getaffinity(0)),
+        "intra_op_threads": tf.config.threading.get_intra_op_parallelism_threads(),
+        "inter_op_threads": tf.config.threading.get_inter_op_parallelism_threads(),
+        "runs": (simulation_run.mode, evaluation_run.mode),
+    }
+
+
+def test_cores_partitioned_between_workers():
+    assert partition_cores(list(range(8)), 3) == [(0, 1), (2, 3), (4, 5)]
+    assert partition_cores([4, 5], 2) == [(4,), (5,)]
+    with pytest.raises(ValueError):
+        partition_cores([0], 2)
+
+
+@pytest.mark.skipif(
+    not hasattr(os, "sched_setaffinity"), reason="Requires CPU affinity"
+)
+def test_trials_run_pinned_to_cores():
+    # Workers may share a core on machines with only one
+    _cores = (sorted(os.sched_getaffinity(0)) * 2)[:2]
+    _collected = []
+    executor = TrialExecutor(
+        _trial, "optimisation", run_mode="disabled", n_workers=2, cores=_cores
+    )
+    results = executor.run(
+        [{"fail": False}, {"fail": True}, {"fail": False}], callback=_collected.append
+    )
+
+    assert [result.index for result in results] == [0, 1, 2]
+    assert sorted(result.index for result in _collected) == [0, 1, 2]
+    assert "Trial failed" in results[1].error
+    for result in (results[0], results[2]):
+        assert result.error is None
+        assert list(result.cores) == result.result["affinity"]
+        assert result.result["affinity"] in ([_cores[0]], [_cores[1]])
+        assert result.result["intra_op_threads"] == 1
+        assert result.result["inter_op_threads"] == 1
+        assert result.result["runs"] == ("disabled", "disabled")
@@ -0,0 +1,45 @@
+import pathlib
+import threading
+from unittest.mock import MagicMock
+
+from simvue_tensorflow.extras.uploader import ArtifactUploader
+
+
+def test_uploads_respect_inflight_budget(tmp_path):
+    release = threading.Event()
+    uploaded_files = []
+
+    def slow_save_file(file_path, category, name):
+        release.wait(timeout=5)
+        uploaded_files.append((pathlib.Path(file_path).read_bytes(), category, name))
+
+    run = MagicMock()
+    run.save_file.side_effect = slow_save_file
+    file_path = tmp_path.joinpath("checkpoint.keras")
+    file_path.write_bytes(b"a" * 10)
+
+    uploader = ArtifactUploader(max_workers=2, max_inflight_bytes=15)
+    uploader.submit(run, file_path, category="output", snapshot=True)
+
+    # Overwriting the file after submission should not affect the snapshot being uploaded
+    file_path.write_bytes(b"b" * 10)
+
+    # Second upload would exceed the budget, so must wait for the first to complete
+    second = threading.Thread(
+        target=uploader.submit, args=(run, file_path), kwargs={"category": "output"}
+    )
+    second.start()
+    second.join(timeout=0.2)
+    assert second.is_alive()
+
+    release.set()
+    second.join(timeout=5)
+    uploader.join()
+
+    assert sorted(uploaded_files) == [
+        (b"a" * 10, "output", "checkpoint.keras"),
+        (b"b" * 10, "output", "checkpoint.keras"),
+    ]
+    records = uploader.pop_completed()
+    assert [record.size for record in records] == [10, 10]
+    assert uploader.pop_completed() == []
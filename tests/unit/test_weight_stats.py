@@ -0,0 +1,41 @@
+import numpy
+import pytest
+import tensorflow as tf
+
+from simvue_tensorflow.extras.weight_stats import WeightStatistics
+
+
+def test_statistics_and_update_ratio():
+    kernel = tf.Variable(
+        numpy.arange(12, dtype=numpy.float32).reshape(3, 4), name="kernel"
+    )
+    bias = tf.Variable(numpy.ones(4, dtype=numpy.float32), name="bias")
+    weight_statistics = WeightStatistics([kernel, bias], histogram_bins=8)
+    names = weight_statistics.names
+
+    statistics, histograms = weight_statistics.compute()
+    values = kernel.numpy().ravel()
+    assert statistics[f"{names[0]}/norm"] == pytest.approx(numpy.linalg.norm(values))
+    assert statistics[f"{names[0]}/mean"] == pytest.approx(values.mean())
+    assert statistics[f"{names[0]}/std"] == pytest.approx(values.std())
+    assert statistics[f"{names[0]}/min"] == 0
+    assert statistics[f"{names[0]}/max"] == 11
+    # Nothing to compare against until the second computation
+    assert f"{names[0]}/update_ratio" not in statistics
+    assert histograms[f"{names[0]}/histogram"].shape == (8,)
+    assert histograms[f"{names[0]}/histogram"].sum() == pytest.approx(1)
+    assert len(weight_statistics.histogram_ticks) == 8
+
+    bias.assign_add(numpy.full(4, 0.5, dtype=numpy.float32))
+    statistics, _ = weight_statistics.compute()
+    assert statistics[f"{names[0]}/update_ratio"] == 0
+    assert statistics[f"{names[1]}/update_ratio"] == pytest.approx(0.5)
+
+
+def test_no_histograms():
+    weight_statistics = WeightStatistics(
+        [tf.Variable(numpy.ones(3, dtype=numpy.float32))], histogram_bins=0
+    )
+    statistics, histograms = weight_statistics.compute()
+    assert len(statistics) == 5
+    assert histograms == {}